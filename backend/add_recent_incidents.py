@@ -4,8 +4,15 @@ Add recent drone incidents (Nov 2024-2025) to database
 Based on news scraping from NOS, BBC, VRT, etc.
 """
 
-import sqlite3
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.database import SessionLocal
+from backend.duplicate_index import flag_duplicates
+from backend.models import Incident
 
 # Recent incidents from news sources
 RECENT_INCIDENTS = [
@@ -96,60 +103,63 @@ RECENT_INCIDENTS = [
     }
 ]
 
-def add_incidents_to_db(db_path='data/drone_cuas.db'):
-    """Add recent incidents to database"""
+def add_incidents_to_db():
+    """Add recent incidents to database (DB_PATH), flagging duplicates of existing incidents"""
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    db = SessionLocal()
 
     added = 0
     skipped = 0
+    pending = []
+
+    try:
+        for incident in RECENT_INCIDENTS:
+            sighting_date = datetime.strptime(incident['sighting_date'], '%Y-%m-%d').date()
 
-    for incident in RECENT_INCIDENTS:
-        # Check if incident already exists (by title + date)
-        cursor.execute("""
-            SELECT id FROM incidents
-            WHERE title = ? AND sighting_date = ?
-        """, (incident['title'], incident['sighting_date']))
+            # Check if incident already exists (by title + date)
+            exists = db.query(Incident.id).filter(
+                Incident.title == incident['title'],
+                Incident.sighting_date == sighting_date
+            ).first()
 
-        if cursor.fetchone():
-            print(f"⏭️  Skipping (already exists): {incident['title']}")
-            skipped += 1
-            continue
+            if exists:
+                print(f"⏭️  Skipping (already exists): {incident['title']}")
+                skipped += 1
+                continue
 
-        # Insert new incident
-        cursor.execute("""
-            INSERT INTO incidents (
-                title, sighting_date, sighting_time, latitude, longitude,
-                description, source, source_url, purpose_assessment,
-                confidence_score, suspected_operator, duration_minutes,
-                report_date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            incident['title'],
-            incident['sighting_date'],
-            incident.get('sighting_time'),
-            incident['latitude'],
-            incident['longitude'],
-            incident['description'],
-            incident['source'],
-            None,  # source_url
-            incident['purpose_assessment'],
-            incident['confidence_score'],
-            incident.get('suspected_operator'),
-            incident.get('duration_minutes'),
-            datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        ))
+            # Insert new incident
+            new_incident = Incident(
+                title=incident['title'],
+                sighting_date=sighting_date,
+                sighting_time=incident.get('sighting_time'),
+                latitude=incident['latitude'],
+                longitude=incident['longitude'],
+                description=incident['description'],
+                source=incident['source'],
+                source_url=None,
+                purpose_assessment=incident['purpose_assessment'],
+                confidence_score=incident['confidence_score'],
+                suspected_operator=incident.get('suspected_operator'),
+                duration_minutes=incident.get('duration_minutes'),
+                report_date=datetime.now()
+            )
+            db.add(new_incident)
+            pending.append(new_incident)
 
-        print(f"✅ Added: {incident['title']} ({incident['sighting_date']})")
-        added += 1
+            print(f"✅ Added: {incident['title']} ({incident['sighting_date']})")
+            added += 1
 
-    conn.commit()
-    conn.close()
+        # New incidents are checked for duplicates before the commit
+        flagged = flag_duplicates(db, pending)
+        db.commit()
+    finally:
+        db.close()
 
     print(f"\n📊 Summary:")
     print(f"   Added: {added}")
     print(f"   Skipped: {skipped}")
+    if flagged:
+        print(f"   Flagged as duplicates: {len(flagged)}")
     print(f"   Total incidents in DB: {added + 49}")
 
 if __name__ == "__main__":
@@ -5,16 +5,19 @@ Analyze remaining posts (skip already analyzed) - safe for concurrent work
 
 import sqlite3
 import json
+import sys
 from datetime import datetime
-from typing import Dict
-import anthropic
-import os
+from pathlib import Path
+from typing import Dict, List, Tuple
 from dotenv import load_dotenv
 import time
 
 load_dotenv()
 
-client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.llm_gateway import gateway, parse_json_response
+
 DB_PATH = "data/drone_cuas.db"
 LOG_FILE = "/tmp/ai_analysis_progress.log"
 
@@ -85,47 +88,44 @@ def log(message):
 
 def analyze_post_with_ai(channel: str, date: str, content: str) -> Dict:
     """Use Claude to analyze and classify a Telegram post"""
-
-    prompt = CLASSIFICATION_PROMPT.format(
-        channel=channel,
-        date=date,
-        content=content[:4000]  # Limit content length
-    )
-
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1024,
-            messages=[{
-                "role": "user",
-                "content": prompt
-            }]
-        )
-
-        response_text = message.content[0].text
-
-        # Extract JSON
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-        elif "```" in response_text:
-            json_start = response_text.find("```") + 3
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-
-        analysis = json.loads(response_text)
-        return analysis
-
-    except Exception as e:
-        return {
-            "translation": content,
-            "classification": "ERROR",
-            "intelligence_value": 0,
-            "confidence": "LOW",
-            "reasoning": f"Analysis failed: {str(e)}",
-            "is_intelligence": False
+    return analyze_posts_with_ai([(channel, date, content)])[0]
+
+def analyze_posts_with_ai(posts: List[Tuple[str, str, str]]) -> List[Dict]:
+    """Analyze (channel, date, content) posts concurrently through the LLM gateway (cached)"""
+
+    def report_progress(done, total):
+        if done % 10 == 0 or done == total:
+            log(f"   🤖 AI analysis: {done}/{total} posts")
+
+    responses = gateway.complete_many([
+        {
+            "prompt": CLASSIFICATION_PROMPT.format(
+                channel=channel,
+                date=date,
+                content=content[:4000]  # Limit content length
+            ),
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 1024
         }
+        for channel, date, content in posts
+    ], progress_callback=report_progress)
+
+    analyses = []
+    for (channel, date, content), response in zip(posts, responses):
+        try:
+            if isinstance(response, Exception):
+                raise response
+            analyses.append(parse_json_response(response))
+        except Exception as e:
+            analyses.append({
+                "translation": content,
+                "classification": "ERROR",
+                "intelligence_value": 0,
+                "confidence": "LOW",
+                "reasoning": f"Analysis failed: {str(e)}",
+                "is_intelligence": False
+            })
+    return analyses
 
 def main():
     log("=" * 80)
@@ -159,11 +159,11 @@ def main():
     intelligence_posts = 0
     start_time = time.time()
 
-    for post_id, channel, post_date, content, post_url, relevance in posts:
-        log(f"📝 Post #{post_id} - {channel} ({post_date[:10]}) [Relevance: {relevance:.2f}]")
+    # Analyze with AI (concurrent; cached analyses are reused on re-runs)
+    analyses = analyze_posts_with_ai([(channel, post_date, content) for _, channel, post_date, content, _, _ in posts])
 
-        # Analyze with AI
-        analysis = analyze_post_with_ai(channel, post_date, content)
+    for (post_id, channel, post_date, content, post_url, relevance), analysis in zip(posts, analyses):
+        log(f"📝 Post #{post_id} - {channel} ({post_date[:10]}) [Relevance: {relevance:.2f}]")
 
         intel_value = analysis.get('intelligence_value', 0)
         classification = analysis.get('classification', 'UNKNOWN')
@@ -223,6 +223,7 @@ def main():
     log(f"   Intelligence rate: {intelligence_posts/analyzed*100:.1f}%")
     log(f"   Total time: {total_time/60:.1f} minutes")
     log(f"   Average: {total_time/analyzed:.1f} sec/post")
+    log(f"   {gateway.format_stats()}")
 
 if __name__ == "__main__":
     main()
@@ -5,15 +5,18 @@ Analyze TOP 200 posts by relevance score - for quick quality results
 
 import sqlite3
 import json
+import sys
 from datetime import datetime
-from typing import Dict
-import anthropic
-import os
+from pathlib import Path
+from typing import Dict, List, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.llm_gateway import gateway, parse_json_response
+
 DB_PATH = "data/drone_cuas.db"
 
 CLASSIFICATION_PROMPT = """You are an OSINT analyst specializing in counter-UAS intelligence.
@@ -75,48 +78,45 @@ Respond in JSON format:
 
 def analyze_post_with_ai(channel: str, date: str, content: str) -> Dict:
     """Use Claude to analyze and classify a Telegram post"""
-
-    prompt = CLASSIFICATION_PROMPT.format(
-        channel=channel,
-        date=date,
-        content=content[:4000]  # Limit content length
-    )
-
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1024,
-            messages=[{
-                "role": "user",
-                "content": prompt
-            }]
-        )
-
-        response_text = message.content[0].text
-
-        # Extract JSON
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-        elif "```" in response_text:
-            json_start = response_text.find("```") + 3
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-
-        analysis = json.loads(response_text)
-        return analysis
-
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        return {
-            "translation": content,
-            "classification": "ERROR",
-            "intelligence_value": 0,
-            "confidence": "LOW",
-            "reasoning": f"Analysis failed: {str(e)}",
-            "is_intelligence": False
+    return analyze_posts_with_ai([(channel, date, content)])[0]
+
+def analyze_posts_with_ai(posts: List[Tuple[str, str, str]]) -> List[Dict]:
+    """Analyze (channel, date, content) posts concurrently through the LLM gateway (cached)"""
+
+    def report_progress(done, total):
+        if done % 10 == 0 or done == total:
+            print(f"   🤖 AI analysis: {done}/{total} posts")
+
+    responses = gateway.complete_many([
+        {
+            "prompt": CLASSIFICATION_PROMPT.format(
+                channel=channel,
+                date=date,
+                content=content[:4000]  # Limit content length
+            ),
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 1024
         }
+        for channel, date, content in posts
+    ], progress_callback=report_progress)
+
+    analyses = []
+    for (channel, date, content), response in zip(posts, responses):
+        try:
+            if isinstance(response, Exception):
+                raise response
+            analyses.append(parse_json_response(response))
+        except Exception as e:
+            print(f"   ✗ Error: {e}")
+            analyses.append({
+                "translation": content,
+                "classification": "ERROR",
+                "intelligence_value": 0,
+                "confidence": "LOW",
+                "reasoning": f"Analysis failed: {str(e)}",
+                "is_intelligence": False
+            })
+    return analyses
 
 def main():
     print("=" * 80)
@@ -141,11 +141,11 @@ def main():
     analyzed = 0
     intelligence_posts = 0
 
-    for post_id, channel, post_date, content, post_url in posts:
-        print(f"📝 Post #{post_id} - {channel} ({post_date[:10]})")
+    # Analyze with AI (concurrent; cached analyses are reused on re-runs)
+    analyses = analyze_posts_with_ai([(channel, post_date, content) for _, channel, post_date, content, _ in posts])
 
-        # Analyze with AI
-        analysis = analyze_post_with_ai(channel, post_date, content)
+    for (post_id, channel, post_date, content, post_url), analysis in zip(posts, analyses):
+        print(f"📝 Post #{post_id} - {channel} ({post_date[:10]})")
 
         print(f"   Classification: {analysis.get('classification')}")
         print(f"   Intelligence Value: {analysis.get('intelligence_value')}/10")
@@ -194,6 +194,7 @@ def main():
     print(f"   Total analyzed: {analyzed}")
     print(f"   Intelligence posts: {intelligence_posts}")
     print(f"   Intelligence rate: {intelligence_posts/analyzed*100:.1f}%")
+    print(f"   {gateway.format_stats()}")
 
 if __name__ == "__main__":
     main()
@@ -6,8 +6,8 @@ Supports RSS feeds, news APIs, and direct web scraping with caching.
 
 Features:
 - Ethical scraping with rate limiting
-- RSS feed support
-- Caching to reduce repeated requests
+- RSS feed support (feeds indexed in memory on a schedule, see backend/feed_index.py)
+- Caching to reduce repeated requests (shared response cache, see backend/response_cache.py)
 - Language detection
 - Sentiment analysis
 - Source credibility weighting
@@ -25,9 +25,11 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 from urllib.parse import urljoin, quote
 import hashlib
-import json
 from functools import lru_cache
 
+from backend.feed_index import FeedArticleIndex
+from backend.response_cache import ResponseCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -144,19 +146,14 @@ class ArticleScraper:
         'sv': ['drönare', 'drönare', 'obemannad farkost'],
     }
 
-    def __init__(self, cache_dir: str = ".cache/articles", cache_ttl_hours: int = 24):
-        self.cache_dir = cache_dir
+    def __init__(self, cache_ttl_hours: int = 24, cache_path: Optional[str] = None):
         self.cache_ttl = timedelta(hours=cache_ttl_hours)
+        self.cache = ResponseCache("articles", ttl_seconds=self.cache_ttl.total_seconds(), path=cache_path)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'OSINT-CUAS-Dashboard/2.0 (Mozilla/5.0)'
         })
-        self._init_cache()
-
-    def _init_cache(self):
-        """Initialize cache directory"""
-        import os
-        os.makedirs(self.cache_dir, exist_ok=True)
+        self.feed_index = FeedArticleIndex(self)
 
     def _get_cache_key(self, search_term: str, country: str) -> str:
         """Generate cache key for search"""
@@ -165,32 +162,20 @@ class ArticleScraper:
 
     def _load_cache(self, search_term: str, country: str) -> Optional[List[Article]]:
         """Load articles from cache if fresh"""
-        import os
-        cache_file = os.path.join(self.cache_dir, f"{self._get_cache_key(search_term, country)}.json")
-
-        if not os.path.exists(cache_file):
-            return None
-
         try:
-            mtime = datetime.fromtimestamp(os.path.getmtime(cache_file))
-            if datetime.utcnow() - mtime > self.cache_ttl:
-                os.remove(cache_file)
+            data = self.cache.get(self._get_cache_key(search_term, country))
+            if data is None:
                 return None
-
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [self._dict_to_article(article) for article in data]
+            return [self._dict_to_article(article) for article in data]
         except Exception as e:
             logger.warning(f"Error loading cache: {e}")
             return None
 
-    def _save_cache(self, search_term: str, country: str, articles: List[Article]):
-        """Save articles to cache"""
-        import os
+    def _save_cache(self, search_term: str, country: str, articles: List[Article],
+                    ttl_seconds: Optional[float] = None):
+        """Save articles to cache (ttl_seconds overrides the cache TTL)"""
         try:
-            cache_file = os.path.join(self.cache_dir, f"{self._get_cache_key(search_term, country)}.json")
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump([a.to_dict() for a in articles], f, indent=2)
+            self.cache.set(self._get_cache_key(search_term, country), [a.to_dict() for a in articles], ttl_seconds)
         except Exception as e:
             logger.warning(f"Error saving cache: {e}")
 
@@ -212,7 +197,8 @@ class ArticleScraper:
         incident_title: str,
         country: str = "NL",
         limit: int = 10,
-        use_cache: bool = True
+        use_cache: bool = True,
+        language: Optional[str] = None
     ) -> List[Article]:
         """
         Search for articles about a specific incident.
@@ -222,28 +208,33 @@ class ArticleScraper:
             country: ISO country code (NL, BE, DE, FR, etc.)
             limit: Maximum number of articles to return
             use_cache: Use cached results if available
+            language: Only feed articles in this language (e.g. "nl")
 
         Returns:
             List of Article objects sorted by relevance and credibility
         """
 
         # Check cache first
+        cache_key = f"{incident_title}_{language}" if language else incident_title
         if use_cache:
-            cached = self._load_cache(incident_title, country)
+            cached = self._load_cache(cache_key, country)
             if cached:
                 logger.info(f"Using cached articles for '{incident_title}' ({country})")
                 return cached[:limit]
 
         articles = []
         seen_hashes = set()
+        from_index = False
+        index_built = self.feed_index.refreshed_at is not None
 
         # Try RSS feeds first
         logger.info(f"Searching RSS feeds for '{incident_title}' ({country})...")
-        rss_articles = self._search_rss_feeds(incident_title, country, limit)
+        rss_articles = self._search_rss_feeds(incident_title, country, limit, language)
         for article in rss_articles:
             if article.hash not in seen_hashes:
                 articles.append(article)
                 seen_hashes.add(article.hash)
+                from_index = True
 
         # Try Google News search
         if len(articles) < limit:
@@ -260,8 +251,11 @@ class ArticleScraper:
             reverse=False
         )
 
-        # Cache results
-        self._save_cache(incident_title, country, articles[:limit])
+        # Cache results (feed results only until the next index refresh; not at
+        # all while the index is still being built)
+        if index_built:
+            ttl_seconds = self.feed_index.refresh_seconds if from_index else None
+            self._save_cache(cache_key, country, articles[:limit], ttl_seconds)
 
         logger.info(f"Found {len(articles)} articles for '{incident_title}'")
         return articles[:limit]
@@ -270,52 +264,18 @@ class ArticleScraper:
         self,
         incident_title: str,
         country: str,
-        limit: int
+        limit: int,
+        language: Optional[str] = None
     ) -> List[Article]:
-        """Search RSS feeds for incident articles"""
-        from backend.trusted_sources import get_trusted_sources_for_country
-
-        articles = []
-        feeds = self.RSS_FEEDS.get(country, [])
-
-        # Map source names to credibility scores
-        source_map = {s['name']: s['credibility'] for s in get_trusted_sources_for_country(country)}
-
+        """Search the indexed RSS feed articles for incident articles"""
         keywords = self.SEARCH_KEYWORDS.get(country.lower(), self.SEARCH_KEYWORDS['en'])
         search_terms = incident_title.lower().split() + keywords
 
-        for source_name, feed_url in feeds:
-            try:
-                logger.debug(f"Parsing RSS feed: {source_name}")
-                feed = feedparser.parse(feed_url)
-
-                credibility = source_map.get(source_name, 0.75)
-
-                for entry in feed.entries[:20]:  # Check first 20 entries
-                    # Check if any keyword matches
-                    title_lower = entry.get('title', '').lower()
-                    summary_lower = entry.get('summary', '').lower()
-
-                    if any(term in title_lower or term in summary_lower for term in search_terms):
-                        article = Article(
-                            title=entry.get('title', 'No title'),
-                            url=entry.get('link', ''),
-                            source_name=source_name,
-                            source_credibility=credibility,
-                            publish_date=self._parse_date(entry.get('published')),
-                            summary=entry.get('summary', '')[:200],
-                            language=self._detect_language(title_lower)
-                        )
-                        articles.append(article)
-
-                        if len(articles) >= limit:
-                            return articles
-
-            except Exception as e:
-                logger.warning(f"Error parsing RSS feed {source_name}: {e}")
-                continue
-
-        return articles
+        try:
+            return self.feed_index.search(search_terms, country, limit, language)
+        except Exception as e:
+            logger.warning(f"Error searching RSS feed index: {e}")
+            return []
 
     def _search_google_news(
         self,
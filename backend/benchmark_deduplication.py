@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Deduplication Benchmark
+
+Compares the exhaustive pairwise duplicate search with the blocked + LSH
+candidate search in incident_deduplication.find_duplicate_groups: runtime,
+number of exactly-scored pairs, and whether the duplicate groups match.
+
+Usage:
+    python backend/benchmark_deduplication.py                 # 3000 synthetic incidents
+    python backend/benchmark_deduplication.py --count 10000 --skip-exhaustive
+    python backend/benchmark_deduplication.py --db data/drone_cuas.db
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import incident_deduplication
+from backend.incident_deduplication import find_duplicate_candidates, find_duplicate_groups
+
+CITIES = [
+    ("Amsterdam", 52.37, 4.90), ("Rotterdam", 51.92, 4.48), ("Brussels", 50.85, 4.35),
+    ("Antwerp", 51.22, 4.40), ("Copenhagen", 55.68, 12.57), ("Aalborg", 57.05, 9.92),
+    ("Oslo", 59.91, 10.75), ("Stockholm", 59.33, 18.07), ("Helsinki", 60.17, 24.94),
+    ("Berlin", 52.52, 13.40), ("Munich", 48.14, 11.58), ("Hamburg", 53.55, 9.99),
+    ("Frankfurt", 50.11, 8.68), ("Warsaw", 52.23, 21.01), ("Gdansk", 54.35, 18.65),
+    ("Vilnius", 54.69, 25.28), ("Riga", 56.95, 24.11), ("Tallinn", 59.44, 24.75),
+    ("Paris", 48.86, 2.35), ("Lyon", 45.76, 4.84), ("London", 51.51, -0.13),
+    ("Manchester", 53.48, -2.24), ("Dublin", 53.35, -6.26), ("Madrid", 40.42, -3.70),
+    ("Rome", 41.90, 12.50), ("Vienna", 48.21, 16.37), ("Prague", 50.08, 14.44),
+    ("Bucharest", 44.43, 26.10), ("Lisbon", 38.72, -9.14), ("Athens", 37.98, 23.73),
+]
+FACILITIES = ["Airport", "Air Base", "Naval Base", "Nuclear Power Plant", "Port", "Army Barracks", "Energy Terminal"]
+
+TITLE_TEMPLATES = [
+    "Drone sighting at {site}",
+    "Drones spotted over {site}",
+    "{site}: unidentified drone reported",
+    "Police investigate drone activity near {site}",
+    "Unknown drones seen above {site}",
+]
+EVENT_SENTENCES = [
+    "Witnesses reported {n} drones with flashing lights over {site}.",
+    "Operations at {site} were suspended for {minutes} minutes.",
+    "Police and military units searched the area around {city} but found no operator.",
+    "The drones flew in formation at an estimated altitude of {altitude} meters.",
+    "Authorities in {city} have opened an investigation into the incursion.",
+    "Officials described the overflight of {site} as deliberate.",
+]
+SOURCE_SENTENCES = [
+    "Local media first reported the incident.",
+    "The ministry of defence confirmed the sighting.",
+    "According to a spokesperson, detection systems were activated.",
+    "Residents shared videos on social media.",
+]
+
+
+def generate_incidents(count: int, duplicate_rate: float = 0.3, unknown_location_rate: float = 0.05,
+                       seed: int = 42) -> List[Dict]:
+    """Synthetic incidents: real events plus re-reports from other sources"""
+    rng = random.Random(seed)
+    sites = [
+        (f"{city} {facility}", city, lat + rng.uniform(-0.3, 0.3), lon + rng.uniform(-0.3, 0.3))
+        for city, lat, lon in CITIES
+        for facility in FACILITIES
+    ]
+    start = date(2024, 1, 1)
+    incidents = []
+
+    while len(incidents) < count:
+        area_id = rng.randrange(len(sites))
+        site, city, lat, lon = sites[area_id]
+        event_date = start + timedelta(days=rng.randrange(730))
+        values = {
+            "site": site, "city": city, "n": rng.randint(1, 12),
+            "minutes": rng.choice([20, 45, 90, 180]), "altitude": rng.choice([50, 120, 300])
+        }
+        sentences = [s.format(**values) for s in rng.sample(EVENT_SENTENCES, 4)]
+
+        reports = 1
+        while rng.random() < duplicate_rate and reports < 5:
+            reports += 1
+
+        for _ in range(reports):
+            if len(incidents) >= count:
+                break
+            report_sentences = [s for s in sentences if rng.random() < 0.85] or sentences[:1]
+            report_sentences.append(rng.choice(SOURCE_SENTENCES))
+            known = rng.random() >= unknown_location_rate
+            incidents.append({
+                "id": len(incidents) + 1,
+                "sighting_date": (event_date + timedelta(days=rng.choice([0, 0, 0, 1, -1]))).isoformat(),
+                "latitude": lat + rng.uniform(-0.05, 0.05) if known else 0,
+                "longitude": lon + rng.uniform(-0.05, 0.05) if known else 0,
+                "restricted_area_id": area_id + 1 if rng.random() < 0.7 else None,
+                "title": rng.choice(TITLE_TEMPLATES).format(site=site),
+                "description": " ".join(report_sentences),
+            })
+
+    # Same order as run_deduplication
+    incidents.sort(key=lambda inc: inc["sighting_date"], reverse=True)
+    return incidents
+
+
+def load_incidents(db_path: str) -> List[Dict]:
+    """Incidents in run_deduplication order (read-only)"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(incidents)")}
+    where = (
+        "WHERE operational_class IS NULL OR operational_class != 'DUPLICATE'"
+        if "operational_class" in columns else ""
+    )
+    cursor = conn.execute(f"""
+        SELECT id, sighting_date, latitude, longitude, restricted_area_id, title, description
+        FROM incidents
+        {where}
+        ORDER BY sighting_date DESC
+    """)
+    columns = [desc[0] for desc in cursor.description]
+    incidents = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    conn.close()
+    return incidents
+
+
+def timed_groups(incidents: List[Dict], exhaustive: bool):
+    """Run find_duplicate_groups quietly and count exact scorings"""
+    calls = [0]
+    original = incident_deduplication.is_duplicate_incident
+
+    def counting(*args, **kwargs):
+        calls[0] += 1
+        return original(*args, **kwargs)
+
+    incident_deduplication.is_duplicate_incident = counting
+    try:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            groups = find_duplicate_groups(incidents, exhaustive=exhaustive)
+        elapsed = time.perf_counter() - started
+    finally:
+        incident_deduplication.is_duplicate_incident = original
+    return groups, elapsed, calls[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incident duplicate search")
+    parser.add_argument("--count", type=int, default=3000, help="Synthetic incidents to generate (default: 3000)")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic data seed")
+    parser.add_argument("--db", help="Benchmark incidents from this SQLite database instead")
+    parser.add_argument("--skip-exhaustive", action="store_true", help="Only time the blocked search")
+    args = parser.parse_args()
+
+    incidents = load_incidents(args.db) if args.db else generate_incidents(args.count, seed=args.seed)
+    total_pairs = len(incidents) * (len(incidents) - 1) // 2
+
+    print("=" * 80)
+    print("INCIDENT DEDUPLICATION BENCHMARK")
+    print("=" * 80)
+    print(f"Incidents: {len(incidents)} ({'database ' + args.db if args.db else 'synthetic, seed %d' % args.seed})")
+    print(f"All pairs: {total_pairs:,}")
+
+    started = time.perf_counter()
+    candidates = find_duplicate_candidates(incidents)
+    candidate_seconds = time.perf_counter() - started
+    candidate_pairs = sum(len(later) for later in candidates.values())
+    print(f"Candidate pairs: {candidate_pairs:,} ({candidate_pairs / max(total_pairs, 1):.4%} of all pairs, "
+          f"generated in {candidate_seconds:.2f}s)")
+
+    blocked_groups, blocked_seconds, blocked_calls = timed_groups(incidents, exhaustive=False)
+    print(f"\nBlocked + LSH: {blocked_seconds:8.2f}s  {blocked_calls:>12,} exact scorings  "
+          f"{len(blocked_groups)} groups")
+
+    if args.skip_exhaustive:
+        return
+
+    exhaustive_groups, exhaustive_seconds, exhaustive_calls = timed_groups(incidents, exhaustive=True)
+    print(f"Exhaustive:    {exhaustive_seconds:8.2f}s  {exhaustive_calls:>12,} exact scorings  "
+          f"{len(exhaustive_groups)} groups")
+
+    print(f"\nSpeedup: {exhaustive_seconds / max(blocked_seconds, 1e-9):.1f}x")
+    if blocked_groups == exhaustive_groups:
+        print("✅ Duplicate groups identical to exhaustive search")
+    else:
+        exhaustive_set = {tuple(group) for group in exhaustive_groups}
+        blocked_set = {tuple(group) for group in blocked_groups}
+        print("❌ Duplicate groups differ from exhaustive search")
+        print(f"   Only in exhaustive: {sorted(exhaustive_set - blocked_set)[:10]}")
+        print(f"   Only in blocked:    {sorted(blocked_set - exhaustive_set)[:10]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Keeping In-Memory Caches in Step with the Database
+
+Several caches (dashboard stats, duplicate index, list totals, intervention
+analytics) follow ORM writes the same way:
+
+- `track_writes()` captures the relevant objects of each flush, and hands
+  them to the cache once the transaction commits (rolled-back work is dropped)
+- `PeriodicRebuild` fully rebuilds a cache every few minutes on the event
+  loop, as a safety net for writes that bypass the ORM (raw-SQL importers,
+  other processes)
+"""
+
+import asyncio
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def track_writes(
+    key: str,
+    capture: Callable[[Any, bool], Any],
+    on_commit: Callable[[List], None],
+    on_flush: Optional[Callable[[List], None]] = None,
+):
+    """
+    Register Session listeners that feed committed writes to a cache.
+
+    Args:
+        key: session.info key holding this cache's pending changes
+        capture: (obj, deleted) -> change for one flushed object, or None to skip it
+        on_commit: Called with the changes of a committed transaction
+        on_flush: Called with each flush's changes right away (for caches that
+                  must not serve stale data between flush and commit)
+    """
+    def _capture_changes(session, flush_context):
+        changes = []
+        for obj in list(session.new) + list(session.dirty):
+            change = capture(obj, False)
+            if change is not None:
+                changes.append(change)
+        for obj in session.deleted:
+            change = capture(obj, True)
+            if change is not None:
+                changes.append(change)
+        if changes:
+            session.info.setdefault(key, []).extend(changes)
+            if on_flush:
+                on_flush(changes)
+
+    def _apply_changes(session):
+        changes = session.info.pop(key, None)
+        if changes:
+            on_commit(changes)
+
+    def _discard_changes(session):
+        session.info.pop(key, None)
+
+    event.listen(Session, "after_flush", _capture_changes)
+    event.listen(Session, "after_commit", _apply_changes)
+    event.listen(Session, "after_rollback", _discard_changes)
+
+
+class PeriodicRebuild:
+    """
+    Mixin for caches with a `rebuild(db)` method: rebuilds every
+    `rebuild_seconds` on the event loop once `_ensure_refresh_task()` ran there
+    """
+
+    rebuild_label = "Cache"
+    rebuild_seconds: int
+    _loop = None
+
+    def _ensure_refresh_task(self):
+        """Schedule periodic rebuilds on the running event loop (once per loop)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._loop is loop:
+            return
+        self._loop = loop
+        loop.create_task(self._rebuild_periodically())
+
+    async def _rebuild_periodically(self):
+        from backend.database import SessionLocal
+
+        while True:
+            await asyncio.sleep(self.rebuild_seconds)
+            db = SessionLocal()
+            try:
+                await asyncio.to_thread(self.rebuild, db)
+            except Exception as e:
+                print(f"⚠ {self.rebuild_label} rebuild failed: {e}")
+            finally:
+                db.close()
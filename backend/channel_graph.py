@@ -0,0 +1,295 @@
+"""
+Channel Graph Service
+
+Shared in-memory graph of Telegram channels for centrality analysis:
+
+- Edges come from channel ↔ channel intelligence links (A mentions B, weighted
+  by evidence count) and from message forwards (the forwarding channel points
+  at the source channel, weighted by forward count)
+- The graph is stored as compact CSR adjacency: one offsets array plus
+  parallel target / weight arrays, so every routine is a tight loop over
+  flat arrays instead of dict-of-dict traversal
+- PageRank (power iteration), sampled betweenness (Brandes from k pivots)
+  and communities (weighted label propagation) run on those arrays
+- Results are cached until intelligence_links, message_forwards or
+  telegram_channels change (same fingerprint as the job queue uses)
+
+numpy/networkx are not dependencies of the backend, so the arrays are
+stdlib `array` buffers.
+"""
+
+import random
+import threading
+from array import array
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.jobs import data_version
+from backend.models import IntelligenceLink, MessageForward, TelegramChannel
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-6
+PAGERANK_MAX_ITERATIONS = 100
+
+# Pivots for the betweenness approximation (exact when the graph is smaller)
+BETWEENNESS_SAMPLES = 64
+
+LABEL_PROPAGATION_MAX_ROUNDS = 20
+
+SEED = 42
+
+
+class ChannelGraph:
+    """Weighted directed graph in CSR form (node i's edges: offsets[i]..offsets[i+1])"""
+
+    def __init__(self, nodes: List[Hashable], edges: Dict[Tuple[Hashable, Hashable], float]):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+
+        by_source = defaultdict(list)
+        for (source, target), weight in edges.items():
+            if source == target or source not in self.index or target not in self.index:
+                continue
+            by_source[self.index[source]].append((self.index[target], weight))
+
+        self.offsets = array('l', [0] * (n + 1))
+        self.targets = array('l')
+        self.weights = array('d')
+        self.out_weight = array('d', [0.0] * n)
+        self.in_degree = array('l', [0] * n)
+
+        for i in range(n):
+            for target, weight in sorted(by_source.get(i, ())):
+                self.targets.append(target)
+                self.weights.append(weight)
+                self.out_weight[i] += weight
+                self.in_degree[target] += 1
+            self.offsets[i + 1] = len(self.targets)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def out_degree(self, i: int) -> int:
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def undirected(self) -> "ChannelGraph":
+        """Same nodes, each edge in both directions (weights of u→v and v→u summed)"""
+        edges = defaultdict(float)
+        for i in range(len(self.nodes)):
+            for k in range(self.offsets[i], self.offsets[i + 1]):
+                j = self.targets[k]
+                edges[(self.nodes[i], self.nodes[j])] += self.weights[k]
+                edges[(self.nodes[j], self.nodes[i])] += self.weights[k]
+        return ChannelGraph(self.nodes, edges)
+
+
+def pagerank(graph: ChannelGraph, damping: float = PAGERANK_DAMPING,
+             tolerance: float = PAGERANK_TOLERANCE,
+             max_iterations: int = PAGERANK_MAX_ITERATIONS) -> List[float]:
+    """
+    Weighted PageRank by power iteration (rank of dangling nodes spread evenly)
+
+    Returns: score per node position (sums to 1)
+    """
+    n = len(graph)
+    if n == 0:
+        return []
+
+    offsets, targets, weights, out_weight = graph.offsets, graph.targets, graph.weights, graph.out_weight
+    dangling = [i for i in range(n) if out_weight[i] == 0]
+    rank = [1.0 / n] * n
+
+    for _ in range(max_iterations):
+        base = (1.0 - damping) / n + damping * sum(rank[i] for i in dangling) / n
+        new_rank = [base] * n
+        for i in range(n):
+            if out_weight[i]:
+                share = damping * rank[i] / out_weight[i]
+                for k in range(offsets[i], offsets[i + 1]):
+                    new_rank[targets[k]] += share * weights[k]
+
+        error = sum(abs(new - old) for new, old in zip(new_rank, rank))
+        rank = new_rank
+        if error < n * tolerance:
+            break
+
+    return rank
+
+
+def approximate_betweenness(graph: ChannelGraph, samples: int = BETWEENNESS_SAMPLES,
+                            seed: int = SEED) -> List[float]:
+    """
+    Betweenness centrality from shortest paths (unweighted, directed) starting
+    at `samples` random pivots, scaled up to all sources and normalized to 0-1
+
+    Returns: score per node position
+    """
+    n = len(graph)
+    betweenness = [0.0] * n
+    if n < 3:
+        return betweenness
+
+    offsets, targets = graph.offsets, graph.targets
+    pivots = range(n) if samples >= n else random.Random(seed).sample(range(n), samples)
+
+    for source in pivots:
+        # Brandes: BFS counting shortest paths, then accumulate dependencies
+        order = []
+        predecessors = [[] for _ in range(n)]
+        paths = [0] * n
+        distance = [-1] * n
+        paths[source] = 1
+        distance[source] = 0
+        queue = deque([source])
+
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            for k in range(offsets[v], offsets[v + 1]):
+                w = targets[k]
+                if distance[w] < 0:
+                    distance[w] = distance[v] + 1
+                    queue.append(w)
+                if distance[w] == distance[v] + 1:
+                    paths[w] += paths[v]
+                    predecessors[w].append(v)
+
+        dependency = [0.0] * n
+        for w in reversed(order):
+            for v in predecessors[w]:
+                dependency[v] += paths[v] / paths[w] * (1 + dependency[w])
+            if w != source:
+                betweenness[w] += dependency[w]
+
+    scale = (n / len(pivots)) / ((n - 1) * (n - 2))
+    return [value * scale for value in betweenness]
+
+
+def label_propagation_communities(graph: ChannelGraph, max_rounds: int = LABEL_PROPAGATION_MAX_ROUNDS,
+                                  seed: int = SEED) -> List[int]:
+    """
+    Weighted label propagation on the undirected graph: each node repeatedly
+    adopts the label with the highest total edge weight among its neighbours
+
+    Returns: community label per node position (isolated nodes keep their own)
+    """
+    undirected = graph.undirected()
+    n = len(undirected)
+    offsets, targets, weights = undirected.offsets, undirected.targets, undirected.weights
+    labels = list(range(n))
+    order = [i for i in range(n) if offsets[i + 1] > offsets[i]]
+    rng = random.Random(seed)
+
+    for _ in range(max_rounds):
+        rng.shuffle(order)
+        changed = False
+        for i in order:
+            totals = defaultdict(float)
+            for k in range(offsets[i], offsets[i + 1]):
+                totals[labels[targets[k]]] += weights[k]
+            best_weight = max(totals.values())
+            if totals.get(labels[i]) == best_weight:
+                continue  # Keep the current label on ties
+            labels[i] = min(label for label, weight in totals.items() if weight == best_weight)
+            changed = True
+        if not changed:
+            break
+
+    return labels
+
+
+def load_channel_graph(db: Session) -> ChannelGraph:
+    """Build the channel graph from intelligence links and message forwards"""
+    channel_ids = [channel_id for (channel_id,) in db.query(TelegramChannel.id).order_by(TelegramChannel.id)]
+    edges = defaultdict(float)
+
+    for source, target, weight in db.query(
+        IntelligenceLink.entity_a_id,
+        IntelligenceLink.entity_b_id,
+        func.sum(func.coalesce(IntelligenceLink.evidence_count, 1))
+    ).filter(
+        IntelligenceLink.entity_a_type == 'telegram_channel',
+        IntelligenceLink.entity_b_type == 'telegram_channel'
+    ).group_by(IntelligenceLink.entity_a_id, IntelligenceLink.entity_b_id):
+        edges[(source, target)] += weight
+
+    # Forwarding amplifies the source channel
+    for forwarder, source, count in db.query(
+        MessageForward.destination_channel_id,
+        MessageForward.source_channel_id,
+        func.count(MessageForward.id)
+    ).group_by(MessageForward.destination_channel_id, MessageForward.source_channel_id):
+        edges[(forwarder, source)] += count
+
+    return ChannelGraph(channel_ids, edges)
+
+
+class ChannelGraphService:
+    """Channel centrality results, recomputed only when links or forwards change"""
+
+    def __init__(self, betweenness_samples: int = BETWEENNESS_SAMPLES):
+        self.betweenness_samples = betweenness_samples
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._analysis: Optional[Dict] = None
+
+    def analysis(self, db: Session, refresh: bool = False) -> Dict:
+        """
+        Centrality of every channel (cached)
+
+        Returns: {"computed_at", "node_count", "edge_count", "channels", "communities", "cached"}
+            channels: per channel id - pagerank, betweenness, degrees, community
+            communities: [[channel ids]] with 2+ members, largest first
+        """
+        version = data_version(db, [IntelligenceLink, MessageForward, TelegramChannel])
+        with self._lock:
+            if not refresh and self._analysis and self._version == version:
+                return {**self._analysis, "cached": True}
+
+            graph = load_channel_graph(db)
+            ranks = pagerank(graph)
+            betweenness = approximate_betweenness(graph, self.betweenness_samples)
+            labels = label_propagation_communities(graph)
+
+            members = defaultdict(list)
+            for i, label in enumerate(labels):
+                members[label].append(i)
+            communities = sorted(
+                (group for group in members.values() if len(group) > 1),
+                key=lambda group: (-len(group), group[0])
+            )
+            community_of = {i: number for number, group in enumerate(communities) for i in group}
+
+            channels = {
+                channel_id: {
+                    "pagerank": ranks[i],
+                    "betweenness": betweenness[i],
+                    "in_degree": graph.in_degree[i],
+                    "out_degree": graph.out_degree(i),
+                    "community": community_of.get(i)
+                }
+                for i, channel_id in enumerate(graph.nodes)
+            }
+
+            self._version = version
+            self._analysis = {
+                "computed_at": datetime.utcnow(),
+                "node_count": len(graph),
+                "edge_count": graph.edge_count,
+                "channels": channels,
+                "communities": [[graph.nodes[i] for i in group] for group in communities]
+            }
+            return {**self._analysis, "cached": False}
+
+
+# Shared instance used by the API and the link analysis engine
+channel_graph_service = ChannelGraphService()
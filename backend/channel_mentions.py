@@ -0,0 +1,79 @@
+"""
+Channel Mention Index
+
+Which tracked Telegram channels each message @-mentions, extracted in one
+streaming pass over telegram_messages:
+
+- Only messages containing '@' are read (filtered in SQL)
+- One precompiled pattern finds the mentions
+- Usernames resolve through an in-memory username → channel id map
+  (case-insensitive, like Telegram usernames)
+
+Used by link analysis (channel → mentioned channel links) and by the Maltego
+export (channels mentioned together in one message).
+"""
+
+import re
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.models import TelegramChannel, TelegramMessage
+
+MENTION_PATTERN = re.compile(r'@(\w+)')
+
+STREAM_BATCH_SIZE = 5000
+
+# One message that mentions at least one tracked channel
+MessageMentions = namedtuple(
+    "MessageMentions",
+    ["id", "channel_id", "message_id", "timestamp", "mentioned_channel_ids"]
+)
+
+
+def channel_username_map(channels: List[TelegramChannel]) -> Dict[str, int]:
+    """Lower-cased username → channel id (lowest id wins on case-only clashes)"""
+    usernames = {}
+    for channel in sorted(channels, key=lambda ch: ch.id):
+        if channel.username:
+            usernames.setdefault(channel.username.lower(), channel.id)
+    return usernames
+
+
+def extract_mentions(text: str, usernames: Dict[str, int]) -> List[int]:
+    """Ids of tracked channels @-mentioned in `text`, in order of first mention"""
+    mentioned = []
+    for username in MENTION_PATTERN.findall(text or ''):
+        channel_id = usernames.get(username.lower())
+        if channel_id is not None and channel_id not in mentioned:
+            mentioned.append(channel_id)
+    return mentioned
+
+
+def iter_message_mentions(db: Session, usernames: Optional[Dict[str, int]] = None) -> Iterator[MessageMentions]:
+    """
+    Stream messages that mention tracked channels, in message id order
+
+    Args:
+        usernames: Username map to resolve against (default: all channels)
+    """
+    if usernames is None:
+        usernames = channel_username_map(db.query(TelegramChannel).all())
+    if not usernames:
+        return
+
+    messages = db.query(
+        TelegramMessage.id,
+        TelegramMessage.channel_id,
+        TelegramMessage.message_id,
+        TelegramMessage.timestamp,
+        TelegramMessage.text_content
+    ).filter(
+        TelegramMessage.text_content.like('%@%')
+    ).order_by(TelegramMessage.id).yield_per(STREAM_BATCH_SIZE)
+
+    for row_id, channel_id, message_id, timestamp, text in messages:
+        mentioned = extract_mentions(text, usernames)
+        if mentioned:
+            yield MessageMentions(row_id, channel_id, message_id, timestamp, tuple(mentioned))
@@ -0,0 +1,208 @@
+"""
+Coordinated Forwarding Detection
+
+Flags messages that were forwarded to many channels in a short burst - a
+signature of coordinated amplification networks.
+
+Forwards are streamed in (source_message_id, forward_timestamp) order, so only
+one message's forwards are held in memory at a time. For each message a
+sliding window finds the densest burst: the window of `time_window_minutes`
+containing the most distinct destination channels. A message is flagged when
+that burst reaches `min_channels`, even if late stragglers were forwarded
+hours afterwards.
+
+Detection results are persisted (CoordinatedForwardRun / CoordinatedForwardEvent)
+and re-used until new forwards arrive.
+"""
+
+import json
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.models import (
+    CoordinatedForwardEvent, CoordinatedForwardRun, MessageForward,
+    TelegramChannel, TelegramMessage
+)
+
+STREAM_BATCH_SIZE = 5000
+MAX_COORDINATION_SCORE = 10.0
+
+
+def densest_burst(forwards: List[Tuple[datetime, int]], window: timedelta) -> Optional[Dict]:
+    """
+    Find the time window holding the most distinct destination channels.
+
+    Args:
+        forwards: (forward_timestamp, destination_channel_id), sorted by time
+        window: Maximum burst duration
+
+    Returns:
+        {"channel_ids", "first_forward", "last_forward"} for the densest burst
+        (shortest one on ties), or None if there are no forwards
+    """
+    in_window = Counter()
+    best = None
+    best_key = None
+    left = 0
+
+    for right, (timestamp, channel_id) in enumerate(forwards):
+        in_window[channel_id] += 1
+        while timestamp - forwards[left][0] > window:
+            left_channel = forwards[left][1]
+            in_window[left_channel] -= 1
+            if not in_window[left_channel]:
+                del in_window[left_channel]
+            left += 1
+
+        span = timestamp - forwards[left][0]
+        key = (len(in_window), -span)
+        if best_key is None or key > best_key:
+            best_key = key
+            best = {
+                "channel_ids": sorted(in_window),
+                "first_forward": forwards[left][0],
+                "last_forward": timestamp,
+            }
+
+    return best
+
+
+def _stream_forwards(db: Session) -> Iterable:
+    return db.query(
+        MessageForward.source_message_id,
+        MessageForward.forward_timestamp,
+        MessageForward.destination_channel_id
+    ).order_by(
+        MessageForward.source_message_id,
+        MessageForward.forward_timestamp
+    ).yield_per(STREAM_BATCH_SIZE)
+
+
+def detect_coordinated_forwards(db: Session, time_window_minutes: int = 30, min_channels: int = 5) -> List[Dict]:
+    """
+    Stream all forwards and return burst events (unsorted, not persisted)
+    """
+    window = timedelta(minutes=time_window_minutes)
+    events = []
+
+    for source_message_id, rows in groupby(_stream_forwards(db), key=lambda row: row[0]):
+        forwards = [(timestamp, channel_id) for _, timestamp, channel_id in rows]
+        if len(forwards) < min_channels:
+            continue
+
+        burst = densest_burst(forwards, window)
+        if not burst or len(burst["channel_ids"]) < min_channels:
+            continue
+
+        destination_count = len(burst["channel_ids"])
+        events.append({
+            "source_message_id": source_message_id,
+            "destination_channel_ids": burst["channel_ids"],
+            "destination_count": destination_count,
+            "total_forwards": len(forwards),
+            "first_forward": burst["first_forward"],
+            "last_forward": burst["last_forward"],
+            "burst_minutes": round((burst["last_forward"] - burst["first_forward"]).total_seconds() / 60, 1),
+            "coordination_score": min(destination_count / time_window_minutes, MAX_COORDINATION_SCORE)  # Speed score
+        })
+
+    return events
+
+
+def run_detection(db: Session, time_window_minutes: int = 30, min_channels: int = 5) -> CoordinatedForwardRun:
+    """Detect bursts and replace the stored run for these settings"""
+    watermark = db.query(func.max(MessageForward.id)).scalar() or 0
+    events = detect_coordinated_forwards(db, time_window_minutes, min_channels)
+
+    for old_run in db.query(CoordinatedForwardRun).filter(
+        CoordinatedForwardRun.time_window_minutes == time_window_minutes,
+        CoordinatedForwardRun.min_channels == min_channels
+    ).all():
+        db.delete(old_run)
+
+    run = CoordinatedForwardRun(
+        time_window_minutes=time_window_minutes,
+        min_channels=min_channels,
+        forwards_watermark=watermark,
+        event_count=len(events)
+    )
+    run.events = [
+        CoordinatedForwardEvent(
+            **{**event, "destination_channel_ids": json.dumps(event["destination_channel_ids"])}
+        )
+        for event in events
+    ]
+    db.add(run)
+    db.commit()
+    return run
+
+
+def get_or_run_detection(
+    db: Session,
+    time_window_minutes: int = 30,
+    min_channels: int = 5,
+    refresh: bool = False
+) -> CoordinatedForwardRun:
+    """Return the stored run for these settings, re-detecting only if forwards were added"""
+    run = db.query(CoordinatedForwardRun).filter(
+        CoordinatedForwardRun.time_window_minutes == time_window_minutes,
+        CoordinatedForwardRun.min_channels == min_channels
+    ).order_by(CoordinatedForwardRun.id.desc()).first()
+
+    if run and not refresh:
+        watermark = db.query(func.max(MessageForward.id)).scalar() or 0
+        if watermark == run.forwards_watermark:
+            return run
+
+    return run_detection(db, time_window_minutes, min_channels)
+
+
+def serialize_events(db: Session, run: CoordinatedForwardRun) -> List[Dict]:
+    """Stored events with message and channel metadata (two batched lookups)"""
+    events = db.query(CoordinatedForwardEvent).filter(
+        CoordinatedForwardEvent.run_id == run.id
+    ).order_by(CoordinatedForwardEvent.coordination_score.desc(), CoordinatedForwardEvent.id).all()
+
+    channel_ids_by_event = {event.id: json.loads(event.destination_channel_ids or "[]") for event in events}
+    all_channel_ids = {channel_id for ids in channel_ids_by_event.values() for channel_id in ids}
+    message_ids = {event.source_message_id for event in events}
+
+    channels = {
+        channel.id: channel
+        for channel in db.query(TelegramChannel).filter(TelegramChannel.id.in_(all_channel_ids)).all()
+    } if all_channel_ids else {}
+    messages = {
+        message.id: message
+        for message in db.query(TelegramMessage).filter(TelegramMessage.id.in_(message_ids)).all()
+    } if message_ids else {}
+
+    results = []
+    for event in events:
+        source_msg = messages.get(event.source_message_id)
+        if not source_msg:
+            continue
+
+        results.append({
+            "source_message_id": event.source_message_id,
+            "source_channel_id": source_msg.channel_id,
+            "message_preview": source_msg.text_content[:200] if source_msg.text_content else "",
+            "message_timestamp": source_msg.timestamp.isoformat(),
+            "destination_count": event.destination_count,
+            "total_forwards": event.total_forwards,
+            "destination_channels": [
+                {"username": channels[channel_id].username, "title": channels[channel_id].title}
+                for channel_id in channel_ids_by_event[event.id]
+                if channel_id in channels
+            ],
+            "time_window_minutes": event.burst_minutes,
+            "first_forward": event.first_forward.isoformat(),
+            "last_forward": event.last_forward.isoformat(),
+            "coordination_score": event.coordination_score
+        })
+
+    return results
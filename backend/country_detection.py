@@ -0,0 +1,62 @@
+"""
+Country Detection for Incidents
+
+Resolves the country an incident belongs to from its title and the name of the
+linked restricted area. The result is stored on `incidents.country` when the
+incident is written, so listing and filtering never repeat the keyword scan.
+"""
+
+from typing import Optional
+
+# Country keywords mapping (checked in order, first match wins)
+COUNTRY_KEYWORDS = {
+    'NL': ['netherlands', 'dutch', 'amsterdam', 'rotterdam', 'schiphol', 'volkel', 'holland', 'eindhoven', 'utrecht'],
+    'BE': ['belgium', 'belgian', 'brussels', 'zaventem', 'antwerp', 'bruges', 'flanders'],
+    'DE': ['germany', 'german', 'berlin', 'munich', 'hamburg', 'frankfurt', 'cologne', 'brunsbüttel'],
+    'FR': ['france', 'french', 'paris', 'lyon', 'marseille', 'toulouse', 'nice'],
+    'UK': ['united kingdom', 'british', 'london', 'manchester', 'birmingham', 'scotland', 'wales'],
+    'EE': ['estonia', 'estonian', 'tallinn', 'reedo'],
+    'LV': ['latvia', 'latvian', 'riga'],
+    'LT': ['lithuania', 'lithuanian', 'vilnius'],
+    'PL': ['poland', 'polish', 'warsaw', 'krakow'],
+    'IT': ['italy', 'italian', 'rome', 'milan'],
+    'ES': ['spain', 'spanish', 'madrid', 'barcelona'],
+}
+
+
+def detect_country_from_text(text: str) -> Optional[str]:
+    """
+    Detect country code from text (title or location name).
+    Returns country code (e.g., 'NL', 'BE', 'DE') or None.
+    """
+    if not text:
+        return None
+
+    text_lower = text.lower()
+
+    # Check each country's keywords
+    for country_code, keywords in COUNTRY_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in text_lower:
+                return country_code
+
+    return None
+
+
+def resolve_incident_country(
+    title: Optional[str],
+    location_name: Optional[str] = None,
+    area_country: Optional[str] = None
+) -> Optional[str]:
+    """
+    Resolve the display country for an incident.
+
+    Priority: detected from title > detected from location > restricted_area country.
+    This fixes cases where restricted_area is mismatched (e.g., Dutch incidents
+    linked to Estonian bases).
+    """
+    return (
+        detect_country_from_text(title)
+        or detect_country_from_text(location_name)
+        or area_country
+    )
@@ -2,16 +2,31 @@
 """
 Daily News Scraper - Automated drone incident collection
 Scrapes RSS feeds from all European news sources daily
+
+Feeds are fetched concurrently with conditional GETs (see backend/feed_fetcher.py):
+unchanged feeds (304) and entries already seen on a previous run are skipped
+before keyword matching, so run time scales with new articles. The feed state
+lives in the same database as the articles and is only saved after they are.
 """
 
-import feedparser
+import sys
 import sqlite3
 from datetime import datetime, timedelta
-import time
-from typing import List, Dict
+from pathlib import Path
+from typing import Dict, List, Tuple
 import re
 import hashlib
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend.feed_fetcher import FeedFetch, fetch_new_entries, record_feed_state
+from backend.models import FeedState
+
+STAGING_DB_PATH = 'data/drone_cuas_staging.db'
+
 # RSS Feeds per country
 RSS_FEEDS = {
     'NL': [
@@ -101,51 +116,77 @@ def generate_hash(title: str, url: str) -> str:
     return hashlib.md5(content).hexdigest()
 
 
-def scrape_feed(source_name: str, feed_url: str, country: str, days_back: int = 7) -> List[Dict]:
-    """Scrape a single RSS feed"""
-    print(f"  Scraping {source_name} ({country})...")
+def extract_incident_articles(entries: List, source_name: str, country: str, days_back: int = 7) -> List[Dict]:
+    """Drone incident articles among new feed entries (newest first)"""
+    articles = []
+    cutoff_date = datetime.now() - timedelta(days=days_back)
 
-    try:
-        feed = feedparser.parse(feed_url)
-        articles = []
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-
-        for entry in feed.entries[:50]:  # Limit to 50 most recent
-            # Parse publish date
-            pub_date = None
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                pub_date = datetime(*entry.published_parsed[:6])
-            elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                pub_date = datetime(*entry.updated_parsed[:6])
-
-            # Skip if too old
-            if pub_date and pub_date < cutoff_date:
-                continue
-
-            title = entry.get('title', '')
-            summary = entry.get('summary', entry.get('description', ''))
-            url = entry.get('link', '')
-
-            # Check if it's a drone incident
-            if is_drone_incident(title, summary):
-                articles.append({
-                    'title': title,
-                    'url': url,
-                    'source': source_name,
-                    'country': country,
-                    'pub_date': pub_date or datetime.now(),
-                    'summary': summary[:500],
-                    'hash': generate_hash(title, url)
-                })
-
-        return articles
-
-    except Exception as e:
-        print(f"    Error scraping {source_name}: {e}")
-        return []
-
-
-def save_to_database(articles: List[Dict], db_path: str = 'data/drone_cuas_staging.db'):
+    for entry in entries[:50]:  # Limit to 50 most recent
+        # Parse publish date
+        pub_date = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            pub_date = datetime(*entry.published_parsed[:6])
+        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+            pub_date = datetime(*entry.updated_parsed[:6])
+
+        # Skip if too old
+        if pub_date and pub_date < cutoff_date:
+            continue
+
+        title = entry.get('title', '')
+        summary = entry.get('summary', entry.get('description', ''))
+        url = entry.get('link', '')
+
+        # Check if it's a drone incident
+        if is_drone_incident(title, summary):
+            articles.append({
+                'title': title,
+                'url': url,
+                'source': source_name,
+                'country': country,
+                'pub_date': pub_date or datetime.now(),
+                'summary': summary[:500],
+                'hash': generate_hash(title, url)
+            })
+
+    return articles
+
+
+def feed_state_session(db_path: str = STAGING_DB_PATH) -> Session:
+    """Session on the articles database, with its feed_state table"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    FeedState.__table__.create(engine, checkfirst=True)
+    return Session(engine)
+
+
+def scrape_feeds(db: Session, days_back: int = 7) -> Tuple[List[Dict], Dict[str, FeedFetch]]:
+    """
+    Fetch all feeds concurrently and match only new entries
+
+    Returns: (articles, fetch results) - pass the results to record_feed_state()
+             once the articles are saved
+    """
+    feed_urls = [feed_url for feeds in RSS_FEEDS.values() for _, feed_url in feeds]
+    fetched = fetch_new_entries(db, feed_urls)
+
+    all_articles = []
+    for country, feeds in RSS_FEEDS.items():
+        print(f"\n🌍 {country}:")
+        for source_name, feed_url in feeds:
+            result = fetched[feed_url]
+            if result.error:
+                print(f"    Error scraping {source_name}: {result.error}")
+            elif result.not_modified:
+                print(f"  {source_name}: not modified")
+            else:
+                articles = extract_incident_articles(result.entries, source_name, country, days_back)
+                all_articles.extend(articles)
+                print(f"  {source_name}: {len(result.entries)} new entries, {len(articles)} potential incidents")
+
+    return all_articles, fetched
+
+
+def save_to_database(articles: List[Dict], db_path: str = STAGING_DB_PATH):
     """Save articles to incidents database"""
 
     if not articles:
@@ -256,27 +297,26 @@ def main():
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 80)
 
-    all_articles = []
+    db = feed_state_session(STAGING_DB_PATH)
+    try:
+        all_articles, fetched = scrape_feeds(db, days_back=7)
 
-    for country, feeds in RSS_FEEDS.items():
-        print(f"\n🌍 {country}:")
-        for source_name, feed_url in feeds:
-            articles = scrape_feed(source_name, feed_url, country, days_back=7)
-            all_articles.extend(articles)
-            print(f"    Found {len(articles)} potential incidents")
-            time.sleep(1)  # Rate limiting
-
-    print(f"\n📊 Total articles found: {len(all_articles)}")
-
-    if all_articles:
-        print("\n📰 Recent drone incidents:")
-        for article in sorted(all_articles, key=lambda x: x['pub_date'], reverse=True)[:10]:
-            print(f"  • [{article['country']}] {article['title'][:80]}...")
-            print(f"    {article['source']} - {article['pub_date'].strftime('%Y-%m-%d %H:%M')}")
-            print()
-
-    # Save to database
-    save_to_database(all_articles)
+        print(f"\n📊 Total articles found: {len(all_articles)}")
+
+        if all_articles:
+            print("\n📰 Recent drone incidents:")
+            for article in sorted(all_articles, key=lambda x: x['pub_date'], reverse=True)[:10]:
+                print(f"  • [{article['country']}] {article['title'][:80]}...")
+                print(f"    {article['source']} - {article['pub_date'].strftime('%Y-%m-%d %H:%M')}")
+                print()
+
+        # Save to database
+        save_to_database(all_articles, STAGING_DB_PATH)
+
+        # Entries count as seen only once their articles are stored
+        record_feed_state(db, fetched)
+    finally:
+        db.close()
 
     print("=" * 80)
     print(f"Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -46,8 +46,121 @@ def get_db() -> Session:
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
     print("✓ Database initialized")
 
+def upgrade_schema():
+    """Add columns introduced after the table was first created (idempotent)"""
+    from sqlalchemy import text
+
+    with engine.begin() as conn:
+        existing_columns = [row[1] for row in conn.execute(text("PRAGMA table_info(incidents)"))]
+        if "country" not in existing_columns:
+            conn.execute(text("ALTER TABLE incidents ADD COLUMN country VARCHAR(2)"))
+            print("✓ Added column: incidents.country")
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_incidents_country ON incidents (country)"))
+
+        upgrade_telegram_channels(conn)
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_message_forwards_source_message_time "
+            "ON message_forwards (source_message_id, forward_timestamp)"
+        ))
+
+        from backend.spatial_index import ensure_spatial_index
+        ensure_spatial_index(conn)
+
+        has_link_keys = conn.execute(text(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name IN "
+            "('uq_intelligence_links_entities', 'uq_intelligence_links_pseudo_entities')"
+        )).scalar() == 2
+        if not has_link_keys:
+            # Earlier link discovery runs re-inserted the same links; keep one per
+            # entity pair and relationship (analyst-verified first, then oldest).
+            # Pseudo-entities (entity_b_id 0, e.g. phone numbers) are told apart by identifier.
+            removed = conn.execute(text("""
+                DELETE FROM intelligence_links WHERE id NOT IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY entity_a_type, entity_a_id, entity_b_type, entity_b_id,
+                                         CASE WHEN entity_b_id = 0 THEN entity_b_identifier END,
+                                         relationship_type
+                            ORDER BY analyst_verified DESC, id
+                        ) AS rank
+                        FROM intelligence_links
+                    ) WHERE rank = 1
+                )
+            """)).rowcount
+            # Replaces the first version of the key, which did not exclude pseudo-entities
+            conn.execute(text("DROP INDEX IF EXISTS uq_intelligence_links_entities"))
+            conn.execute(text(
+                "CREATE UNIQUE INDEX uq_intelligence_links_entities ON intelligence_links "
+                "(entity_a_type, entity_a_id, entity_b_type, entity_b_id, relationship_type) "
+                "WHERE entity_b_id != 0"
+            ))
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_intelligence_links_pseudo_entities ON intelligence_links "
+                "(entity_a_type, entity_a_id, entity_b_type, entity_b_identifier, relationship_type) "
+                "WHERE entity_b_id = 0"
+            ))
+            print(f"✓ Added unique keys on intelligence_links ({removed} duplicate links removed)")
+
+    backfill_incident_countries()
+    rebuild_message_daily_counts()
+
+def upgrade_telegram_channels(conn):
+    """Add telegram_channels.scrape_priority (also used on the staging scrape database)"""
+    from sqlalchemy import text
+
+    channel_columns = [row[1] for row in conn.execute(text("PRAGMA table_info(telegram_channels)"))]
+    if "scrape_priority" not in channel_columns:
+        conn.execute(text("ALTER TABLE telegram_channels ADD COLUMN scrape_priority INTEGER"))
+        print("✓ Added column: telegram_channels.scrape_priority")
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_telegram_channels_scrape_priority ON telegram_channels (scrape_priority)"
+    ))
+
+def rebuild_message_daily_counts(force: bool = False):
+    """Rebuild telegram_message_daily_counts if it no longer matches telegram_messages"""
+    from sqlalchemy import text
+
+    with engine.begin() as conn:
+        counted = conn.execute(text("SELECT COALESCE(SUM(count), 0) FROM telegram_message_daily_counts")).scalar()
+        messages = conn.execute(text("SELECT COUNT(*) FROM telegram_messages")).scalar()
+        if counted == messages and not force:
+            return
+
+        conn.execute(text("DELETE FROM telegram_message_daily_counts"))
+        conn.execute(text("""
+            INSERT INTO telegram_message_daily_counts (channel_id, day, count)
+            SELECT channel_id, DATE(timestamp), COUNT(*)
+            FROM telegram_messages
+            GROUP BY channel_id, DATE(timestamp)
+        """))
+        print(f"✓ Rebuilt Telegram daily message counts ({messages} messages)")
+
+def backfill_incident_countries():
+    """Resolve country for incidents written outside the ORM (raw SQL imports)"""
+    from sqlalchemy import text
+    from backend.country_detection import resolve_incident_country
+
+    with engine.begin() as conn:
+        rows = conn.execute(text("""
+            SELECT i.id, i.title, ra.name, ra.country
+            FROM incidents i
+            LEFT JOIN restricted_areas ra ON i.restricted_area_id = ra.id
+            WHERE i.country IS NULL
+        """)).all()
+
+        updates = []
+        for incident_id, title, area_name, area_country in rows:
+            country = resolve_incident_country(title, area_name, area_country)
+            if country:
+                updates.append({"id": incident_id, "country": country})
+
+        if updates:
+            conn.execute(text("UPDATE incidents SET country = :country WHERE id = :id"), updates)
+            print(f"✓ Resolved country for {len(updates)} incidents")
+
 def import_json_data():
     """Import data from JSON export if available"""
     import json
@@ -128,6 +241,7 @@ def import_json_data():
             print(f"  ✓ {table_name}: Imported {len(rows)} records")
 
         print("✓ JSON import complete!")
+        backfill_incident_countries()
         return True
 
     except Exception as e:
@@ -0,0 +1,276 @@
+"""
+Write-Time Duplicate Check
+
+New incidents (API submissions and bulk importers) are checked for duplicates
+before they are committed, instead of waiting for the batch deduplication
+script. Matches are flagged like the batch merge does: the existing incident
+becomes MERGED_MASTER (sources and best description merged in) and the new
+one is stored as DUPLICATE.
+
+Candidates come from an in-memory spatio-temporal index of active incidents:
+
+- Keyed by (date bucket, geohash cell), as in find_duplicate_candidates, so a
+  check only scores incidents from neighbouring days and cells
+- Built once from the database, then kept current through cache_sync (ORM
+  writes applied on commit, periodic full rebuilds)
+
+Scoring is the exact is_duplicate_incident check.
+"""
+
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from backend.cache_sync import PeriodicRebuild, track_writes
+from backend.incident_deduplication import date_bucket, is_duplicate_incident, parse_sighting_date
+from backend.models import Incident
+from backend.spatial_index import geohash_cells_near, geohash_encode, geohash_precision_for
+
+# Must match the is_duplicate_incident defaults used for scoring
+TIME_THRESHOLD_DAYS = 2
+DISTANCE_THRESHOLD_KM = 50.0
+
+# Full rebuild interval (catches writes that bypass the ORM)
+INDEX_REBUILD_SECONDS = 600
+
+# Incidents that can absorb duplicates (the ones shown in incident lists)
+ACTIVE_OPERATIONAL_CLASSES = (None, "MERGED_MASTER", "RSS_detected")
+
+MAX_MERGED_SOURCES = 5
+
+
+def _entry(incident) -> Optional[Dict]:
+    """Fields is_duplicate_incident needs, or None if the incident is not active"""
+    if incident.operational_class not in ACTIVE_OPERATIONAL_CLASSES:
+        return None
+    sighting_date = incident.sighting_date
+    return {
+        "id": incident.id,
+        "sighting_date": sighting_date.isoformat() if hasattr(sighting_date, "isoformat") else sighting_date,
+        "latitude": incident.latitude,
+        "longitude": incident.longitude,
+        "restricted_area_id": incident.restricted_area_id,
+        "title": incident.title,
+        "description": incident.description,
+    }
+
+
+class DuplicateIndex(PeriodicRebuild):
+    """In-memory (date bucket, geohash) index of active incidents"""
+
+    rebuild_label = "Duplicate index"
+
+    def __init__(self, rebuild_seconds: int = INDEX_REBUILD_SECONDS):
+        self.rebuild_seconds = rebuild_seconds
+        self.precision = geohash_precision_for(DISTANCE_THRESHOLD_KM)
+        self.built_at: Optional[datetime] = None
+
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._entries: Dict[int, Dict] = {}
+        self._keys: Dict[int, Tuple] = {}  # id -> (date bucket, geohash or None)
+        self._by_cell = defaultdict(set)    # (date bucket, geohash) -> ids
+        self._unlocated = defaultdict(set)  # date bucket -> ids without a location
+        self._by_bucket = defaultdict(set)  # date bucket -> all ids
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def rebuild(self, db: Session):
+        """Reload active incidents from the database"""
+        rows = db.query(
+            Incident.id,
+            Incident.operational_class,
+            Incident.sighting_date,
+            Incident.latitude,
+            Incident.longitude,
+            Incident.restricted_area_id,
+            Incident.title,
+            Incident.description,
+        ).filter(or_(
+            Incident.operational_class.is_(None),
+            Incident.operational_class.in_([c for c in ACTIVE_OPERATIONAL_CLASSES if c])
+        )).all()
+
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._apply(row.id, _entry(row))
+            self.built_at = datetime.utcnow()
+
+    def warm(self):
+        """Build the index in its own session (server startup)"""
+        from backend.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+            print(f"✓ Duplicate index warmed ({len(self._entries)} active incidents)")
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def _key(self, entry: Dict) -> Optional[Tuple]:
+        parsed = parse_sighting_date(entry["sighting_date"])
+        if parsed is None:
+            return None  # Never a duplicate (see calculate_temporal_distance)
+        cell = None
+        if entry["latitude"] != 0:
+            cell = geohash_encode(entry["latitude"], entry["longitude"], self.precision)
+        return (date_bucket(parsed, TIME_THRESHOLD_DAYS), cell)
+
+    def _apply(self, incident_id: int, entry: Optional[Dict]):
+        """Replace the indexed entry of one incident (entry=None removes it)"""
+        self._entries.pop(incident_id, None)
+        old_key = self._keys.pop(incident_id, None)
+        if old_key is not None:
+            bucket, cell = old_key
+            self._by_bucket[bucket].discard(incident_id)
+            if cell is None:
+                self._unlocated[bucket].discard(incident_id)
+            else:
+                self._by_cell[old_key].discard(incident_id)
+
+        if entry is None:
+            return
+        key = self._key(entry)
+        if key is None:
+            return
+        bucket, cell = key
+        self._entries[incident_id] = entry
+        self._keys[incident_id] = key
+        self._by_bucket[bucket].add(incident_id)
+        if cell is None:
+            self._unlocated[bucket].add(incident_id)
+        else:
+            self._by_cell[key].add(incident_id)
+
+    def apply_changes(self, changes):
+        """Apply (id, entry) changes captured at flush time"""
+        if self.built_at is None:
+            return  # Nothing to update yet; the first check builds from the database
+        with self._lock:
+            for incident_id, entry in changes:
+                self._apply(incident_id, entry)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def candidates(self, db: Session, entry: Dict) -> List[Dict]:
+        """Indexed incidents in the date buckets and cells around `entry`"""
+        if self.built_at is None:
+            self.rebuild(db)
+        self._ensure_refresh_task()
+
+        key = self._key(entry)
+        if key is None:
+            return []
+        bucket, cell = key
+        cells = [] if cell is None else geohash_cells_near(
+            entry["latitude"], entry["longitude"], DISTANCE_THRESHOLD_KM, self.precision
+        )
+
+        with self._lock:
+            ids = set()
+            for nearby_bucket in (bucket - 1, bucket, bucket + 1):
+                if cell is None:
+                    ids.update(self._by_bucket.get(nearby_bucket, ()))
+                    continue
+                ids.update(self._unlocated.get(nearby_bucket, ()))
+                for nearby_cell in cells:
+                    ids.update(self._by_cell.get((nearby_bucket, nearby_cell), ()))
+            return [self._entries[incident_id] for incident_id in sorted(ids)]
+
+
+duplicate_index = DuplicateIndex()
+
+
+def _merge_into(master: Incident, duplicate: Incident, confidence: float, reason: str):
+    """Flag `duplicate` and fold its source and description into `master`"""
+    if master.operational_class == "MERGED_MASTER" and master.display_source:
+        sources = set(master.display_source.split(" + "))
+    else:
+        sources = {master.source}
+    sources.add(duplicate.source)
+    master.display_source = " + ".join(sorted(s for s in sources if s)[:MAX_MERGED_SOURCES])
+    if duplicate.description and len(duplicate.description) > len(master.description or ""):
+        master.description = duplicate.description
+    master.operational_class = "MERGED_MASTER"
+
+    master_label = f"incident #{master.id}" if master.id else f"'{master.title}'"
+    duplicate.operational_class = "DUPLICATE"
+    duplicate.confidence_score = 0.0
+    duplicate.classification_reasoning = f"Duplicate of {master_label} (confidence {confidence:.2f}): {reason}"
+
+
+def flag_duplicates(db: Session, incidents: List[Incident]) -> List[Dict]:
+    """
+    Check new, uncommitted incidents for duplicates and flag them in place.
+
+    Each incident is compared with indexed active incidents and with the
+    earlier incidents of the same batch; the best match becomes its master.
+    Call before committing. Incidents that already have an operational_class
+    are left alone.
+
+    Returns: [{"title", "master_id", "confidence", "reason"}] for flagged incidents
+    """
+    flagged = []
+    batch = []  # (entry, incident) of unflagged incidents checked in this call
+
+    for incident in incidents:
+        if incident.operational_class is not None:
+            continue
+        entry = _entry(incident)
+
+        best = None
+        for candidate in duplicate_index.candidates(db, entry):
+            if candidate["id"] == incident.id:
+                continue
+            is_dup, confidence, reason = is_duplicate_incident(candidate, entry)
+            if is_dup and (best is None or confidence > best[0]):
+                best = (confidence, reason, candidate["id"], None)
+        for batch_entry, batch_incident in batch:
+            is_dup, confidence, reason = is_duplicate_incident(batch_entry, entry)
+            if is_dup and (best is None or confidence > best[0]):
+                best = (confidence, reason, None, batch_incident)
+
+        if best is None:
+            batch.append((entry, incident))
+            continue
+
+        confidence, reason, master_id, master = best
+        if master is None:
+            master = db.get(Incident, master_id)
+            if master is None:
+                batch.append((entry, incident))
+                continue
+        _merge_into(master, incident, confidence, reason)
+        flagged.append({
+            "title": incident.title,
+            "master_id": master.id,
+            "confidence": round(confidence, 2),
+            "reason": reason
+        })
+
+    return flagged
+
+
+def _capture_index_change(obj, deleted: bool):
+    """New state of an incident written by a flush"""
+    if isinstance(obj, Incident) and obj.id is not None:
+        return (obj.id, None if deleted else _entry(obj))
+    return None
+
+
+track_writes("duplicate_index_changes", _capture_index_change, duplicate_index.apply_changes)
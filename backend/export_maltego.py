@@ -21,6 +21,7 @@ from xml.dom import minidom
 
 sys.path.insert(0, str(os.path.dirname(os.path.dirname(__file__))))
 
+from backend.channel_mentions import channel_username_map, iter_message_mentions
 from backend.database import SessionLocal
 from backend.models import (
     TelegramChannel, TelegramMessage, Incident,
@@ -380,24 +381,13 @@ class MaltegoExporter:
     def _find_co_mentions(self, channels: List[TelegramChannel]) -> Dict[Tuple[int, int], int]:
         """
         Find channels that are mentioned together in messages
+
+        Uses the shared per-message @mention index (one streaming pass)
         """
         co_mentions = defaultdict(int)
 
-        # Get all messages with text
-        messages = self.db.query(TelegramMessage).filter(
-            TelegramMessage.text_content.isnot(None)
-        ).all()
-
-        channel_usernames = {ch.username.lower(): ch.id for ch in channels if ch.username}
-
-        for msg in messages:
-            text_lower = msg.text_content.lower()
-
-            # Find mentioned channels in this message
-            mentioned = []
-            for username, ch_id in channel_usernames.items():
-                if f"@{username}" in text_lower or username in text_lower:
-                    mentioned.append(ch_id)
+        for mention in iter_message_mentions(self.db, channel_username_map(channels)):
+            mentioned = mention.mentioned_channel_ids
 
             # Create co-mention pairs
             for i, ch1 in enumerate(mentioned):
@@ -22,7 +22,8 @@ from collections import defaultdict
 sys.path.insert(0, str(os.path.dirname(os.path.dirname(__file__))))
 
 from backend.database import SessionLocal
-from backend.models import TelegramChannel, TelegramMessage, IntelligenceLink
+from backend.link_analysis_engine import upsert_intelligence_links
+from backend.models import TelegramChannel, TelegramMessage
 
 class PhoneNumberExtractor:
     """
@@ -361,30 +362,28 @@ class PhoneNumberExtractor:
         print("🔗 CREATING INTELLIGENCE LINKS")
         print("=" * 80 + "\n")
 
-        links_created = 0
+        links = []
 
         for phone, occurrences in found_numbers.items():
             for occ in occurrences:
-                # Create link: message → phone number
-                link = IntelligenceLink(
-                    entity_a_type='message',
-                    entity_a_id=occ['message_id'],
-                    entity_a_identifier=f"Message {occ['message_id']}",
-                    entity_b_type='phone',
-                    entity_b_id=0,  # Phone numbers don't have DB IDs yet
-                    entity_b_identifier=phone,
-                    relationship_type='contains_phone',
-                    link_strength=1.0,
-                    confidence_score=0.8,  # High confidence - direct extraction
-                    evidence=json.dumps({
+                # Create link: message → phone number (re-runs refresh existing links)
+                links.append({
+                    'entity_a_type': 'message',
+                    'entity_a_id': occ['message_id'],
+                    'entity_a_identifier': f"Message {occ['message_id']}",
+                    'entity_b_type': 'phone',
+                    'entity_b_id': 0,  # Phone numbers don't have DB IDs yet
+                    'entity_b_identifier': phone,
+                    'relationship_type': 'contains_phone',
+                    'link_strength': 1.0,
+                    'confidence_score': 0.8,  # High confidence - direct extraction
+                    'evidence': json.dumps({
                         'context': occ['context'],
                         'country': self._detect_country(phone)
                     })
-                )
-
-                self.db.add(link)
-                links_created += 1
+                })
 
+        links_created = upsert_intelligence_links(self.db, links)
         self.db.commit()
 
         print(f"✓ Created {links_created} intelligence links\n")
@@ -17,6 +17,7 @@ Features:
 - Verification status tracking
 - Debunked claims detection
 - Source reliability scoring
+- API lookups cached in the shared response cache (backend/response_cache.py)
 
 Usage:
     from backend.fact_checker import FactChecker
@@ -32,7 +33,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-import json
+
+from backend.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -156,16 +158,13 @@ class FactChecker:
         },
     }
 
-    def __init__(self, cache_dir: str = ".cache/fact_checks", cache_ttl_hours: int = 168):
-        self.cache_dir = cache_dir
+    # Claims no fact-checker knows are re-queried sooner than found ones
+    NO_RESULT_CACHE_HOURS = 6
+
+    def __init__(self, cache_ttl_hours: int = 168, cache_path: Optional[str] = None):
         self.cache_ttl = timedelta(hours=cache_ttl_hours)
+        self.cache = ResponseCache("fact_checks", ttl_seconds=self.cache_ttl.total_seconds(), path=cache_path)
         self.session = requests.Session()
-        self._init_cache()
-
-    def _init_cache(self):
-        """Initialize cache directory"""
-        import os
-        os.makedirs(self.cache_dir, exist_ok=True)
 
     def verify_claim(self, claim: str, use_cache: bool = True) -> Optional[VerificationResult]:
         """
@@ -195,6 +194,24 @@ class FactChecker:
                     confidence=0.85
                 )
 
+        # Cached API lookups (claims without a fact-check are cached too)
+        cache_key = claim_lower.strip()
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Using cached fact-check for '{claim}'")
+                return self._dict_to_result(cached['result'], claim) if cached['result'] else None
+
+        result = self._check_apis(claim)
+        if result:
+            self.cache.set(cache_key, {"result": result.to_dict()})
+        else:
+            # API errors also end up here, so don't hold on to misses for long
+            self.cache.set(cache_key, {"result": None}, ttl_seconds=self.NO_RESULT_CACHE_HOURS * 3600)
+        return result
+
+    def _check_apis(self, claim: str) -> Optional[VerificationResult]:
+        """Query the fact-checking APIs in order of reliability"""
         # Try Snopes API
         try:
             result = self._check_snopes(claim)
@@ -216,6 +233,18 @@ class FactChecker:
         logger.debug(f"No fact-check found for '{claim}'")
         return None
 
+    def _dict_to_result(self, data: dict, claim: str) -> VerificationResult:
+        """Convert a cached dict back to a VerificationResult"""
+        return VerificationResult(
+            claim=claim,
+            status=VerificationStatus(data['status']),
+            source=data['source'],
+            url=data.get('url'),
+            explanation=data.get('explanation'),
+            date_checked=datetime.fromisoformat(data['date_checked']) if data.get('date_checked') else None,
+            confidence=data['confidence']
+        )
+
     def _check_snopes(self, claim: str) -> Optional[VerificationResult]:
         """Check claim against Snopes fact-checking database"""
         try:
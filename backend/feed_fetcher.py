@@ -0,0 +1,200 @@
+"""
+News Feed Fetcher
+
+Fetches RSS/Atom feeds concurrently and hands back only the entries that were
+not seen before:
+
+- A bounded thread pool fetches the feeds over one pooled HTTP session, with
+  at most a few concurrent requests per host
+- Requests are conditional (If-None-Match / If-Modified-Since): an unchanged
+  feed answers 304 without a body and is never parsed
+- Entries are cut at the newest entry processed by the previous run, so
+  callers only run keyword matching on new entries
+
+fetch_feed() / fetch_feeds() are stateless (validators passed in);
+fetch_new_entries() reads validators and read position from the feed_state
+table, and record_feed_state() saves the new ones once the caller has stored
+what it fetched.
+"""
+
+import hashlib
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+from sqlalchemy.orm import Session
+
+from backend.models import FeedState
+
+FETCH_WORKERS = 8
+PER_HOST_LIMIT = 2
+TIMEOUT_SECONDS = 15
+
+USER_AGENT = 'Mozilla/5.0 (compatible; DroneCUAS-OSINT/1.0; +https://github.com/MarcellusVR007/drone-cuas-osint-dashboard)'
+
+# (etag, last_modified, last_entry_hash) from the previous fetch
+Validators = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+@dataclass
+class FeedFetch:
+    """Result of one conditional feed fetch"""
+    url: str
+    status: int  # HTTP status, -1 if the request failed
+    entries: List = field(default_factory=list)  # New entries, newest first
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    newest_entry_hash: Optional[str] = None
+    title: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+def entry_hash(entry) -> str:
+    """Stable identity of a feed entry (guid, else link + title)"""
+    key = entry.get('id') or f"{entry.get('link', '')}{entry.get('title', '')}"
+    return hashlib.md5(key.encode('utf-8')).hexdigest()
+
+
+def _entry_time(entry):
+    return entry.get('published_parsed') or entry.get('updated_parsed') or ()
+
+
+def _session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+def fetch_feed(url: str, validators: Validators = (None, None, None),
+               session: Optional[requests.Session] = None,
+               timeout: int = TIMEOUT_SECONDS) -> FeedFetch:
+    """
+    Conditionally fetch one feed
+
+    Returns: FeedFetch with the entries newer than the last seen one
+             (no entries on 304 or error; validators carried over)
+    """
+    etag, last_modified, last_entry_hash = validators
+    headers = {'User-Agent': USER_AGENT}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    unchanged = FeedFetch(url, -1, etag=etag, last_modified=last_modified, newest_entry_hash=last_entry_hash)
+    try:
+        response = (session or requests).get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        unchanged.error = str(e)[:255]
+        return unchanged
+
+    unchanged.status = response.status_code
+    if response.status_code == 304:
+        return unchanged
+    if response.status_code >= 400:
+        unchanged.error = f"HTTP {response.status_code}"
+        return unchanged
+
+    feed = feedparser.parse(
+        response.content,
+        response_headers={key.lower(): value for key, value in response.headers.items()}
+    )
+
+    # Newest first (stable, so undated feeds keep their own order)
+    ordered = sorted(feed.entries, key=_entry_time, reverse=True)
+    new_entries = []
+    for entry in ordered:
+        if entry_hash(entry) == last_entry_hash:
+            break
+        new_entries.append(entry)
+
+    return FeedFetch(
+        url,
+        response.status_code,
+        new_entries,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+        newest_entry_hash=entry_hash(ordered[0]) if ordered else last_entry_hash,
+        title=feed.feed.get('title')
+    )
+
+
+def fetch_feeds(urls: Iterable[str], validators: Optional[Dict[str, Validators]] = None,
+                workers: int = FETCH_WORKERS, per_host_limit: int = PER_HOST_LIMIT) -> Dict[str, FeedFetch]:
+    """
+    Fetch feeds concurrently (bounded pool, at most `per_host_limit` per host)
+
+    Returns: url → FeedFetch
+    """
+    urls = list(dict.fromkeys(urls))
+    validators = validators or {}
+    host_limits = defaultdict(lambda: threading.BoundedSemaphore(per_host_limit))
+    for url in urls:
+        host_limits[urlparse(url).netloc.lower()]  # Create up front (defaultdict is not thread-safe)
+
+    session = _session(workers)
+
+    def fetch(url: str) -> FeedFetch:
+        with host_limits[urlparse(url).netloc.lower()]:
+            return fetch_feed(url, validators.get(url, (None, None, None)), session)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as pool:
+            return dict(zip(urls, pool.map(fetch, urls)))
+    finally:
+        session.close()
+
+
+def fetch_new_entries(db: Session, urls: Iterable[str], workers: int = FETCH_WORKERS) -> Dict[str, FeedFetch]:
+    """
+    Fetch feeds and return only entries not processed by an earlier run
+
+    Nothing is written: pass the results to record_feed_state() after the
+    entries are stored, otherwise the next run returns them again.
+    """
+    urls = list(dict.fromkeys(urls))
+    return fetch_feeds(
+        urls,
+        {
+            state.feed_url: (state.etag, state.last_modified, state.last_entry_hash)
+            for state in db.query(FeedState).filter(FeedState.feed_url.in_(urls))
+        },
+        workers
+    )
+
+
+def record_feed_state(db: Session, results: Dict[str, FeedFetch]):
+    """Save validators and read position of fetched feeds (marks their entries as seen)"""
+    states = {
+        state.feed_url: state
+        for state in db.query(FeedState).filter(FeedState.feed_url.in_(list(results)))
+    }
+    now = datetime.utcnow()
+    for url, result in results.items():
+        state = states.get(url)
+        if not state:
+            state = FeedState(feed_url=url)
+            db.add(state)
+        if not result.error:
+            state.etag = result.etag
+            state.last_modified = result.last_modified
+            state.last_entry_hash = result.newest_entry_hash
+        state.last_status = result.status
+        state.last_error = result.error
+        state.last_new_entries = len(result.entries)
+        state.last_fetched_at = now
+    db.commit()
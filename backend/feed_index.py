@@ -0,0 +1,247 @@
+"""
+Feed Article Index
+
+Article searches used to download and parse every configured RSS feed of the
+country on every call. Feeds are now fetched on a schedule into an in-memory
+index that searches read from:
+
+- All feeds are refreshed together every few minutes on the event loop (in a
+  thread), with conditional GETs so unchanged feeds cost one 304 and only new
+  entries are parsed into articles (see backend/feed_fetcher.py)
+- Articles are indexed per (country, language) in an inverted token index, so
+  a search looks up its terms instead of scanning entries
+- Articles older than the retention window are dropped on refresh
+
+On the server, searches never wait for a refresh: they read the current
+index (empty until the first build completes). Scripts without an event loop
+refresh synchronously when the index is stale.
+"""
+
+import asyncio
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.feed_fetcher import fetch_feeds
+
+FEED_REFRESH_SECONDS = 900
+ARTICLE_RETENTION = timedelta(days=14)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall((text or "").casefold())
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class FeedArticleIndex:
+    """In-memory inverted index of recent feed articles, per country and language"""
+
+    def __init__(self, scraper, refresh_seconds: int = FEED_REFRESH_SECONDS,
+                 retention: timedelta = ARTICLE_RETENTION):
+        """
+        Args:
+            scraper: ArticleScraper providing RSS_FEEDS and entry parsing helpers
+        """
+        self.scraper = scraper
+        self.refresh_seconds = refresh_seconds
+        self.retention = retention
+        self.refreshed_at: Optional[datetime] = None
+        self.last_refresh_seconds: Optional[float] = None
+
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._loop = None
+        self._validators: Dict[str, Tuple] = {}  # feed url -> conditional GET validators
+        self._feed_status: Dict[str, Dict] = {}
+        self._reset()
+
+    def _reset(self):
+        self._articles = {}  # article hash -> Article
+        self._published: Dict[str, datetime] = {}  # article hash -> naive UTC publish date
+        self._keys: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)  # hash -> (country, language)
+        self._tokens: Dict[str, Set[str]] = {}
+        self._postings = defaultdict(lambda: defaultdict(set))  # (country, language) -> token -> hashes
+
+    # ------------------------------------------------------------------
+    # Refreshing
+    # ------------------------------------------------------------------
+
+    def refresh(self, max_age_seconds: Optional[float] = None):
+        """
+        Fetch all feeds (conditionally) and index their new entries
+
+        Args:
+            max_age_seconds: Skip if the index is younger than this once the
+                             refresh lock is held (a concurrent refresh just ran)
+        """
+        from backend.trusted_sources import get_trusted_sources_for_country
+
+        with self._refresh_lock:
+            if max_age_seconds is not None and not self._is_stale(max_age_seconds):
+                return
+            started = datetime.utcnow()
+            feeds = [
+                (country, source_name, feed_url)
+                for country, country_feeds in self.scraper.RSS_FEEDS.items()
+                for source_name, feed_url in country_feeds
+            ]
+            with self._lock:
+                validators = dict(self._validators)
+            results = fetch_feeds([feed_url for _, _, feed_url in feeds], validators)
+
+            credibility = {
+                country: {s['name']: s['credibility'] for s in get_trusted_sources_for_country(country)}
+                for country in self.scraper.RSS_FEEDS
+            }
+
+            with self._lock:
+                for country, source_name, feed_url in feeds:
+                    result = results[feed_url]
+                    self._feed_status[feed_url] = {
+                        "source_name": source_name,
+                        "country": country,
+                        "status": result.status,
+                        "new_entries": len(result.entries),
+                        "error": result.error
+                    }
+                    if result.error:
+                        continue
+                    self._validators[feed_url] = (result.etag, result.last_modified, result.newest_entry_hash)
+                    for entry in result.entries:
+                        self._add(country, source_name, credibility[country].get(source_name, 0.75), entry)
+
+                self._prune(datetime.utcnow() - self.retention)
+                self.refreshed_at = datetime.utcnow()
+                self.last_refresh_seconds = (self.refreshed_at - started).total_seconds()
+
+    def _add(self, country: str, source_name: str, credibility: float, entry):
+        from backend.article_scraper import Article
+
+        title_lower = entry.get('title', '').lower()
+        article = Article(
+            title=entry.get('title', 'No title'),
+            url=entry.get('link', ''),
+            source_name=source_name,
+            source_credibility=credibility,
+            publish_date=self.scraper._parse_date(entry.get('published')),
+            summary=entry.get('summary', '')[:200],
+            language=self.scraper._detect_language(title_lower)
+        )
+        key = (country, article.language)
+        if key in self._keys.get(article.hash, ()):
+            return
+
+        if article.hash not in self._articles:
+            self._articles[article.hash] = article
+            self._published[article.hash] = _naive_utc(article.publish_date)
+            # Match on the full title and summary, not the truncated one
+            self._tokens[article.hash] = set(tokenize(f"{entry.get('title', '')} {entry.get('summary', '')}"))
+
+        self._keys[article.hash].add(key)
+        postings = self._postings[key]
+        for token in self._tokens[article.hash]:
+            postings[token].add(article.hash)
+
+    def _prune(self, cutoff: datetime):
+        expired = [article_hash for article_hash, published in self._published.items() if published < cutoff]
+        for article_hash in expired:
+            for key in self._keys.pop(article_hash, ()):
+                postings = self._postings[key]
+                for token in self._tokens[article_hash]:
+                    postings[token].discard(article_hash)
+                    if not postings[token]:
+                        del postings[token]
+            del self._articles[article_hash]
+            del self._published[article_hash]
+            del self._tokens[article_hash]
+
+    def start(self):
+        """Schedule background refreshes on the running event loop (server startup)"""
+        self._ensure_refresh_task(refresh_now=True)
+
+    def _ensure_refresh_task(self, refresh_now: bool = False):
+        """Schedule periodic refreshes on the running event loop (once per loop)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self._loop is not loop:
+            self._loop = loop
+            loop.create_task(self._refresh_periodically(refresh_now))
+        return True
+
+    async def _refresh_periodically(self, refresh_now: bool):
+        if not refresh_now:
+            await asyncio.sleep(self.refresh_seconds)
+        # The startup build may already have run on demand (first request)
+        max_age_seconds = self.refresh_seconds if refresh_now else None
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh, max_age_seconds)
+                max_age_seconds = None
+                print(f"✓ Feed index refreshed ({len(self._articles)} articles, {self.last_refresh_seconds:.1f}s)")
+            except Exception as e:
+                print(f"⚠ Feed index refresh failed: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def _is_stale(self, max_age_seconds: float) -> bool:
+        return self.refreshed_at is None or datetime.utcnow() - self.refreshed_at > timedelta(seconds=max_age_seconds)
+
+    def _ensure_fresh(self):
+        if self._ensure_refresh_task(refresh_now=self.refreshed_at is None):
+            return  # The background task keeps the index fresh; never block the event loop
+        if self._is_stale(self.refresh_seconds):
+            self.refresh(max_age_seconds=self.refresh_seconds)  # No event loop (script): refresh on demand
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def search(self, terms: List[str], country: str, limit: int = 10,
+               language: Optional[str] = None) -> List:
+        """
+        Indexed articles of `country` matching any of `terms`
+
+        Multi-word terms match when all their words occur. Results are ranked
+        by the number of matching terms, then newest first.
+        """
+        self._ensure_fresh()
+        phrases = {tuple(tokenize(term)) for term in terms}
+        phrases.discard(())
+
+        with self._lock:
+            scores = defaultdict(int)
+            for (indexed_country, indexed_language), postings in self._postings.items():
+                if indexed_country != country or (language and indexed_language != language):
+                    continue
+                for phrase in phrases:
+                    matches = set.intersection(*(postings.get(token, set()) for token in phrase))
+                    for article_hash in matches:
+                        scores[article_hash] += 1
+
+            ranked = sorted(scores, key=lambda h: (-scores[h], -self._published[h].timestamp()))
+            return [self._articles[article_hash] for article_hash in ranked[:limit]]
+
+    def freshness(self) -> Dict:
+        """When the index was last refreshed and how its feeds responded"""
+        with self._lock:
+            statuses = list(self._feed_status.values())
+            return {
+                "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+                "age_seconds": int((datetime.utcnow() - self.refreshed_at).total_seconds()) if self.refreshed_at else None,
+                "refresh_interval_seconds": self.refresh_seconds,
+                "last_refresh_seconds": round(self.last_refresh_seconds, 2) if self.last_refresh_seconds is not None else None,
+                "articles_indexed": len(self._articles),
+                "feeds": len(statuses),
+                "feeds_not_modified": sum(1 for s in statuses if s["status"] == 304),
+                "feeds_failed": sum(1 for s in statuses if s["error"])
+            }
@@ -6,8 +6,9 @@ Detects temporal correlations between drone incidents and OSINT signals
 Features:
 - Telegram activity spike detection (±24h around incidents)
 - Forum discussion correlation
-- Statistical anomaly detection (z-score based)
+- Statistical anomaly detection (z-score based, from per-channel daily message counts)
 - Automated alert generation
+- Incremental runs (watermarks per analysis type; --full to rebuild)
 """
 
 import sys
@@ -18,13 +19,14 @@ from typing import List, Dict, Tuple, Optional
 import json
 from collections import defaultdict
 import statistics
+from bisect import bisect_left
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.database import SessionLocal
 from backend.models import (
     Incident, TelegramMessage, TelegramChannel, AviationForumPost,
-    IncidentCorrelation
+    IncidentCorrelation, TelegramMessageDailyCount, CorrelationWatermark
 )
 from sqlalchemy import func, and_, or_
 from sqlalchemy.orm import Session
@@ -38,29 +40,52 @@ class IncidentCorrelationEngine:
         self.time_window_hours = time_window_hours
         self.z_score_threshold = 2.5  # Statistical significance threshold
 
-    def analyze_all_incidents(self, limit: Optional[int] = None) -> Dict:
+    def analyze_all_incidents(self, limit: Optional[int] = None, full: bool = False,
+                              progress_callback=None) -> Dict:
         """
-        Analyze all incidents for correlations with OSINT signals
+        Analyze incidents for correlations with OSINT signals
+
+        Incremental mode (default) only analyzes incidents added since the last
+        run, plus older incidents whose ±time window overlaps newly ingested
+        Telegram messages or forum posts. Full mode re-analyzes everything.
 
         Args:
             limit: Maximum number of incidents to analyze (None = all)
+            full: Ignore watermarks and re-analyze every incident
+            progress_callback: Optional callable(fraction, message) for job progress
 
         Returns:
             Dictionary with analysis results
         """
         print("=" * 70)
-        print("INCIDENT CORRELATION ANALYSIS")
+        print("INCIDENT CORRELATION ANALYSIS" + (" (FULL)" if full else ""))
         print("=" * 70)
 
+        # Capture ingest high-water marks before analyzing, so messages that
+        # arrive mid-run are picked up by the next run
+        sources = {
+            "telegram_spike": self._message_high_water(TelegramMessage, TelegramMessage.timestamp),
+            "forum_discussion": self._message_high_water(AviationForumPost, AviationForumPost.post_timestamp),
+        }
+        last_incident_id = self.db.query(func.max(Incident.id)).scalar() or 0
+        watermarks = {analysis_type: self._get_watermark(analysis_type) for analysis_type in sources}
+        mode = "full" if full or any(w is None for w in watermarks.values()) else "incremental"
+
         # Get incidents ordered by most recent
         query = self.db.query(Incident).order_by(Incident.sighting_date.desc())
+        if mode == "incremental":
+            incidents, targets = self._incremental_targets(query, watermarks)
+        else:
+            incidents = query.all()
+            targets = {analysis_type: None for analysis_type in sources}  # None = every incident
+
         if limit:
-            query = query.limit(limit)
+            incidents = incidents[:limit]
 
-        incidents = query.all()
-        print(f"\n📊 Analyzing {len(incidents)} incidents...")
+        print(f"\n📊 Analyzing {len(incidents)} incidents ({mode} mode)...")
 
         results = {
+            "mode": mode,
             "total_incidents": len(incidents),
             "incidents_with_correlations": 0,
             "telegram_correlations": 0,
@@ -69,15 +94,22 @@ class IncidentCorrelationEngine:
             "correlations": []
         }
 
-        for incident in incidents:
+        found = {}
+        for index, incident in enumerate(incidents):
+            if progress_callback:
+                progress_callback(index / len(incidents), f"Incident {index + 1}/{len(incidents)}")
             print(f"\n🔍 Incident #{incident.id}: {incident.title}")
             print(f"   Date: {incident.sighting_date}, Location: {incident.latitude}, {incident.longitude}")
 
             # Analyze Telegram activity
-            telegram_corr = self.analyze_telegram_correlation(incident)
+            telegram_corr = None
+            if targets["telegram_spike"] is None or incident.id in targets["telegram_spike"]:
+                telegram_corr = self.analyze_telegram_correlation(incident)
 
             # Analyze forum activity
-            forum_corr = self.analyze_forum_correlation(incident)
+            forum_corr = None
+            if targets["forum_discussion"] is None or incident.id in targets["forum_discussion"]:
+                forum_corr = self.analyze_forum_correlation(incident)
 
             # Combine results
             incident_correlations = []
@@ -91,11 +123,9 @@ class IncidentCorrelationEngine:
 
             if incident_correlations:
                 results["incidents_with_correlations"] += 1
+                found[incident.id] = incident_correlations
 
-                # Save correlations to database
                 for corr_data in incident_correlations:
-                    self.save_correlation(incident.id, corr_data)
-
                     if corr_data["correlation_strength"] >= 0.7:
                         results["high_confidence_correlations"] += 1
 
@@ -105,6 +135,15 @@ class IncidentCorrelationEngine:
                     "correlations": incident_correlations
                 })
 
+        # Save correlations to database
+        saved = self.save_correlations(found)
+
+        # A limited run may have skipped candidates, and a failed save lost
+        # them, so only advance the watermarks when every candidate was stored
+        if saved and not limit:
+            for analysis_type, (last_message_id, last_message_timestamp) in sources.items():
+                self._set_watermark(analysis_type, last_incident_id, last_message_id, last_message_timestamp)
+
         print("\n" + "=" * 70)
         print("ANALYSIS SUMMARY")
         print("=" * 70)
@@ -116,6 +155,93 @@ class IncidentCorrelationEngine:
 
         return results
 
+    def _incident_datetime(self, incident: Incident) -> datetime:
+        """Incident sighting date combined with its HH:MM time when known"""
+        incident_dt = datetime.combine(incident.sighting_date, datetime.min.time())
+        if incident.sighting_time:
+            try:
+                hours, minutes = map(int, incident.sighting_time.split(':'))
+                incident_dt = incident_dt.replace(hour=hours, minute=minutes)
+            except:
+                pass
+        return incident_dt
+
+    # ------------------------------------------------------------------
+    # Watermarks (incremental mode)
+    # ------------------------------------------------------------------
+
+    def _message_high_water(self, model, timestamp_column) -> Tuple[int, Optional[datetime]]:
+        """(max id, max timestamp) of an OSINT message table"""
+        last_id, last_timestamp = self.db.query(func.max(model.id), func.max(timestamp_column)).one()
+        return last_id or 0, last_timestamp
+
+    def _get_watermark(self, analysis_type: str) -> Optional[CorrelationWatermark]:
+        return self.db.query(CorrelationWatermark).filter(
+            CorrelationWatermark.analysis_type == analysis_type,
+            CorrelationWatermark.time_window_hours == self.time_window_hours
+        ).first()
+
+    def _set_watermark(self, analysis_type: str, last_incident_id: int, last_message_id: int,
+                       last_message_timestamp: Optional[datetime]):
+        watermark = self._get_watermark(analysis_type)
+        if not watermark:
+            watermark = CorrelationWatermark(analysis_type=analysis_type, time_window_hours=self.time_window_hours)
+            self.db.add(watermark)
+        watermark.last_incident_id = last_incident_id
+        watermark.last_message_id = last_message_id
+        watermark.last_message_timestamp = last_message_timestamp
+        watermark.last_run_at = datetime.utcnow()
+        self.db.commit()
+
+    def _incremental_targets(self, query, watermarks: Dict[str, CorrelationWatermark]) -> Tuple[List[Incident], Dict[str, set]]:
+        """
+        Incidents to analyze per analysis type: those added since the
+        watermark, plus older ones whose ±window covers a newly ingested message.
+        """
+        new_timestamps = {
+            "telegram_spike": [
+                ts for (ts,) in self.db.query(TelegramMessage.timestamp).filter(
+                    TelegramMessage.id > watermarks["telegram_spike"].last_message_id
+                )
+            ],
+            "forum_discussion": [
+                ts for (ts,) in self.db.query(AviationForumPost.post_timestamp).filter(
+                    AviationForumPost.id > watermarks["forum_discussion"].last_message_id
+                )
+            ],
+        }
+
+        window = timedelta(hours=self.time_window_hours)
+        oldest_incident_id = min(w.last_incident_id or 0 for w in watermarks.values())
+        candidate_filters = [Incident.id > oldest_incident_id]
+        for timestamps in new_timestamps.values():
+            timestamps.sort()
+            if timestamps:
+                candidate_filters.append(and_(
+                    Incident.sighting_date >= (timestamps[0] - window).date(),
+                    Incident.sighting_date <= (timestamps[-1] + window).date()
+                ))
+
+        incidents = query.filter(or_(*candidate_filters)).all()
+
+        targets = {}
+        for analysis_type, timestamps in new_timestamps.items():
+            last_incident_id = watermarks[analysis_type].last_incident_id or 0
+            selected = set()
+            for incident in incidents:
+                if incident.id > last_incident_id:
+                    selected.add(incident.id)
+                    continue
+                # Any new message inside [incident - window, incident + window]?
+                incident_dt = self._incident_datetime(incident)
+                index = bisect_left(timestamps, incident_dt - window)
+                if index < len(timestamps) and timestamps[index] <= incident_dt + window:
+                    selected.add(incident.id)
+            targets[analysis_type] = selected
+
+        selected_ids = set().union(*targets.values())
+        return [incident for incident in incidents if incident.id in selected_ids], targets
+
     def analyze_telegram_correlation(self, incident: Incident) -> List[Dict]:
         """
         Detect Telegram activity spikes around incident timestamp
@@ -124,13 +250,7 @@ class IncidentCorrelationEngine:
             List of correlation dictionaries
         """
         # Get incident timestamp
-        incident_dt = datetime.combine(incident.sighting_date, datetime.min.time())
-        if incident.sighting_time:
-            try:
-                hours, minutes = map(int, incident.sighting_time.split(':'))
-                incident_dt = incident_dt.replace(hour=hours, minute=minutes)
-            except:
-                pass
+        incident_dt = self._incident_datetime(incident)
 
         # Define time windows
         spike_start = incident_dt - timedelta(hours=self.time_window_hours)
@@ -139,104 +259,118 @@ class IncidentCorrelationEngine:
         # Get baseline (30 days prior, excluding spike window)
         baseline_end = incident_dt - timedelta(hours=self.time_window_hours)
         baseline_start = baseline_end - timedelta(days=30)
+        baseline_days = (baseline_end - baseline_start).days
+        spike_window_days = (spike_end - spike_start).total_seconds() / (24 * 3600)
+
+        # Spike counts for every channel in one grouped query
+        spike_counts = dict(self.db.query(
+            TelegramMessage.channel_id,
+            func.count(TelegramMessage.id)
+        ).filter(
+            TelegramMessage.timestamp >= spike_start,
+            TelegramMessage.timestamp <= spike_end
+        ).group_by(TelegramMessage.channel_id).all())
+
+        if not spike_counts:
+            return []
+
+        # Baseline daily histograms (pre-aggregated on ingest) for active channels
+        daily_counts = defaultdict(list)
+        for channel_id, count in self.db.query(
+            TelegramMessageDailyCount.channel_id,
+            TelegramMessageDailyCount.count
+        ).filter(
+            TelegramMessageDailyCount.channel_id.in_(list(spike_counts)),
+            TelegramMessageDailyCount.day >= baseline_start.date(),
+            TelegramMessageDailyCount.day < baseline_end.date(),
+            TelegramMessageDailyCount.count > 0
+        ):
+            daily_counts[channel_id].append(count)
+
+        # Column-wise z-scores for all channels at once
+        channel_ids = sorted(
+            channel_id for channel_id, counts in daily_counts.items()
+            if sum(counts) >= 10 and len(counts) >= 5  # Need sufficient baseline data and days for std dev
+        )
+        spikes = [spike_counts[channel_id] for channel_id in channel_ids]
+        daily_avgs = [sum(daily_counts[channel_id]) / baseline_days for channel_id in channel_ids]
+        expected_counts = [daily_avg * spike_window_days for daily_avg in daily_avgs]
+        std_devs = [statistics.stdev(daily_counts[channel_id]) for channel_id in channel_ids]
+        z_scores = [
+            (spike - expected) / (std_dev + 0.1)  # Add epsilon to avoid div by zero
+            for spike, expected, std_dev in zip(spikes, expected_counts, std_devs)
+        ]
 
-        correlations = []
-
-        # Get all channels
-        channels = self.db.query(TelegramChannel).all()
-
-        for channel in channels:
-            # Count messages in spike window
-            spike_count = self.db.query(TelegramMessage).filter(
-                and_(
-                    TelegramMessage.channel_id == channel.id,
-                    TelegramMessage.timestamp >= spike_start,
-                    TelegramMessage.timestamp <= spike_end
-                )
-            ).count()
-
-            if spike_count == 0:
-                continue
-
-            # Count messages in baseline period
-            baseline_messages = self.db.query(TelegramMessage).filter(
-                and_(
-                    TelegramMessage.channel_id == channel.id,
-                    TelegramMessage.timestamp >= baseline_start,
-                    TelegramMessage.timestamp < baseline_end
-                )
-            ).all()
-
-            if len(baseline_messages) < 10:  # Need sufficient baseline data
-                continue
-
-            # Calculate daily average in baseline
-            baseline_days = (baseline_end - baseline_start).days
-            daily_avg = len(baseline_messages) / baseline_days
-
-            # Expected count in spike window
-            spike_window_days = (spike_end - spike_start).total_seconds() / (24 * 3600)
-            expected_count = daily_avg * spike_window_days
-
-            if expected_count == 0:
-                continue
+        # Only flag significant anomalies
+        flagged = [i for i, z_score in enumerate(z_scores) if z_score >= self.z_score_threshold]
+        if not flagged:
+            return []
 
-            # Calculate z-score
-            # Get daily counts for standard deviation
-            daily_counts = defaultdict(int)
-            for msg in baseline_messages:
-                day = msg.timestamp.date()
-                daily_counts[day] += 1
+        flagged_ids = [channel_ids[i] for i in flagged]
+        channels = {
+            channel.id: channel
+            for channel in self.db.query(TelegramChannel).filter(TelegramChannel.id.in_(flagged_ids))
+        }
+        spike_messages = self._sample_messages(flagged_ids, spike_start, spike_end)
+        time_delta_hours = int((incident_dt - spike_start).total_seconds() / 3600)
 
-            if len(daily_counts) < 5:  # Need enough days for std dev
+        correlations = []
+        for i in flagged:
+            channel = channels.get(channel_ids[i])
+            if not channel:
                 continue
 
-            daily_values = list(daily_counts.values())
-            std_dev = statistics.stdev(daily_values) if len(daily_values) > 1 else 1
-
-            z_score = (spike_count - expected_count) / (std_dev + 0.1)  # Add epsilon to avoid div by zero
-
-            # Only flag significant anomalies
-            if z_score >= self.z_score_threshold:
-                # Calculate correlation strength (normalize z-score to 0-1)
-                correlation_strength = min(z_score / 10.0, 1.0)  # z=10 = max strength
-
-                # Get sample messages from spike window
-                spike_messages = self.db.query(TelegramMessage).filter(
-                    and_(
-                        TelegramMessage.channel_id == channel.id,
-                        TelegramMessage.timestamp >= spike_start,
-                        TelegramMessage.timestamp <= spike_end
-                    )
-                ).limit(5).all()
-
-                keywords = self._extract_keywords(spike_messages)
-
-                time_delta_hours = int((incident_dt - spike_start).total_seconds() / 3600)
-
-                correlation = {
-                    "correlation_type": "telegram_spike",
-                    "source_id": channel.id,
-                    "source_table": "telegram_channels",
-                    "time_delta_hours": time_delta_hours,
-                    "correlation_strength": correlation_strength,
-                    "description": f"Activity spike detected in {channel.title or channel.username}: "
-                                   f"{spike_count} messages (expected: {expected_count:.1f}, z-score: {z_score:.2f})",
-                    "keywords_matched": json.dumps(keywords),
-                    "metadata": {
-                        "channel_username": channel.username,
-                        "spike_count": spike_count,
-                        "expected_count": expected_count,
-                        "z_score": z_score,
-                        "baseline_daily_avg": daily_avg
-                    }
+            spike_count, expected_count, z_score = spikes[i], expected_counts[i], z_scores[i]
+
+            # Calculate correlation strength (normalize z-score to 0-1)
+            correlation_strength = min(z_score / 10.0, 1.0)  # z=10 = max strength
+
+            keywords = self._extract_keywords(spike_messages.get(channel.id, []))
+
+            correlation = {
+                "correlation_type": "telegram_spike",
+                "source_id": channel.id,
+                "source_table": "telegram_channels",
+                "time_delta_hours": time_delta_hours,
+                "correlation_strength": correlation_strength,
+                "description": f"Activity spike detected in {channel.title or channel.username}: "
+                               f"{spike_count} messages (expected: {expected_count:.1f}, z-score: {z_score:.2f})",
+                "keywords_matched": json.dumps(keywords),
+                "metadata": {
+                    "channel_username": channel.username,
+                    "spike_count": spike_count,
+                    "expected_count": expected_count,
+                    "z_score": z_score,
+                    "baseline_daily_avg": daily_avgs[i]
                 }
+            }
 
-                correlations.append(correlation)
-                print(f"   ⚡ Telegram spike: {channel.username} (z={z_score:.2f}, strength={correlation_strength:.2f})")
+            correlations.append(correlation)
+            print(f"   ⚡ Telegram spike: {channel.username} (z={z_score:.2f}, strength={correlation_strength:.2f})")
 
         return correlations
 
+    def _sample_messages(self, channel_ids: List[int], start: datetime, end: datetime, per_channel: int = 5) -> Dict[int, List[TelegramMessage]]:
+        """Up to `per_channel` messages per channel inside [start, end], in one query"""
+        ranked = self.db.query(
+            TelegramMessage.id,
+            func.row_number().over(
+                partition_by=TelegramMessage.channel_id,
+                order_by=TelegramMessage.id
+            ).label("position")
+        ).filter(
+            TelegramMessage.channel_id.in_(channel_ids),
+            TelegramMessage.timestamp >= start,
+            TelegramMessage.timestamp <= end
+        ).subquery()
+
+        samples = defaultdict(list)
+        for message in self.db.query(TelegramMessage).join(
+            ranked, ranked.c.id == TelegramMessage.id
+        ).filter(ranked.c.position <= per_channel):
+            samples[message.channel_id].append(message)
+        return samples
+
     def analyze_forum_correlation(self, incident: Incident) -> List[Dict]:
         """
         Detect forum discussions around incident timestamp
@@ -245,13 +379,7 @@ class IncidentCorrelationEngine:
             List of correlation dictionaries
         """
         # Get incident timestamp
-        incident_dt = datetime.combine(incident.sighting_date, datetime.min.time())
-        if incident.sighting_time:
-            try:
-                hours, minutes = map(int, incident.sighting_time.split(':'))
-                incident_dt = incident_dt.replace(hour=hours, minute=minutes)
-            except:
-                pass
+        incident_dt = self._incident_datetime(incident)
 
         # Define search window
         search_start = incident_dt - timedelta(hours=self.time_window_hours)
@@ -342,41 +470,59 @@ class IncidentCorrelationEngine:
 
     def save_correlation(self, incident_id: int, correlation_data: Dict):
         """Save correlation to database"""
+        self.save_correlations({incident_id: [correlation_data]})
+
+    def save_correlations(self, correlations_by_incident: Dict[int, List[Dict]]) -> bool:
+        """Upsert correlations for many incidents (one lookup, one commit); False if the save failed"""
+        if not correlations_by_incident:
+            return True
+
         try:
-            existing = self.db.query(IncidentCorrelation).filter(
-                and_(
-                    IncidentCorrelation.incident_id == incident_id,
-                    IncidentCorrelation.correlation_type == correlation_data["correlation_type"],
-                    IncidentCorrelation.source_id == correlation_data.get("source_id"),
-                    IncidentCorrelation.source_table == correlation_data.get("source_table")
+            existing = {
+                (corr.incident_id, corr.correlation_type, corr.source_id, corr.source_table): corr
+                for corr in self.db.query(IncidentCorrelation).filter(
+                    IncidentCorrelation.incident_id.in_(list(correlations_by_incident))
                 )
-            ).first()
-
-            if existing:
-                # Update existing
-                existing.correlation_strength = correlation_data["correlation_strength"]
-                existing.description = correlation_data["description"]
-                existing.keywords_matched = correlation_data.get("keywords_matched")
-                existing.time_delta_hours = correlation_data.get("time_delta_hours")
-            else:
-                # Create new
-                new_corr = IncidentCorrelation(
-                    incident_id=incident_id,
-                    correlation_type=correlation_data["correlation_type"],
-                    source_id=correlation_data.get("source_id"),
-                    source_table=correlation_data.get("source_table"),
-                    time_delta_hours=correlation_data.get("time_delta_hours"),
-                    correlation_strength=correlation_data["correlation_strength"],
-                    description=correlation_data["description"],
-                    keywords_matched=correlation_data.get("keywords_matched"),
-                    auto_detected=True
-                )
-                self.db.add(new_corr)
+            }
+
+            for incident_id, correlations in correlations_by_incident.items():
+                for correlation_data in correlations:
+                    key = (
+                        incident_id,
+                        correlation_data["correlation_type"],
+                        correlation_data.get("source_id"),
+                        correlation_data.get("source_table")
+                    )
+                    corr = existing.get(key)
+
+                    if corr:
+                        # Update existing
+                        corr.correlation_strength = correlation_data["correlation_strength"]
+                        corr.description = correlation_data["description"]
+                        corr.keywords_matched = correlation_data.get("keywords_matched")
+                        corr.time_delta_hours = correlation_data.get("time_delta_hours")
+                    else:
+                        # Create new
+                        corr = IncidentCorrelation(
+                            incident_id=incident_id,
+                            correlation_type=correlation_data["correlation_type"],
+                            source_id=correlation_data.get("source_id"),
+                            source_table=correlation_data.get("source_table"),
+                            time_delta_hours=correlation_data.get("time_delta_hours"),
+                            correlation_strength=correlation_data["correlation_strength"],
+                            description=correlation_data["description"],
+                            keywords_matched=correlation_data.get("keywords_matched"),
+                            auto_detected=True
+                        )
+                        self.db.add(corr)
+                        existing[key] = corr
 
             self.db.commit()
+            return True
         except Exception as e:
             print(f"⚠️  Error saving correlation: {e}")
             self.db.rollback()
+            return False
 
     def generate_alert_report(self, min_correlation_strength: float = 0.7) -> str:
         """Generate human-readable alert report for high-confidence correlations"""
@@ -432,6 +578,7 @@ def main():
     parser.add_argument("--time-window", type=int, default=24, help="Time window in hours (default: 24)")
     parser.add_argument("--alert", action="store_true", help="Generate alert report")
     parser.add_argument("--min-strength", type=float, default=0.7, help="Minimum correlation strength for alerts")
+    parser.add_argument("--full", action="store_true", help="Re-analyze all incidents (ignore incremental watermarks)")
 
     args = parser.parse_args()
 
@@ -440,7 +587,7 @@ def main():
     if args.alert:
         print(engine.generate_alert_report(min_correlation_strength=args.min_strength))
     else:
-        results = engine.analyze_all_incidents(limit=args.limit)
+        results = engine.analyze_all_incidents(limit=args.limit, full=args.full)
 
         # Save results to JSON
         output_file = f"correlation_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
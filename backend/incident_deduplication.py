@@ -2,19 +2,55 @@
 """
 Incident Deduplication & Quality Control
 Identifies and merges duplicate incident reports using multi-factor analysis
+
+Duplicate search avoids comparing every pair of incidents:
+1. Blocking: incidents are bucketed by date (buckets of time_threshold_days + 1)
+   and geohash cell; only incidents in neighbouring buckets/cells are paired
+   (incidents without a location are paired with everything in their date range)
+2. Score bound: the temporal, geographic and restricted-area factors are
+   cheap, so pairs that cannot reach the duplicate threshold even with
+   identical texts are dropped
+3. LSH: pairs that only qualify with similar texts must collide in a
+   MinHash/LSH band of their shingled titles or descriptions
+Only the surviving pairs get the exact (SequenceMatcher) scoring.
 """
 
-import os
 import sqlite3
-from datetime import datetime, timedelta
+import sys
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Tuple, Optional
 from difflib import SequenceMatcher
-import anthropic
+from pathlib import Path
 import json
 
-# Initialize Claude API
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
-client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY) if ANTHROPIC_API_KEY else None
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.llm_gateway import gateway, parse_json_response
+from backend.spatial_index import geohash_cells_near, geohash_encode, geohash_precision_for, haversine_km
+
+CLASSIFICATION_MODEL = "claude-sonnet-4-5-20250929"
+
+# Duplicate scoring (see is_duplicate_incident)
+DUPLICATE_FACTOR_WEIGHTS = {
+    'temporal': 0.2,
+    'geographic': 0.3,
+    'same_location': 0.2,
+    'different_location': 0.2,
+    'title': 0.15,
+    'description': 0.15
+}
+DUPLICATE_CONFIDENCE_THRESHOLD = 0.65
+
+# Candidate generation (see find_duplicate_candidates)
+SHINGLE_SIZE = 3
+LSH_BANDS = 32
+LSH_ROWS = 2
+# Pairs needing at most this average text similarity skip the LSH gate:
+# unrelated texts routinely reach it, so LSH would drop real duplicates
+LSH_MIN_REQUIRED_SIMILARITY = 0.5
+MINHASH_BINS = LSH_BANDS * LSH_ROWS
 
 
 def calculate_text_similarity(text1: str, text2: str) -> float:
@@ -35,21 +71,9 @@ def calculate_text_similarity(text1: str, text2: str) -> float:
 def calculate_geographic_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate distance between two coordinates in kilometers
-    Using simplified Haversine formula
+    Using the shared Haversine implementation
     """
-    from math import radians, sin, cos, sqrt, atan2
-
-    R = 6371  # Earth radius in km
-
-    lat1_rad = radians(lat1)
-    lat2_rad = radians(lat2)
-    delta_lat = radians(lat2 - lat1)
-    delta_lon = radians(lon2 - lon1)
-
-    a = sin(delta_lat/2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(delta_lon/2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
-
-    return R * c
+    return haversine_km(lat1, lon1, lat2, lon2)
 
 
 def calculate_temporal_distance(date1: str, date2: str) -> int:
@@ -136,14 +160,7 @@ def is_duplicate_incident(inc1: Dict, inc2: Dict,
 
     # 6. Calculate overall confidence
     # Weight different factors
-    weights = {
-        'temporal': 0.2,
-        'geographic': 0.3,
-        'same_location': 0.2,
-        'different_location': 0.2,
-        'title': 0.15,
-        'description': 0.15
-    }
+    weights = DUPLICATE_FACTOR_WEIGHTS
 
     total_confidence = 0.0
     total_weight = 0.0
@@ -159,7 +176,7 @@ def is_duplicate_incident(inc1: Dict, inc2: Dict,
         confidence = 0.0
 
     # Decision threshold
-    is_duplicate = confidence >= 0.65
+    is_duplicate = confidence >= DUPLICATE_CONFIDENCE_THRESHOLD
 
     reason_str = "; ".join(reasons)
 
@@ -179,10 +196,11 @@ def classify_incident_with_ai(incident: Dict) -> Dict:
         }
     """
 
-    if not client:
-        # Fallback to rule-based classification
-        return _fallback_classification(incident)
+    return classify_incidents_with_ai([incident])[0]
+
 
+def _classification_request(incident: Dict) -> Dict:
+    """LLM gateway request classifying one incident"""
     prompt = f"""Analyze this drone incident report and determine if it's a REAL INCIDENT or a FALSE POSITIVE.
 
 **INCIDENT DATA:**
@@ -226,41 +244,45 @@ Respond with JSON only:
     "reason": "Brief explanation (1 sentence)"
 }}"""
 
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=500,
-            temperature=0.1,  # Low temperature for classification
-            messages=[{
-                "role": "user",
-                "content": prompt
-            }]
-        )
+    return {
+        "prompt": prompt,
+        "model": CLASSIFICATION_MODEL,
+        "max_tokens": 500,
+        "temperature": 0.1  # Low temperature for classification
+    }
+
 
-        response_text = message.content[0].text
+def classify_incidents_with_ai(incidents: List[Dict]) -> List[Dict]:
+    """
+    Classify many incidents concurrently through the LLM gateway (cached
+    results are reused). Falls back to rules per incident on errors or when
+    no LLM backend is configured.
 
-        # Extract JSON
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-        elif "```" in response_text:
-            json_start = response_text.find("```") + 3
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
+    Returns: classifications in input order (see classify_incident_with_ai)
+    """
+    if not gateway.available:
+        # Fallback to rule-based classification
+        return [_fallback_classification(incident) for incident in incidents]
 
-        result = json.loads(response_text)
+    responses = gateway.complete_many([_classification_request(incident) for incident in incidents])
 
-        return {
-            "is_real_incident": result.get("is_real_incident", True),
-            "confidence": result.get("confidence", 0.5),
-            "reason": result.get("reason", "AI classified"),
-            "category": result.get("category", "REAL_INCIDENT")
-        }
+    classifications = []
+    for incident, response in zip(incidents, responses):
+        try:
+            if isinstance(response, Exception):
+                raise response
+            result = parse_json_response(response)
+            classifications.append({
+                "is_real_incident": result.get("is_real_incident", True),
+                "confidence": result.get("confidence", 0.5),
+                "reason": result.get("reason", "AI classified"),
+                "category": result.get("category", "REAL_INCIDENT")
+            })
+        except Exception as e:
+            print(f"AI classification error: {e}")
+            classifications.append(_fallback_classification(incident))
 
-    except Exception as e:
-        print(f"AI classification error: {e}")
-        return _fallback_classification(incident)
+    return classifications
 
 
 def _fallback_classification(incident: Dict) -> Dict:
@@ -305,12 +327,200 @@ def _fallback_classification(incident: Dict) -> Dict:
         }
 
 
-def find_duplicate_groups(incidents: List[Dict]) -> List[List[int]]:
+def parse_sighting_date(value) -> Optional[datetime]:
+    """Parse like calculate_temporal_distance (None when it would give up)"""
+    try:
+        return datetime.fromisoformat(value)
+    except Exception:
+        return None
+
+
+def date_bucket(parsed: datetime, time_threshold_days: int) -> int:
+    """
+    Blocking bucket of a parsed sighting date: incidents within
+    time_threshold_days of each other are at most one bucket apart.
+    Aware datetimes are bucketed in UTC so day gaps match datetime subtraction.
+    """
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.toordinal() // (time_threshold_days + 1)
+
+
+def _shingles(text: Optional[str]) -> set:
+    """Character shingles of the normalized text (same normalization as calculate_text_similarity)"""
+    if not text:
+        return set()
+    normalized = text.lower().strip()
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(shingles: set) -> List[int]:
+    """
+    MinHash signature (MINHASH_BINS values) of a non-empty shingle set.
+
+    One-permutation hashing: each shingle is hashed once into a bin and the
+    minimum per bin is kept (instead of one hash pass per signature value).
+    Empty bins borrow the next non-empty bin's value, offset by the distance,
+    so two sets still agree on a bin with probability ~ their Jaccard similarity.
+    """
+    signature = [None] * MINHASH_BINS
+    for shingle in shingles:
+        mixed = (zlib.crc32(shingle.encode("utf-8")) * 0x9E3779B1) & 0xFFFFFFFF
+        index = (mixed * MINHASH_BINS) >> 32
+        if signature[index] is None or mixed < signature[index]:
+            signature[index] = mixed
+
+    for index in range(MINHASH_BINS):
+        if signature[index] is None:
+            for distance in range(1, MINHASH_BINS):
+                borrowed = signature[(index + distance) % MINHASH_BINS]
+                if borrowed is not None and borrowed < (1 << 32):
+                    signature[index] = borrowed + (distance << 32)
+                    break
+    return signature
+
+
+def lsh_band_keys(incident: Dict) -> set:
+    """LSH band keys of an incident's title and description signatures"""
+    keys = set()
+    for field in ('title', 'description'):
+        shingles = _shingles(incident.get(field))
+        if not shingles:
+            continue
+        signature = minhash_signature(shingles)
+        for band in range(LSH_BANDS):
+            keys.add((field, band, tuple(signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])))
+    return keys
+
+
+def _required_text_similarity(inc1: Dict, inc2: Dict, day_gap: Optional[int],
+                              time_threshold_days: int,
+                              distance_threshold_km: float) -> Optional[float]:
+    """
+    Average title/description similarity the pair needs to be a duplicate,
+    given its temporal, geographic and restricted-area factors (mirrors
+    is_duplicate_incident). None if the pair can never be a duplicate.
+    """
+    if day_gap is None or day_gap > time_threshold_days:
+        return None
+
+    weights = DUPLICATE_FACTOR_WEIGHTS
+    score = weights['temporal'] * (1.0 - (day_gap / time_threshold_days))
+    total_weight = weights['temporal']
+
+    if inc1['latitude'] != 0 and inc2['latitude'] != 0:
+        distance = calculate_geographic_distance(
+            inc1['latitude'], inc1['longitude'],
+            inc2['latitude'], inc2['longitude']
+        )
+        if distance > distance_threshold_km:
+            return None
+        score += weights['geographic'] * (1.0 - (distance / distance_threshold_km))
+        total_weight += weights['geographic']
+
+    if inc1.get('restricted_area_id') and inc2.get('restricted_area_id'):
+        if inc1['restricted_area_id'] == inc2['restricted_area_id']:
+            score += weights['same_location']
+            total_weight += weights['same_location']
+        else:
+            total_weight += weights['different_location']
+
+    text_weight = weights['title'] + weights['description']
+    total_weight += text_weight
+    return (DUPLICATE_CONFIDENCE_THRESHOLD * total_weight - score) / text_weight
+
+
+def find_duplicate_candidates(incidents: List[Dict],
+                              time_threshold_days: int = 2,
+                              distance_threshold_km: float = 50.0) -> Dict[int, List[int]]:
+    """
+    Candidate duplicate pairs by blocking, score bound and MinHash/LSH.
+
+    Returns: {index: [later indexes worth exact scoring]} (ascending)
+    """
+    precision = geohash_precision_for(distance_threshold_km)
+
+    parsed_dates = [parse_sighting_date(inc['sighting_date']) for inc in incidents]
+    date_buckets = {}
+    by_cell = defaultdict(list)       # (date bucket, geohash) -> indexes
+    unlocated = defaultdict(list)     # date bucket -> indexes without a location
+    by_bucket = defaultdict(list)     # date bucket -> all indexes
+
+    for i, inc in enumerate(incidents):
+        if parsed_dates[i] is None:
+            continue  # calculate_temporal_distance gives 999 days: never a duplicate
+        bucket = date_bucket(parsed_dates[i], time_threshold_days)
+        date_buckets[i] = bucket
+        by_bucket[bucket].append(i)
+        if inc['latitude'] == 0:
+            unlocated[bucket].append(i)
+        else:
+            by_cell[(bucket, geohash_encode(inc['latitude'], inc['longitude'], precision))].append(i)
+
+    band_keys = {}
+
+    def keys_for(index: int) -> set:
+        if index not in band_keys:
+            band_keys[index] = lsh_band_keys(incidents[index])
+        return band_keys[index]
+
+    candidates = {}
+    for i, bucket in date_buckets.items():
+        inc = incidents[i]
+        cells = [] if inc['latitude'] == 0 else geohash_cells_near(
+            inc['latitude'], inc['longitude'], distance_threshold_km, precision
+        )
+        neighbours = set()
+        for nearby_bucket in (bucket - 1, bucket, bucket + 1):
+            if inc['latitude'] == 0:
+                neighbours.update(by_bucket.get(nearby_bucket, ()))
+                continue
+            neighbours.update(unlocated.get(nearby_bucket, ()))
+            for cell in cells:
+                neighbours.update(by_cell.get((nearby_bucket, cell), ()))
+
+        survivors = []
+        for j in sorted(n for n in neighbours if n > i):
+            try:
+                day_gap = abs((parsed_dates[j] - parsed_dates[i]).days)
+            except TypeError:
+                continue  # Naive vs aware datetimes: calculate_temporal_distance gives 999
+
+            required = _required_text_similarity(
+                inc, incidents[j], day_gap, time_threshold_days, distance_threshold_km
+            )
+            if required is None or required > 1.0 + 1e-9:
+                continue
+            if required > LSH_MIN_REQUIRED_SIMILARITY and not (keys_for(i) & keys_for(j)):
+                continue
+            survivors.append(j)
+
+        if survivors:
+            candidates[i] = survivors
+
+    return candidates
+
+
+def find_duplicate_groups(incidents: List[Dict],
+                          time_threshold_days: int = 2,
+                          distance_threshold_km: float = 50.0,
+                          exhaustive: bool = False) -> List[List[int]]:
     """
     Find groups of duplicate incidents
 
+    Incidents are grouped greedily in list order: each incident not yet
+    grouped collects every later ungrouped incident it duplicates.
+    exhaustive=True scores every pair (reference implementation for benchmarks).
+
     Returns: List of groups, each group is a list of incident IDs
     """
+    if exhaustive:
+        candidates = {i: range(i + 1, len(incidents)) for i in range(len(incidents))}
+    else:
+        candidates = find_duplicate_candidates(incidents, time_threshold_days, distance_threshold_km)
+
     duplicate_groups = []
     processed_ids = set()
 
@@ -321,14 +531,18 @@ def find_duplicate_groups(incidents: List[Dict]) -> List[List[int]]:
         # Start a new group with this incident
         current_group = [inc1['id']]
 
-        # Compare with all subsequent incidents
-        for j in range(i + 1, len(incidents)):
+        # Compare with the candidate incidents after it
+        for j in candidates.get(i, ()):
             inc2 = incidents[j]
 
             if inc2['id'] in processed_ids:
                 continue
 
-            is_dup, confidence, reason = is_duplicate_incident(inc1, inc2)
+            is_dup, confidence, reason = is_duplicate_incident(
+                inc1, inc2,
+                time_threshold_days=time_threshold_days,
+                distance_threshold_km=distance_threshold_km
+            )
 
             if is_dup:
                 print(f"  DUPLICATE FOUND: {inc1['id']} ≈ {inc2['id']} (confidence: {confidence:.2f})")
@@ -509,9 +723,9 @@ def run_deduplication(db_path: str = 'data/drone_cuas_staging.db'):
 
     false_positives = []
 
-    for inc in active_incidents:
-        classification = classify_incident_with_ai(inc)
+    classifications = classify_incidents_with_ai(active_incidents)
 
+    for inc, classification in zip(active_incidents, classifications):
         if not classification['is_real_incident']:
             print(f"\n❌ FALSE POSITIVE: ID {inc['id']}")
             print(f"   Title: {inc['title']}")
@@ -540,6 +754,8 @@ def run_deduplication(db_path: str = 'data/drone_cuas_staging.db'):
     print(f"Incidents marked as duplicates: {sum(len(g) - 1 for g in duplicate_groups)}")
     print(f"False positives identified: {len(false_positives)}")
     print(f"Real incidents remaining: {len(active_incidents) - len(false_positives)}")
+    if gateway.available:
+        print(gateway.format_stats())
     print("=" * 80)
 
 
@@ -0,0 +1,239 @@
+"""
+Background Job Queue
+
+Heavy analysis endpoints (correlation runs, linguistic batches, pattern
+auto-detection, flight forensics) used to do their work inside the HTTP
+request, which could time out the instance and block other users. They now
+submit a job and return its id immediately:
+
+- Jobs are rows in the `jobs` table (status, progress, result, error)
+- A small worker pool on the server's event loop runs each job in a thread
+  with its own database session
+- Submitting the same job type with identical parameters while one is queued
+  or running returns the existing job
+- A finished job's result is served again until its input tables change
+  (row count / max id / max updated_at fingerprint) or the job type's
+  max age passes
+
+Job handlers are registered with `@register_job(...)` next to the endpoint
+that submits them.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.models import Job
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+# Progress writes are throttled to keep SQLite write traffic low
+PROGRESS_WRITE_INTERVAL_SECONDS = 0.5
+
+
+@dataclass
+class JobType:
+    name: str
+    handler: Callable  # handler(db, params, report_progress) -> JSON-serializable result
+    data_models: List = field(default_factory=list)  # Tables whose changes invalidate cached results
+    max_age: Optional[timedelta] = None  # Re-run after this long even without data changes
+
+
+JOB_TYPES: Dict[str, JobType] = {}
+
+
+def register_job(name: str, data_models: List = None, max_age: Optional[timedelta] = None):
+    """Decorator registering a job handler under `name`"""
+    def decorator(handler: Callable) -> Callable:
+        JOB_TYPES[name] = JobType(name, handler, data_models or [], max_age)
+        return handler
+    return decorator
+
+
+def data_version(db: Session, models: List) -> str:
+    """Fingerprint of the given tables (changes on insert, delete and ORM update)"""
+    parts = []
+    for model in models:
+        columns = [func.count(), func.max(model.id)]
+        if hasattr(model, "updated_at"):
+            columns.append(func.max(model.updated_at))
+        parts.append([str(value) for value in db.query(*columns).one()])
+    return hashlib.sha1(json.dumps(parts).encode()).hexdigest()
+
+
+def _params_hash(job_type: str, params_json: str) -> str:
+    return hashlib.sha1(f"{job_type}:{params_json}".encode()).hexdigest()
+
+
+def serialize_job(job: Job) -> Dict:
+    """Status view of a job (without the result payload)"""
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "progress": round(job.progress or 0.0, 3),
+        "progress_message": job.progress_message,
+        "params": json.loads(job.params) if job.params else {},
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "status_url": f"/api/jobs/{job.id}",
+        "result_url": f"/api/jobs/{job.id}/result",
+    }
+
+
+class JobQueue:
+    """In-process worker pool for registered job types"""
+
+    def __init__(self, workers: int = 2):
+        self.workers = workers
+        self._loop = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+    def _ensure_started(self):
+        """Start the worker pool on the running event loop (once per loop)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        self._recover_jobs()
+
+    def _recover_jobs(self):
+        """Fail jobs interrupted by a restart and re-queue those never started"""
+        from backend.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            for job in db.query(Job).filter(Job.status.in_(["queued", "running"])).order_by(Job.id):
+                if job.status == "running":
+                    job.status = "failed"
+                    job.error = "Interrupted by server restart"
+                    job.finished_at = datetime.utcnow()
+                else:
+                    self._queue.put_nowait(job.id)
+            db.commit()
+        finally:
+            db.close()
+
+    def submit(self, db: Session, job_type: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Queue a job, or return an identical queued/running job or a cached result.
+
+        Returns the job status view plus `cached: true` when a finished result
+        is being reused.
+        """
+        spec = JOB_TYPES[job_type]
+        self._ensure_started()
+
+        params_json = json.dumps(params or {}, sort_keys=True, default=str)
+        params_hash = _params_hash(job_type, params_json)
+        current_version = data_version(db, spec.data_models)
+
+        latest = db.query(Job).filter(
+            Job.params_hash == params_hash,
+            Job.status != "failed"
+        ).order_by(Job.id.desc()).first()
+
+        if latest:
+            if latest.status in ("queued", "running"):
+                return {**serialize_job(latest), "cached": False}
+
+            fresh = spec.max_age is None or (
+                latest.finished_at and datetime.utcnow() - latest.finished_at < spec.max_age
+            )
+            if latest.data_version == current_version and fresh:
+                return {**serialize_job(latest), "cached": True}
+
+        job = Job(
+            job_type=job_type,
+            params=params_json,
+            params_hash=params_hash,
+            data_version=current_version,
+            status="queued"
+        )
+        db.add(job)
+        db.commit()
+        self._queue.put_nowait(job.id)
+        return {**serialize_job(job), "cached": False}
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await asyncio.to_thread(self._run, job_id)
+            except Exception as e:
+                print(f"⚠ Job {job_id} crashed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id: int):
+        """Execute one job in a worker thread"""
+        from backend.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            job = db.get(Job, job_id)
+            if not job or job.status != "queued":
+                return
+
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            db.commit()
+
+            spec = JOB_TYPES[job.job_type]
+            params = json.loads(job.params) if job.params else {}
+            try:
+                result = spec.handler(db, params, self._progress_reporter(job_id))
+            except Exception as e:
+                db.rollback()
+                job = db.get(Job, job_id)
+                job.status = "failed"
+                job.error = str(e)
+                print(f"⚠ Job {job_id} ({job.job_type}) failed: {e}")
+            else:
+                job = db.get(Job, job_id)
+                job.status = "succeeded"
+                job.progress = 1.0
+                job.result = json.dumps(result, default=str)
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        finally:
+            db.close()
+
+    def _progress_reporter(self, job_id: int) -> Callable:
+        """Callback handlers use to report progress: report(fraction, message=None)"""
+        from backend.database import SessionLocal
+
+        last_write = [0.0]
+
+        def report(fraction: float, message: Optional[str] = None):
+            now = time.monotonic()
+            if now - last_write[0] < PROGRESS_WRITE_INTERVAL_SECONDS and fraction < 1.0:
+                return
+            last_write[0] = now
+            db = SessionLocal()
+            try:
+                db.query(Job).filter(Job.id == job_id).update({
+                    "progress": max(0.0, min(fraction, 1.0)),
+                    "progress_message": (message or "")[:255] or None
+                })
+                db.commit()
+            finally:
+                db.close()
+
+        return report
+
+
+# Shared queue used by the API routers
+job_queue = JobQueue()
@@ -0,0 +1,154 @@
+"""
+Source Link Health Cache
+
+Checking whether a source URL still works used to happen with a blocking
+`requests.head()` inside request handlers, freezing the event loop for up to
+the full timeout on slow news sites. Endpoints now read the last known status
+from the `link_status` table and queue a background re-check when the entry is
+missing or older than its TTL.
+
+The checker runs on the server's event loop: a small worker pool pulls URLs
+from a queue, limits concurrent requests per host, and runs the HEAD request
+in a thread so the loop never blocks.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from sqlalchemy.orm import Session
+
+from backend.models import LinkStatus
+
+# How long a result is trusted before a refresh is queued
+LINK_STATUS_TTL = timedelta(hours=24)
+FAILED_LINK_STATUS_TTL = timedelta(hours=1)  # Retry broken links sooner
+
+STATUS_MEANING = {
+    -1: "TIMEOUT",
+    -2: "CONNECTION_ERROR",
+    -3: "OTHER_ERROR",
+}
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+class LinkHealthChecker:
+    """Background HEAD checker with a global worker pool and per-host limits"""
+
+    def __init__(self, workers: int = 8, per_host_limit: int = 2, timeout_seconds: int = 5):
+        self.workers = workers
+        self.per_host_limit = per_host_limit
+        self.timeout_seconds = timeout_seconds
+
+        self._loop = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending = set()
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tasks = []
+
+    def _ensure_started(self):
+        """Start the worker pool on the running event loop (once per loop)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._pending = set()
+        self._host_semaphores = {}
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    def queue_refresh(self, url: str) -> bool:
+        """Queue a background check for `url`. Returns False if already queued."""
+        if not url:
+            return False
+        try:
+            self._ensure_started()
+        except RuntimeError:
+            # No running event loop (called from a script) - nothing to schedule on
+            return False
+        if url in self._pending:
+            return False
+        self._pending.add(url)
+        self._queue.put_nowait(url)
+        return True
+
+    async def _worker(self):
+        while True:
+            url = await self._queue.get()
+            try:
+                host = _host(url)
+                semaphore = self._host_semaphores.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+                async with semaphore:
+                    result = await asyncio.to_thread(self.check_url, url)
+                await asyncio.to_thread(self._store, url, host, result)
+            except Exception as e:
+                print(f"⚠ Link check failed for {url}: {e}")
+            finally:
+                self._pending.discard(url)
+                self._queue.task_done()
+
+    def check_url(self, url: str) -> Dict:
+        """Blocking HEAD request (run in a worker thread)"""
+        try:
+            response = requests.head(url, timeout=self.timeout_seconds, allow_redirects=True)
+            return {"working": response.status_code < 400, "status_code": response.status_code, "error": None}
+        except requests.exceptions.Timeout:
+            return {"working": False, "status_code": -1, "error": "TIMEOUT"}
+        except requests.exceptions.ConnectionError:
+            return {"working": False, "status_code": -2, "error": "CONNECTION_ERROR"}
+        except Exception as e:
+            return {"working": False, "status_code": -3, "error": str(e)[:255]}
+
+    def _store(self, url: str, host: str, result: Dict):
+        from backend.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            row = db.query(LinkStatus).filter(LinkStatus.url == url).first()
+            if not row:
+                row = LinkStatus(url=url, host=host)
+                db.add(row)
+            row.working = result["working"]
+            row.status_code = result["status_code"]
+            row.error = result["error"]
+            row.checked_at = datetime.utcnow()
+            db.commit()
+        finally:
+            db.close()
+
+    def get_status(self, db: Session, url: str, refresh: bool = True) -> Dict:
+        """
+        Return the cached status for `url` without any network I/O.
+
+        A refresh is queued when the entry is missing or past its TTL; the
+        response then reports the previous result (if any) with `stale: true`.
+        """
+        row = db.query(LinkStatus).filter(LinkStatus.url == url).first()
+
+        stale = True
+        if row and row.checked_at:
+            ttl = LINK_STATUS_TTL if row.working else FAILED_LINK_STATUS_TTL
+            stale = row.checked_at < datetime.utcnow() - ttl
+
+        refresh_queued = self.queue_refresh(url) if stale and refresh else False
+
+        status = {
+            "url": url,
+            "working": row.working if row else None,
+            "status_code": row.status_code if row else None,
+            "last_checked": row.checked_at.isoformat() if row and row.checked_at else None,
+            "stale": stale,
+            "refresh_queued": refresh_queued or url in self._pending,
+        }
+        if row and row.error:
+            status["error"] = row.error
+        return status
+
+
+# Shared checker used by the API routers
+link_checker = LinkHealthChecker()
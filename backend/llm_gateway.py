@@ -0,0 +1,348 @@
+"""
+LLM Gateway
+
+Single entry point for LLM calls from the analysis scripts (incident
+classification, Telegram post analysis, news scans):
+
+- Persistent result cache (the shared response cache, namespace "llm")
+  keyed by a hash of backend, model, parameters and prompt, so re-runs only
+  pay for new content; entries expire after 90 days and the namespace is
+  size-bounded
+- Bounded concurrency on asyncio (a semaphore around threaded SDK calls;
+  LLM_MAX_CONCURRENCY, default 8) with exponential backoff and jitter on
+  rate limits, overload and connection errors
+- Batch helpers that run many prompts concurrently and return results in
+  input order
+- Backends: Anthropic (default) or a deterministic local stub
+  (LLM_BACKEND=stub) for tests and offline runs
+- Counters: requests, cache hit rate, retries, errors and backend latency
+
+Usage:
+    from backend.llm_gateway import gateway, parse_json_response
+
+    text = gateway.complete(prompt, model="claude-sonnet-4-20250514", max_tokens=1024)
+    results = gateway.complete_many([{"prompt": p, "max_tokens": 500} for p in prompts])
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Union
+
+from backend.response_cache import ResponseCache
+
+try:
+    import anthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+DEFAULT_MODEL = "claude-sonnet-4-20250514"
+CACHE_TTL_SECONDS = 90 * 24 * 3600
+CACHE_MAX_ENTRIES = 50000
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+LATENCY_SAMPLES = 1000
+
+
+def parse_json_response(response_text: str):
+    """Parse a JSON answer, unwrapping ```json fenced blocks"""
+    if "```json" in response_text:
+        json_start = response_text.find("```json") + 7
+        json_end = response_text.find("```", json_start)
+        response_text = response_text[json_start:json_end].strip()
+    elif "```" in response_text:
+        json_start = response_text.find("```") + 3
+        json_end = response_text.find("```", json_start)
+        response_text = response_text[json_start:json_end].strip()
+    return json.loads(response_text)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, overload, server errors and connection problems"""
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    if ANTHROPIC_AVAILABLE and isinstance(error, (anthropic.APIConnectionError, anthropic.APITimeoutError)):
+        return True
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+# ============================================================
+# BACKENDS
+# ============================================================
+
+class AnthropicBackend:
+    """Anthropic Messages API (blocking SDK client, run in worker threads)"""
+
+    name = "anthropic"
+
+    def __init__(self, api_key: Optional[str] = None):
+        api_key = api_key or os.environ.get("ANTHROPIC_API_KEY", "")
+        # Retries are handled by the gateway
+        self.client = anthropic.Anthropic(api_key=api_key, max_retries=0) if api_key and ANTHROPIC_AVAILABLE else None
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
+    def complete(self, prompt: str, model: str, max_tokens: int,
+                 temperature: Optional[float] = None, system: Optional[str] = None) -> str:
+        kwargs = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if system:
+            kwargs["system"] = system
+        message = self.client.messages.create(**kwargs)
+        return message.content[0].text
+
+
+class StubError(Exception):
+    """Transient failure raised by StubBackend (retryable)"""
+    status_code = 529
+
+
+class StubBackend:
+    """
+    Deterministic offline backend.
+
+    Answers come from `responder(prompt)` or, by default, a small JSON object
+    derived from the prompt hash. `transient_failures` makes the first N calls
+    per prompt fail with a retryable error (to exercise retry/backoff).
+    """
+
+    name = "stub"
+    available = True
+
+    def __init__(self, responder: Optional[Callable[[str], str]] = None,
+                 latency_seconds: float = 0.0, transient_failures: int = 0):
+        self.responder = responder
+        self.latency_seconds = latency_seconds
+        self.transient_failures = transient_failures
+        self.calls = 0
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str, model: str, max_tokens: int,
+                 temperature: Optional[float] = None, system: Optional[str] = None) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            self.calls += 1
+            failures = self._failures.get(digest, 0)
+            if failures < self.transient_failures:
+                self._failures[digest] = failures + 1
+                raise StubError("stub backend overloaded")
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        if self.responder:
+            return self.responder(prompt)
+        return json.dumps({"stub": True, "model": model, "prompt_sha256": digest[:16]})
+
+
+def backend_from_env():
+    """LLM_BACKEND=stub selects the offline stub; anything else uses Anthropic"""
+    if os.environ.get("LLM_BACKEND", "anthropic").lower() == "stub":
+        return StubBackend()
+    return AnthropicBackend()
+
+
+# ============================================================
+# GATEWAY
+# ============================================================
+
+@dataclass
+class LLMResult:
+    text: str
+    cached: bool
+    latency_ms: float
+
+
+class LLMGateway:
+    """Cached, concurrency-limited LLM access with retries and counters"""
+
+    def __init__(self, backend=None, cache_path: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = BACKOFF_BASE_SECONDS):
+        self.backend = backend if backend is not None else backend_from_env()
+        self.cache = ResponseCache("llm", ttl_seconds=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES,
+                                   path=cache_path or os.environ.get("LLM_CACHE_PATH"))
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+
+        self._semaphores = {}
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def available(self) -> bool:
+        """False when no backend is configured (e.g. no API key); callers fall back"""
+        return self.backend.available
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._counters = {"requests": 0, "cache_hits": 0, "backend_calls": 0, "retries": 0, "errors": 0}
+            self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._counters[name] += amount
+
+    def stats(self) -> Dict:
+        """Request counters, cache hit rate and backend latency percentiles (ms)"""
+        with self._stats_lock:
+            counters = dict(self._counters)
+            latencies = sorted(self._latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return round(latencies[min(int(len(latencies) * fraction), len(latencies) - 1)], 1)
+
+        return {
+            **counters,
+            "backend": self.backend.name,
+            "hit_rate": round(counters["cache_hits"] / counters["requests"], 3) if counters["requests"] else 0.0,
+            "latency_ms": {
+                "avg": round(sum(latencies) / len(latencies), 1) if latencies else None,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(latencies[-1], 1) if latencies else None,
+            },
+        }
+
+    def format_stats(self) -> str:
+        stats = self.stats()
+        latency = stats["latency_ms"]
+        return (
+            f"LLM: {stats['requests']} requests, {stats['cache_hits']} cache hits "
+            f"({stats['hit_rate']:.0%}), {stats['backend_calls']} backend calls, "
+            f"{stats['retries']} retries, {stats['errors']} errors"
+            + (f", latency p50 {latency['p50']}ms / p95 {latency['p95']}ms" if latency["p50"] is not None else "")
+        )
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def _cache_key(self, prompt: str, model: str, max_tokens: int,
+                   temperature: Optional[float], system: Optional[str]) -> str:
+        payload = json.dumps(
+            [self.backend.name, model, max_tokens, temperature, system, prompt],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores = {loop: asyncio.Semaphore(self.max_concurrency)}
+        return self._semaphores[loop]
+
+    async def acomplete(self, prompt: str, model: str = DEFAULT_MODEL, max_tokens: int = 1024,
+                        temperature: Optional[float] = None, system: Optional[str] = None,
+                        use_cache: bool = True) -> LLMResult:
+        """Complete one prompt (cached results return without a backend call)"""
+        if not self.available:
+            raise RuntimeError("No LLM backend configured (set ANTHROPIC_API_KEY or LLM_BACKEND=stub)")
+
+        self._count("requests")
+        key = self._cache_key(prompt, model, max_tokens, temperature, system)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count("cache_hits")
+                return LLMResult(cached, True, 0.0)
+
+        async with self._semaphore():
+            attempt = 0
+            while True:
+                started = time.perf_counter()
+                try:
+                    text = await asyncio.to_thread(
+                        self.backend.complete, prompt, model, max_tokens, temperature, system
+                    )
+                    break
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_retryable(e):
+                        self._count("errors")
+                        raise
+                    delay = min(self.backoff_base * (2 ** attempt), BACKOFF_MAX_SECONDS)
+                    attempt += 1
+                    self._count("retries")
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._counters["backend_calls"] += 1
+            self._latencies.append(latency_ms)
+        self.cache.set(key, text)
+        return LLMResult(text, False, latency_ms)
+
+    async def acomplete_many(self, requests: List[Dict],
+                             progress_callback: Optional[Callable[[int, int], None]] = None
+                             ) -> List[Union[str, Exception]]:
+        """
+        Complete many prompts concurrently (at most max_concurrency backend
+        calls in flight). Each request is a dict of acomplete() arguments.
+
+        Returns response texts in input order; failed requests hold their exception.
+        """
+        done = [0]
+
+        async def run(request):
+            try:
+                return (await self.acomplete(**request)).text
+            except Exception as e:
+                return e
+            finally:
+                done[0] += 1
+                if progress_callback:
+                    progress_callback(done[0], len(requests))
+
+        return await asyncio.gather(*(run(request) for request in requests))
+
+    # Blocking wrappers for scripts
+
+    def complete(self, prompt: str, **kwargs) -> str:
+        """Blocking acomplete() returning the response text"""
+        return _run_sync(self.acomplete(prompt, **kwargs)).text
+
+    def complete_many(self, requests: List[Dict],
+                      progress_callback: Optional[Callable[[int, int], None]] = None
+                      ) -> List[Union[str, Exception]]:
+        """Blocking acomplete_many()"""
+        return _run_sync(self.acomplete_many(requests, progress_callback))
+
+
+def _run_sync(coroutine):
+    """Run a coroutine to completion, in a helper thread if a loop is already running"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+gateway = LLMGateway(max_concurrency=int(os.environ.get("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)))
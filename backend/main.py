@@ -32,6 +32,12 @@ async def startup():
             seed_db()
         except Exception as e:
             print(f"⚠️  Could not seed database: {e}")
+        # Keep the write-time duplicate index warm for new incidents
+        from backend.duplicate_index import duplicate_index
+        duplicate_index.warm()
+        # Fetch news feeds into the article search index in the background
+        from backend.article_scraper import get_article_scraper
+        get_article_scraper().feed_index.start()
         print("✓ OSINT CUAS Dashboard Ready")
     except Exception as e:
         print(f"⚠️  Startup error: {e}")
@@ -67,6 +73,7 @@ safe_include_router("interventions", "router", "/api/interventions", "interventi
 safe_include_router("socmint", "router", "/api/socmint", "socmint")
 safe_include_router("forums", "router", "/api/forums", "forums")
 safe_include_router("flight_forensics", "router", "/api/flight-forensics", "flight-forensics")
+safe_include_router("jobs", "router", "/api/jobs", "jobs")
 
 # Mount static files
 if os.path.exists("frontend/src"):
@@ -27,7 +27,9 @@ if not os.path.exists(STAGING_DB):
         print(f"✅ Staging database created: {STAGING_DB}")
     else:
         print(f"⚠️  Production database not found, initializing new staging DB...")
-        init_db()
+
+# Always bring the staging schema up to date (new tables/columns on an existing copy)
+init_db()
 
 # Initialize staging app
 app = FastAPI(
@@ -61,7 +63,8 @@ from backend.routers import (
     forums,
     gru_monitoring,
     correlation,
-    flight_forensics
+    flight_forensics,
+    jobs
 )
 
 # Include routers
@@ -80,6 +83,7 @@ app.include_router(forums.router, prefix="/api/forums", tags=["forums"])
 app.include_router(gru_monitoring.router, prefix="/api/gru-monitoring", tags=["gru-monitoring"])
 app.include_router(correlation.router, prefix="/api/correlation", tags=["correlation"])
 app.include_router(flight_forensics.router, prefix="/api/flight-forensics", tags=["flight-forensics"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
 
 # Mount static files
 if os.path.exists("frontend/src"):
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Date, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Date, Boolean, Index
+from sqlalchemy import event, select, update, delete, inspect, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from backend.country_detection import resolve_incident_country
 
 Base = declarative_base()
 
@@ -75,6 +78,7 @@ class Incident(Base):
     restricted_area_id = Column(Integer, ForeignKey("restricted_areas.id"), nullable=True)
     restricted_area = relationship("RestrictedArea", back_populates="incidents")
     distance_to_restricted_m = Column(Integer)  # Distance to nearest restricted area
+    country = Column(String(2), nullable=True, index=True)  # Resolved on write (title > location > restricted area)
 
     # Incident details
     duration_minutes = Column(Integer)
@@ -233,6 +237,7 @@ class TelegramChannel(Base):
     channel_type = Column(String(20))  # public, private, invite_only
     language_primary = Column(String(10))  # nl, ru, en, etc
     risk_score = Column(Integer, default=0)  # 0-100 automated risk assessment
+    scrape_priority = Column(Integer, index=True)  # 1 = scraped first; NULL = not in the scrape list
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -274,6 +279,35 @@ class TelegramMessage(Base):
 
     forwards = relationship("MessageForward", back_populates="source_message", foreign_keys="MessageForward.source_message_id")
 
+class TelegramMessageDailyCount(Base):
+    """Messages per channel per day (maintained on message insert/update/delete)"""
+    __tablename__ = "telegram_message_daily_counts"
+
+    channel_id = Column(Integer, ForeignKey("telegram_channels.id"), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class TelegramScrapeState(Base):
+    """Per-scraper watermark: newest Telegram message id already fetched from a channel"""
+    __tablename__ = "telegram_scrape_state"
+
+    scraper = Column(String(50), primary_key=True)  # Name of the scraping script / pipeline
+    channel_id = Column(Integer, ForeignKey("telegram_channels.id"), primary_key=True)
+    min_id = Column(Integer, nullable=False, default=0)  # Next run fetches messages with id > min_id
+    messages_fetched = Column(Integer, nullable=False, default=0)
+    last_scraped_at = Column(DateTime)
+    last_error = Column(Text)
+
+class TelegramMessageKeywords(Base):
+    """Link-analysis keyword hits per message (computed once, cleared when the text changes)"""
+    __tablename__ = "telegram_message_keywords"
+
+    message_id = Column(Integer, ForeignKey("telegram_messages.id"), primary_key=True)
+    drone_keywords = Column(Text)  # JSON array of matched drone keywords
+    location_keywords = Column(Text)  # JSON array of matched location names
+    word_count = Column(Integer, nullable=False, default=0)
+    keyword_version = Column(String(40), index=True)  # Hash of the keyword lists that produced the hits
+
 class TelegramParticipant(Base):
     """Telegram users tracked across channels"""
     __tablename__ = "telegram_participants"
@@ -335,6 +369,43 @@ class MessageForward(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Coordination detection walks forwards per source message in time order
+        Index("ix_message_forwards_source_message_time", "source_message_id", "forward_timestamp"),
+    )
+
+class CoordinatedForwardRun(Base):
+    """One coordinated-forwarding detection pass (per window/threshold setting)"""
+    __tablename__ = "coordinated_forward_runs"
+
+    id = Column(Integer, primary_key=True)
+    time_window_minutes = Column(Integer, nullable=False, index=True)
+    min_channels = Column(Integer, nullable=False, index=True)
+    forwards_watermark = Column(Integer, default=0)  # Highest message_forwards.id seen by this run
+    event_count = Column(Integer, default=0)
+    detected_at = Column(DateTime, default=datetime.utcnow)
+
+    events = relationship("CoordinatedForwardEvent", back_populates="run", cascade="all, delete-orphan")
+
+class CoordinatedForwardEvent(Base):
+    """Burst of forwards of one message to many channels (precomputed by detection runs)"""
+    __tablename__ = "coordinated_forward_events"
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey("coordinated_forward_runs.id"), nullable=False, index=True)
+    run = relationship("CoordinatedForwardRun", back_populates="events")
+
+    source_message_id = Column(Integer, ForeignKey("telegram_messages.id"), nullable=False, index=True)
+    destination_channel_ids = Column(Text)  # JSON list of telegram_channels.id inside the burst
+    destination_count = Column(Integer, nullable=False)  # Distinct channels inside the burst
+    total_forwards = Column(Integer)  # All forwards of the message, stragglers included
+    first_forward = Column(DateTime)
+    last_forward = Column(DateTime)
+    burst_minutes = Column(Float)
+    coordination_score = Column(Float, index=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class PrivateChannelLeak(Base):
     """Track when private channels leak content to public channels"""
     __tablename__ = "private_channel_leaks"
@@ -478,6 +549,18 @@ class IncidentCorrelation(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class CorrelationWatermark(Base):
+    """Progress of incremental correlation runs (one row per analysis type and window)"""
+    __tablename__ = "correlation_watermarks"
+
+    id = Column(Integer, primary_key=True)
+    analysis_type = Column(String(50), nullable=False, index=True)  # telegram_spike, forum_discussion
+    time_window_hours = Column(Integer, nullable=False)
+    last_incident_id = Column(Integer, default=0)  # Highest incident id analyzed
+    last_message_id = Column(Integer, default=0)  # Highest telegram_messages / aviation_forum_posts id seen
+    last_message_timestamp = Column(DateTime)  # Newest message timestamp seen
+    last_run_at = Column(DateTime, default=datetime.utcnow)
+
 # ============================================================
 # UNIVERSAL INTELLIGENCE LINK ANALYSIS (Palantir-style)
 # ============================================================
@@ -528,3 +611,175 @@ class IntelligenceLink(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # One link per entity pair and relationship (link discovery upserts on these).
+        # Pseudo-entities have entity_b_id 0 and are told apart by their identifier.
+        Index(
+            "uq_intelligence_links_entities",
+            "entity_a_type", "entity_a_id", "entity_b_type", "entity_b_id", "relationship_type",
+            unique=True,
+            sqlite_where=text("entity_b_id != 0")
+        ),
+        Index(
+            "uq_intelligence_links_pseudo_entities",
+            "entity_a_type", "entity_a_id", "entity_b_type", "entity_b_identifier", "relationship_type",
+            unique=True,
+            sqlite_where=text("entity_b_id = 0")
+        ),
+    )
+
+# ============================================================
+# SOURCE LINK HEALTH
+# ============================================================
+
+class LinkStatus(Base):
+    """Cached reachability of source URLs (filled by the background link checker)"""
+    __tablename__ = "link_status"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String(500), unique=True, nullable=False, index=True)
+    host = Column(String(255), index=True)
+    working = Column(Boolean)
+    status_code = Column(Integer)  # HTTP status, or -1 timeout / -2 connection error / -3 other error
+    error = Column(String(255))
+    checked_at = Column(DateTime, index=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# ============================================================
+# NEWS FEED INGESTION
+# ============================================================
+
+class FeedState(Base):
+    """Conditional-GET validators and read position per RSS/Atom feed (see backend/feed_fetcher.py)"""
+    __tablename__ = "feed_state"
+
+    feed_url = Column(String(500), primary_key=True)
+    etag = Column(String(255))  # Sent back as If-None-Match
+    last_modified = Column(String(100))  # Sent back as If-Modified-Since
+    last_entry_hash = Column(String(32))  # Newest entry already processed
+    last_status = Column(Integer)  # HTTP status of the last fetch (304 = not modified), -1 = error
+    last_error = Column(String(255))
+    last_new_entries = Column(Integer, default=0)
+    last_fetched_at = Column(DateTime)
+
+# ============================================================
+# BACKGROUND JOBS
+# ============================================================
+
+class Job(Base):
+    """Heavy analysis run in the background worker pool (see backend/jobs.py)"""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    job_type = Column(String(50), nullable=False, index=True)  # correlation.analyze, patterns.auto_detect, ...
+    params = Column(Text)  # JSON, canonical (sorted keys)
+    params_hash = Column(String(40), nullable=False, index=True)  # sha1 of job_type + params, for dedupe
+    data_version = Column(String(64))  # Fingerprint of the input tables when the job started
+
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, succeeded, failed
+    progress = Column(Float, default=0.0)  # 0-1
+    progress_message = Column(String(255))
+    result = Column(Text)  # JSON
+    error = Column(Text)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+# ============================================================
+# WRITE-TIME DERIVED FIELDS
+# ============================================================
+
+def _area_name_and_country(connection, incident):
+    """Look up (name, country) of the incident's restricted area"""
+    area = incident.__dict__.get("restricted_area")
+    if area is not None:
+        return area.name, area.country
+    if not incident.restricted_area_id:
+        return None, None
+    row = connection.execute(
+        select(RestrictedArea.name, RestrictedArea.country).where(
+            RestrictedArea.id == incident.restricted_area_id
+        )
+    ).first()
+    return (row[0], row[1]) if row else (None, None)
+
+@event.listens_for(Incident, "before_insert")
+def _set_incident_country_on_insert(mapper, connection, target):
+    """Persist the resolved country so list queries don't recompute it"""
+    location_name, area_country = _area_name_and_country(connection, target)
+    target.country = resolve_incident_country(target.title, location_name, area_country)
+
+@event.listens_for(Incident, "before_update")
+def _set_incident_country_on_update(mapper, connection, target):
+    """Recompute the resolved country when title or restricted area changes"""
+    state = inspect(target)
+    if not any(
+        state.attrs[attr].history.has_changes()
+        for attr in ("title", "restricted_area_id", "restricted_area")
+    ):
+        return
+    location_name, area_country = _area_name_and_country(connection, target)
+    target.country = resolve_incident_country(target.title, location_name, area_country)
+
+@event.listens_for(RestrictedArea, "after_update")
+def _refresh_area_incident_countries(mapper, connection, target):
+    """Re-resolve linked incidents when an area's name or country changes"""
+    state = inspect(target)
+    if not (state.attrs.name.history.has_changes() or state.attrs.country.history.has_changes()):
+        return
+    rows = connection.execute(
+        select(Incident.id, Incident.title).where(Incident.restricted_area_id == target.id)
+    ).all()
+    for incident_id, title in rows:
+        connection.execute(
+            update(Incident).where(Incident.id == incident_id).values(
+                country=resolve_incident_country(title, target.name, target.country)
+            )
+        )
+
+def _bump_daily_count(connection, channel_id, timestamp, delta):
+    """Add delta to the (channel, day) message count"""
+    if channel_id is None or timestamp is None:
+        return
+    stmt = sqlite_insert(TelegramMessageDailyCount).values(
+        channel_id=channel_id, day=timestamp.date(), count=delta
+    )
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=["channel_id", "day"],
+        set_={"count": TelegramMessageDailyCount.count + delta}
+    ))
+
+@event.listens_for(TelegramMessage, "after_insert")
+def _count_message_on_insert(mapper, connection, target):
+    _bump_daily_count(connection, target.channel_id, target.timestamp, 1)
+
+@event.listens_for(TelegramMessage, "after_delete")
+def _count_message_on_delete(mapper, connection, target):
+    _bump_daily_count(connection, target.channel_id, target.timestamp, -1)
+    _clear_keyword_hits(connection, target.id)
+
+def _clear_keyword_hits(connection, message_id):
+    """Drop stored keyword hits so link analysis recomputes them"""
+    connection.execute(delete(TelegramMessageKeywords).where(TelegramMessageKeywords.message_id == message_id))
+
+@event.listens_for(TelegramMessage, "after_update")
+def _clear_keyword_hits_on_update(mapper, connection, target):
+    if inspect(target).attrs.text_content.history.has_changes():
+        _clear_keyword_hits(connection, target.id)
+
+@event.listens_for(TelegramMessage, "after_update")
+def _count_message_on_update(mapper, connection, target):
+    """Move the message between buckets when its channel or timestamp changes"""
+    state = inspect(target)
+    channel_history = state.attrs.channel_id.history
+    timestamp_history = state.attrs.timestamp.history
+    if not (channel_history.has_changes() or timestamp_history.has_changes()):
+        return
+    old_channel = channel_history.deleted[0] if channel_history.deleted else target.channel_id
+    old_timestamp = timestamp_history.deleted[0] if timestamp_history.deleted else target.timestamp
+    _bump_daily_count(connection, old_channel, old_timestamp, -1)
+    _bump_daily_count(connection, target.channel_id, target.timestamp, 1)
@@ -8,6 +8,7 @@ from pathlib import Path
 from sqlalchemy.orm import Session
 
 from backend.models import Incident, RestrictedArea, DroneType
+from backend.duplicate_index import flag_duplicates
 
 # EU location coordinates
 LOCATION_COORDS = {
@@ -196,6 +197,8 @@ def load_osint_data(db: Session):
 
     loaded = 0
     skipped_duplicates = 0
+    flagged_duplicates = 0
+    pending = []
     try:
         with open(osint_csv, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
@@ -271,19 +274,25 @@ def load_osint_data(db: Session):
                     )
 
                     db.add(incident)
+                    pending.append(incident)
                     loaded += 1
 
                     if loaded % 5 == 0:
+                        flagged_duplicates += len(flag_duplicates(db, pending))
                         db.commit()
+                        pending = []
 
                 except Exception as e:
                     print(f"⚠️  Error loading incident: {e}")
                     db.rollback()
+                    pending = []
                     continue
 
+        flagged_duplicates += len(flag_duplicates(db, pending))
         db.commit()
         new_total = db.query(Incident).count()
-        print(f"✅ Loaded {loaded} OSINT EU drone incidents (skipped {skipped_duplicates} duplicates)")
+        print(f"✅ Loaded {loaded} OSINT EU drone incidents (skipped {skipped_duplicates} duplicates, "
+              f"flagged {flagged_duplicates} as duplicates of existing incidents)")
         print(f"   Total incidents in database: {new_total}")
 
     except FileNotFoundError:
@@ -0,0 +1,162 @@
+"""
+Keyset (cursor) pagination and cached totals for list endpoints
+
+Offset pagination makes SQLite walk every row before the requested page, and
+`query.count()` scans the filtered table on every request. List endpoints use
+`paginate()` instead: pages are fetched with a `(sort_column, id)` seek and an
+opaque `next_cursor`, and totals come from `count_cache`, which is invalidated
+whenever the ORM flushes a write to the underlying table.
+"""
+
+import base64
+import json
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from backend.cache_sync import track_writes
+
+# Totals older than this are recomputed even without a write through the ORM
+# (raw-SQL importers and other processes bypass the flush hook)
+COUNT_CACHE_TTL_SECONDS = 300
+
+
+class CountCache:
+    """Per-process cache of filtered row counts, invalidated on write"""
+
+    def __init__(self, ttl_seconds: int = COUNT_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._counts: Dict[str, Dict[Tuple, Tuple[int, float]]] = {}
+        self._lock = threading.Lock()
+
+    def count(self, query: Query, table: str) -> int:
+        """Return the row count for `query`, computing it only on a cache miss"""
+        compiled = query.statement.compile()
+        key = (str(compiled), tuple(sorted((k, repr(v)) for k, v in compiled.params.items())))
+
+        now = time.monotonic()
+        with self._lock:
+            cached = self._counts.get(table, {}).get(key)
+        if cached and now - cached[1] < self.ttl_seconds:
+            return cached[0]
+
+        total = query.order_by(None).count()
+        with self._lock:
+            self._counts.setdefault(table, {})[key] = (total, now)
+        return total
+
+    def invalidate(self, table: str):
+        with self._lock:
+            self._counts.pop(table, None)
+
+
+count_cache = CountCache()
+
+
+def _invalidate_tables(tables: List[str]):
+    for table in set(tables):
+        count_cache.invalidate(table)
+
+
+# Totals are dropped at flush and again once committed (a read between flush
+# and commit may re-cache them)
+track_writes(
+    "count_cache_tables",
+    lambda obj, deleted: getattr(obj, "__tablename__", None),
+    on_commit=_invalidate_tables,
+    on_flush=_invalidate_tables,
+)
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Serialize keyset values into an opaque URL-safe cursor"""
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: List) -> List[Any]:
+    """Parse a cursor back into typed values for the given columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError("cursor shape mismatch")
+
+        values = []
+        for column, value in zip(columns, payload):
+            python_type = column.type.python_type
+            if value is not None and python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif value is not None and python_type is date:
+                value = date.fromisoformat(value)
+            values.append(value)
+        return values
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def _seek_condition(sort_column, id_column, sort_value, id_value, descending: bool):
+    """
+    Rows strictly after (sort_value, id_value) in the page order.
+
+    NULL sort values are treated as the lowest value, matching SQLite's
+    ordering (first when ascending, last when descending).
+    """
+    if descending:
+        if sort_value is None:
+            return and_(sort_column.is_(None), id_column < id_value)
+        return or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < id_value),
+            sort_column.is_(None),
+        )
+
+    if sort_value is None:
+        return or_(
+            and_(sort_column.is_(None), id_column > id_value),
+            sort_column.isnot(None),
+        )
+    return or_(
+        sort_column > sort_value,
+        and_(sort_column == sort_value, id_column > id_value),
+    )
+
+
+def paginate(
+    query: Query,
+    sort_column,
+    id_column,
+    descending: bool,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Tuple[list, Optional[str]]:
+    """
+    Fetch one page ordered by (sort_column, id_column).
+
+    With a cursor the page is found by seeking past the cursor's key (skip is
+    ignored); without one the legacy offset is applied. Returns the rows and
+    the cursor for the next page (None on the last page).
+    """
+    direction = (lambda c: c.desc()) if descending else (lambda c: c.asc())
+    query = query.order_by(direction(sort_column), direction(id_column))
+
+    if cursor:
+        sort_value, id_value = decode_cursor(cursor, [sort_column, id_column])
+        query = query.filter(_seek_condition(sort_column, id_column, sort_value, id_value, descending))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, sort_column.key), getattr(last, id_column.key)])
+
+    return rows, next_cursor
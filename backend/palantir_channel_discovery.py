@@ -12,17 +12,21 @@ Based on:
 import sys
 import os
 import json
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from collections import defaultdict, Counter
 import networkx as nx
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 import re
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from backend.channel_graph import ChannelGraph, pagerank as compute_pagerank
 from backend.database import SessionLocal
-from backend.models import Incident
+from backend.link_analysis_engine import LinkAnalysisEngine
+from backend.models import Incident, MessageForward, TelegramChannel, TelegramMessage, TelegramMessageKeywords
+from sqlalchemy import func
 
 # Try to import optional dependencies
 try:
@@ -32,14 +36,30 @@ except ImportError:
     COMMUNITY_AVAILABLE = False
     print("⚠️  NetworkX community detection not available. Install: pip install networkx[default]")
 
+# Messages this close to an incident count as temporally correlated
+TEMPORAL_WINDOW = timedelta(hours=48)
+
+
+def _parse_post_date(value) -> Optional[datetime]:
+    """ISO post date as naive UTC (comparable with incident dates)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
 
 class PalantirChannelDiscovery:
     """
     Palantir-style intelligence discovery engine
     """
 
-    def __init__(self, json_file: str):
-        self.json_file = json_file
+    def __init__(self, json_file: Optional[str] = None):
+        self.json_file = json_file  # None = load from the telegram_messages table
         self.graph = nx.DiGraph()
         self.messages = []
         self.channels = {}
@@ -47,19 +67,27 @@ class PalantirChannelDiscovery:
         self.discovered_channels = set()
 
     def load_data(self):
-        """Load Telegram messages from JSON"""
+        """Load Telegram messages from the database (or a JSON export)"""
         print("=" * 70)
         print("PALANTIR-STYLE CHANNEL DISCOVERY ENGINE")
         print("=" * 70)
-        print(f"\n📂 Loading: {self.json_file}")
 
-        with open(self.json_file, 'r', encoding='utf-8') as f:
-            self.messages = json.load(f)
+        if self.json_file:
+            print(f"\n📂 Loading: {self.json_file}")
+            with open(self.json_file, 'r', encoding='utf-8') as f:
+                self.messages = json.load(f)
+        else:
+            print("\n📂 Loading: telegram_messages")
+            self.messages = self._load_messages_from_db()
 
         print(f"✓ Loaded {len(self.messages)} messages")
 
         # Extract unique channels
         for msg in self.messages:
+            # Parse once; temporal correlation only needs timestamps of keyword messages
+            msg['timestamp'] = _parse_post_date(msg.get('post_date'))
+            msg['has_keywords'] = bool(msg.get('intel_keywords') or msg.get('location_keywords'))
+
             channel = msg.get('channel')
             if channel and channel not in self.channels:
                 self.channels[channel] = {
@@ -69,19 +97,80 @@ class PalantirChannelDiscovery:
                     'total_views': 0,
                     'total_forwards': 0,
                     'intel_keywords': 0,
-                    'messages': []
+                    'messages': [],
+                    'keyword_times': []
                 }
 
             if channel:
                 self.channels[channel]['message_count'] += 1
-                self.channels[channel]['total_views'] += msg.get('views', 0)
-                self.channels[channel]['total_forwards'] += msg.get('forwards', 0)
+                self.channels[channel]['total_views'] += msg.get('views') or 0
+                self.channels[channel]['total_forwards'] += msg.get('forwards') or 0
                 if msg.get('intel_keywords'):
                     self.channels[channel]['intel_keywords'] += len(msg['intel_keywords'])
                 self.channels[channel]['messages'].append(msg)
+                if msg['has_keywords'] and msg['timestamp']:
+                    self.channels[channel]['keyword_times'].append(msg['timestamp'])
+
+        # Sorted per channel, so each incident window is two binary searches
+        for channel_data in self.channels.values():
+            channel_data['keyword_times'].sort()
 
         print(f"✓ Found {len(self.channels)} unique channels")
 
+    def _load_messages_from_db(self) -> List[Dict]:
+        """
+        Messages in the JSON export's shape, with keyword hits from the link
+        analysis keyword index (drone keywords as intel keywords)
+        """
+        engine = LinkAnalysisEngine()
+        try:
+            engine.refresh_keyword_hits()
+        finally:
+            engine.db.close()
+
+        db = SessionLocal()
+        try:
+            forward_counts = db.query(
+                MessageForward.source_message_id.label('message_id'),
+                func.count(MessageForward.id).label('forwards')
+            ).group_by(MessageForward.source_message_id).subquery()
+
+            rows = db.query(
+                TelegramMessage.message_id,
+                TelegramMessage.timestamp,
+                TelegramMessage.text_content,
+                TelegramMessage.views,
+                TelegramChannel.username,
+                TelegramChannel.channel_id,
+                TelegramChannel.title,
+                TelegramMessageKeywords.drone_keywords,
+                TelegramMessageKeywords.location_keywords,
+                forward_counts.c.forwards
+            ).join(
+                TelegramChannel, TelegramChannel.id == TelegramMessage.channel_id
+            ).outerjoin(
+                TelegramMessageKeywords, TelegramMessageKeywords.message_id == TelegramMessage.id
+            ).outerjoin(
+                forward_counts, forward_counts.c.message_id == TelegramMessage.id
+            ).order_by(TelegramMessage.timestamp).yield_per(5000)
+
+            return [
+                {
+                    'message_id': row.message_id,
+                    'channel': row.username or row.channel_id,
+                    'channel_title': row.title,
+                    'post_date': row.timestamp.isoformat() if row.timestamp else None,
+                    'content': row.text_content or '',
+                    'views': row.views or 0,
+                    'forwards': row.forwards or 0,
+                    'intel_keywords': json.loads(row.drone_keywords or '[]'),
+                    'location_keywords': json.loads(row.location_keywords or '[]')
+                }
+                for row in rows
+            ]
+        finally:
+            db.close()
+
     def build_graph(self):
         """Build network graph from messages (Phase 1: Ontology)"""
         print("\n" + "=" * 70)
@@ -250,24 +339,18 @@ class PalantirChannelDiscovery:
         print("PHASE 4: CENTRALITY ANALYSIS (Influence Ranking)")
         print("=" * 70)
 
-        # Build channel-only graph
-        channel_graph = nx.DiGraph()
-
-        for node in self.graph.nodes():
-            if self.graph.nodes[node].get('type') == 'channel':
-                channel_graph.add_node(node)
+        # Build channel-only graph (shared CSR graph + PageRank routine)
+        channel_nodes = [node for node in self.graph.nodes() if self.graph.nodes[node].get('type') == 'channel']
+        channel_edges = {}
 
         for u, v, data in self.graph.edges(data=True):
             if (self.graph.nodes.get(u, {}).get('type') == 'channel' and
                 self.graph.nodes.get(v, {}).get('type') == 'channel'):
-                channel_graph.add_edge(u, v, weight=data.get('weight', 1))
+                channel_edges[(u, v)] = data.get('weight', 1)
 
         # Calculate PageRank
-        try:
-            pagerank = nx.pagerank(channel_graph, weight='weight')
-        except:
-            # Fallback if graph is not connected
-            pagerank = {ch: 1/len(channel_graph) for ch in channel_graph.nodes()}
+        channel_graph = ChannelGraph(channel_nodes, channel_edges)
+        pagerank = dict(zip(channel_graph.nodes, compute_pagerank(channel_graph)))
 
         # Sort by influence
         sorted_channels = sorted(pagerank.items(), key=lambda x: x[1], reverse=True)
@@ -289,7 +372,10 @@ class PalantirChannelDiscovery:
         print("=" * 70)
 
         db = SessionLocal()
-        incidents = db.query(Incident).all()
+        incident_times = [
+            datetime.combine(sighting_date, datetime.min.time())
+            for (sighting_date,) in db.query(Incident.sighting_date).filter(Incident.sighting_date.isnot(None))
+        ]
         db.close()
 
         scored_channels = []
@@ -310,7 +396,7 @@ class PalantirChannelDiscovery:
             network_score = min(centrality * 10000, 100)  # Normalize
 
             # Factor 4: Temporal correlation to incidents
-            temporal_score = self._calculate_temporal_correlation(channel_data, incidents)
+            temporal_score = self._calculate_temporal_correlation(channel_data, incident_times)
 
             # Factor 5: Engagement metrics (views, forwards)
             avg_views = channel_data['total_views'] / max(channel_data['message_count'], 1)
@@ -378,28 +464,21 @@ class PalantirChannelDiscovery:
         # 1 hop = 100, 2 hops = 75, 3 hops = 50, 4+ = 25
         return max(0, 100 - (min_distance - 1) * 25)
 
-    def _calculate_temporal_correlation(self, channel_data: Dict, incidents: List) -> float:
+    def _calculate_temporal_correlation(self, channel_data: Dict, incident_times: List[datetime]) -> float:
         """Calculate correlation with known incidents"""
-        if not incidents:
+        if not incident_times:
             return 0
 
+        keyword_times = channel_data['keyword_times']
         correlation_count = 0
 
-        for incident in incidents:
-            incident_time = datetime.combine(incident.sighting_date, datetime.min.time())
-
-            # Count messages within ±48h of incident
-            for msg in channel_data['messages']:
-                try:
-                    msg_time = datetime.fromisoformat(msg['post_date'].replace('Z', '+00:00'))
-                    time_diff = abs((msg_time - incident_time).total_seconds() / 3600)
-
-                    if time_diff <= 48:  # Within 48 hours
-                        # Check for keywords
-                        if msg.get('intel_keywords') or msg.get('location_keywords'):
-                            correlation_count += 1
-                except:
-                    continue
+        # Count keyword messages within ±48h of each incident
+        for incident_time in incident_times:
+            first = bisect_left(keyword_times, incident_time - TEMPORAL_WINDOW)
+            last = bisect_right(keyword_times, incident_time + TEMPORAL_WINDOW)
+            correlation_count += last - first
+            if correlation_count >= 10:
+                break  # Score is capped at 100
 
         # Normalize to 0-100
         return min(correlation_count * 10, 100)
@@ -412,7 +491,7 @@ class PalantirChannelDiscovery:
 
         report = {
             'generated_at': datetime.now().isoformat(),
-            'source_file': self.json_file,
+            'source_file': self.json_file or 'telegram_messages',
             'seed_channels': self.known_threats,
             'total_channels_analyzed': len(self.channels),
             'total_discovered': len(self.discovered_channels),
@@ -513,12 +592,11 @@ class PalantirChannelDiscovery:
 
 
 def main():
-    """Main execution"""
-    json_file = 'telegram_gru_dutch_20251117_084031.json'
+    """Main execution (optional argument: JSON export to analyze instead of the database)"""
+    json_file = sys.argv[1] if len(sys.argv) > 1 else None
 
-    if not os.path.exists(json_file):
+    if json_file and not os.path.exists(json_file):
         print(f"❌ File not found: {json_file}")
-        print("Please ensure the Telegram JSON export is in the current directory.")
         return
 
     # Run discovery
@@ -0,0 +1,282 @@
+"""
+Response Cache
+
+Shared two-tier cache for scraper and API responses (article searches, fact
+checks, ...), replacing one JSON file per key under .cache/:
+
+- Tier 1: in-process LRU (OrderedDict) holding the most recently used
+  entries, so repeated lookups cost a dict access instead of a file open
+  and JSON parse
+- Tier 2: one SQLite key-value table (WAL) shared by all namespaces, so
+  entries survive restarts and are visible to other processes. The file is
+  opened on first use, so creating a cache has no side effects
+- Entries expire after the namespace's TTL; expired rows are removed when
+  read and in bulk when the namespace is trimmed
+- Each namespace is bounded: past `max_entries` rows the least recently
+  used ones are evicted (recency as seen by SQLite; memory-tier hits don't
+  write back)
+- Counters per namespace: memory / disk hits, misses, expirations,
+  writes and evictions
+
+Values must be JSON-serializable.
+
+Usage:
+    from backend.response_cache import ResponseCache
+
+    cache = ResponseCache("articles", ttl_seconds=24 * 3600)
+    articles = cache.get(key)
+    if articles is None:
+        articles = fetch()
+        cache.set(key, articles)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "response_cache.db")
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_MAX_ENTRIES = 10000
+
+# Trim a namespace every max_entries * EVICTION_SLACK writes rather than on every
+# write; in between it can exceed max_entries by up to that many rows
+EVICTION_SLACK = 0.1
+
+
+class _Store:
+    """One SQLite cache file, shared by every namespace that uses it"""
+
+    _stores: Dict[str, "_Store"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, cache_key)
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_lru ON cache_entries (namespace, accessed_at)"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def open(cls, path: str) -> "_Store":
+        key = path if path == ":memory:" else os.path.abspath(path)
+        with cls._stores_lock:
+            if key not in cls._stores:
+                cls._stores[key] = cls(path)
+            return cls._stores[key]
+
+
+class ResponseCache:
+    """In-process LRU over a persistent SQLite table, for one namespace"""
+
+    def __init__(self, namespace: str, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 path: Optional[str] = None):
+        """
+        Args:
+            namespace: Keeps callers' keys apart within the shared file
+            ttl_seconds: Lifetime of an entry from when it was written
+            max_entries: Rows kept in SQLite for this namespace (LRU eviction)
+            memory_entries: Entries kept in the in-process tier
+            path: SQLite file (default RESPONSE_CACHE_PATH or data/response_cache.db)
+        """
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.path = path or os.environ.get("RESPONSE_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self._opened_store: Optional[_Store] = None  # Opened on first use (no file at import time)
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._writes_since_trim = 0
+        self.reset_stats()
+
+    @property
+    def _store(self) -> _Store:
+        if self._opened_store is None:
+            self._opened_store = _Store.open(self.path)
+        return self._opened_store
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    def reset_stats(self):
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0}
+
+    def stats(self) -> Dict:
+        """Hit / miss counters, hit rate and tier sizes"""
+        with self._lock:
+            counters = dict(self._counters)
+            memory_size = len(self._memory)
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        return {
+            "namespace": self.namespace,
+            **counters,
+            "hit_rate": round((counters["memory_hits"] + counters["disk_hits"]) / lookups, 3) if lookups else 0.0,
+            "memory_entries": memory_size,
+            "disk_entries": len(self),
+        }
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value, or `default` when missing or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return entry[1]
+                del self._memory[key]
+
+        store = self._store
+        with store.lock:
+            row = store.conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND cache_key = ?",
+                (self.namespace, key)
+            ).fetchone()
+            if row and row[1] <= now:
+                store.conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?", (self.namespace, key)
+                )
+                store.conn.commit()
+            elif row:
+                store.conn.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND cache_key = ?",
+                    (now, self.namespace, key)
+                )
+                store.conn.commit()
+
+        with self._lock:
+            if not row:
+                self._counters["misses"] += 1
+                return default
+            if row[1] <= now:
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return default
+            value = json.loads(row[0])
+            self._counters["disk_hits"] += 1
+            self._remember(key, row[1], value)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Store `value` in both tiers (replaces any previous entry)"""
+        now = time.time()
+        expires_at = now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        payload = json.dumps(value, ensure_ascii=False)
+
+        store = self._store
+        with store.lock:
+            store.conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, expires_at, now)
+            )
+            store.conn.commit()
+
+        with self._lock:
+            self._counters["writes"] += 1
+            self._remember(key, expires_at, value)
+            self._writes_since_trim += 1
+            trim = self._writes_since_trim >= max(1, int(self.max_entries * EVICTION_SLACK))
+            if trim:
+                self._writes_since_trim = 0
+        if trim:
+            self.trim()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+        store = self._store
+        with store.lock:
+            store.conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?", (self.namespace, key)
+            )
+            store.conn.commit()
+
+    def clear(self):
+        """Drop every entry of this namespace"""
+        with self._lock:
+            self._memory.clear()
+        store = self._store
+        with store.lock:
+            store.conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+            store.conn.commit()
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        """Put an entry in the memory tier, evicting the least recently used (lock held)"""
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def trim(self) -> int:
+        """
+        Remove expired rows, then the least recently used ones past max_entries
+
+        Returns: rows evicted for size (expired rows are counted separately)
+        """
+        store = self._store
+        with store.lock:
+            expired = store.conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                (self.namespace, time.time())
+            ).rowcount
+            count = store.conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+            evicted = 0
+            if count > self.max_entries:
+                evicted = store.conn.execute("""
+                    DELETE FROM cache_entries WHERE namespace = ? AND cache_key IN (
+                        SELECT cache_key FROM cache_entries WHERE namespace = ?
+                        ORDER BY accessed_at LIMIT ?
+                    )
+                """, (self.namespace, self.namespace, count - self.max_entries)).rowcount
+            store.conn.commit()
+
+        with self._lock:
+            self._counters["expired"] += expired
+            self._counters["evictions"] += evicted
+        return evicted
+
+    def __len__(self) -> int:
+        store = self._store
+        with store.lock:
+            return store.conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
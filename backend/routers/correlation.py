@@ -13,6 +13,7 @@ Endpoints:
 - GET /api/correlation/incident/{id} - Get correlations for specific incident
 - GET /api/correlation/alerts - High-confidence correlation alerts
 - GET /api/correlation/social-graph - Channel influence map
+- GET /api/correlation/centrality - Channel PageRank, betweenness and communities
 - GET /api/correlation/coordinated-forwards - Detect coordination
 - POST /api/correlation/linguistic-analysis - Analyze text for suspicious patterns
 - GET /api/correlation/private-leaks - Private channel leaks
@@ -20,6 +21,7 @@ Endpoints:
 
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy import select, union_all, literal, null, func, distinct
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
@@ -27,9 +29,12 @@ from datetime import datetime, timedelta
 from backend.database import get_db
 from backend.models import (
     Incident, IncidentCorrelation, TelegramChannel, TelegramMessage,
-    MessageForward, PrivateChannelLeak
+    MessageForward, PrivateChannelLeak, AviationForumPost
 )
 from backend.incident_correlation_engine import IncidentCorrelationEngine
+from backend.channel_graph import channel_graph_service
+from backend.coordinated_forwards import get_or_run_detection, serialize_events
+from backend.jobs import job_queue, register_job
 from backend.linguistic_fingerprint_detector import LinguisticFingerprintDetector
 
 router = APIRouter()
@@ -38,6 +43,7 @@ router = APIRouter()
 class CorrelationAnalysisRequest(BaseModel):
     incident_limit: Optional[int] = None
     time_window_hours: Optional[int] = 24
+    full: bool = False  # True = re-analyze all incidents, False = only new incidents/messages
 
 
 class LinguisticAnalysisRequest(BaseModel):
@@ -57,20 +63,35 @@ async def run_correlation_analysis(
     - Forum discussions correlated with incidents
     - Statistical anomalies (z-score based)
 
-    Returns summary of detected correlations
+    By default only new incidents and incidents near newly ingested messages
+    are analyzed; set `full` to re-analyze everything.
+
+    Runs as a background job; poll /api/jobs/{job_id} and fetch
+    /api/jobs/{job_id}/result for the summary of detected correlations
     """
-    engine = IncidentCorrelationEngine(
-        db=db,
-        time_window_hours=request.time_window_hours or 24
-    )
+    return job_queue.submit(db, "correlation.analyze", {
+        "incident_limit": request.incident_limit,
+        "time_window_hours": request.time_window_hours or 24,
+        "full": request.full
+    })
+
 
-    results = engine.analyze_all_incidents(limit=request.incident_limit)
+@register_job("correlation.analyze", data_models=[Incident, TelegramMessage, AviationForumPost])
+def run_correlation_job(db: Session, params: Dict, report_progress) -> Dict:
+    engine = IncidentCorrelationEngine(db=db, time_window_hours=params["time_window_hours"])
+
+    results = engine.analyze_all_incidents(
+        limit=params["incident_limit"],
+        full=params["full"],
+        progress_callback=report_progress
+    )
 
     return {
         "status": "complete",
         "analysis_timestamp": datetime.now().isoformat(),
+        "mode": results["mode"],
         "results": results,
-        "time_window_hours": request.time_window_hours or 24
+        "time_window_hours": params["time_window_hours"]
     }
 
 
@@ -185,154 +206,263 @@ async def get_correlation_alerts(
 @router.get("/social-graph")
 async def get_social_graph(
     limit: int = Query(50, ge=1, le=200),
+    min_weight: int = Query(1, ge=1, description="Only return edges with at least this many forwards"),
+    max_edges: int = Query(500, ge=1, le=10000),
     db: Session = Depends(get_db)
 ):
     """
     Get channel influence map (social graph)
 
+    Args:
+        limit: Number of channels to return, most influential first
+        min_weight: Minimum forward count for a (source, target) edge
+        max_edges: Maximum edges to return, heaviest first
+
     Returns:
     - Channel influence scores
-    - Forward relationships
+    - Forward relationships collapsed into weighted edges
     - Network metrics
     """
-    channels = db.query(TelegramChannel).limit(limit).all()
-
-    nodes = []
-    edges = []
-
-    for channel in channels:
-        # Calculate influence metrics
-        outgoing_forwards = db.query(MessageForward).filter(
-            MessageForward.source_channel_id == channel.id
-        ).count()
-
-        incoming_forwards = db.query(MessageForward).filter(
-            MessageForward.destination_channel_id == channel.id
-        ).count()
-
-        unique_destinations = db.query(MessageForward.destination_channel_id).filter(
-            MessageForward.source_channel_id == channel.id
-        ).distinct().count()
-
-        influence_score = outgoing_forwards * (unique_destinations or 1)
-
-        nodes.append({
+    # Node metrics: one grouped pass over forwards, counting each forward once
+    # for its source (outgoing) and once for its destination (incoming)
+    forward_ends = union_all(
+        select(
+            MessageForward.source_channel_id.label("channel_id"),
+            literal(1).label("outgoing"),
+            literal(0).label("incoming"),
+            MessageForward.destination_channel_id.label("destination_id")
+        ),
+        select(
+            MessageForward.destination_channel_id.label("channel_id"),
+            literal(0).label("outgoing"),
+            literal(1).label("incoming"),
+            null().label("destination_id")
+        )
+    ).subquery()
+
+    metrics = select(
+        forward_ends.c.channel_id,
+        func.sum(forward_ends.c.outgoing).label("outgoing_forwards"),
+        func.sum(forward_ends.c.incoming).label("incoming_forwards"),
+        func.count(distinct(forward_ends.c.destination_id)).label("unique_destinations")
+    ).group_by(forward_ends.c.channel_id).subquery()
+
+    outgoing_forwards = func.coalesce(metrics.c.outgoing_forwards, 0)
+    incoming_forwards = func.coalesce(metrics.c.incoming_forwards, 0)
+    unique_destinations = func.coalesce(metrics.c.unique_destinations, 0)
+    influence_score = outgoing_forwards * func.max(unique_destinations, 1)
+
+    rows = db.query(
+        TelegramChannel,
+        outgoing_forwards,
+        incoming_forwards,
+        unique_destinations,
+        influence_score
+    ).outerjoin(
+        metrics, metrics.c.channel_id == TelegramChannel.id
+    ).order_by(influence_score.desc(), TelegramChannel.id).limit(limit).all()
+
+    nodes = [
+        {
             "id": channel.id,
             "username": channel.username or channel.channel_id,
             "title": channel.title,
             "member_count": channel.member_count or 0,
             "risk_score": channel.risk_score,
-            "influence_score": influence_score,
-            "outgoing_forwards": outgoing_forwards,
-            "incoming_forwards": incoming_forwards,
-            "unique_destinations": unique_destinations
-        })
-
-    # Get forward relationships (edges)
-    forwards = db.query(MessageForward).limit(500).all()
-
-    for forward in forwards:
-        edges.append({
-            "source": forward.source_channel_id,
-            "target": forward.destination_channel_id,
-            "velocity_seconds": forward.forward_velocity_seconds,
-            "timestamp": forward.forward_timestamp.isoformat()
-        })
-
-    # Sort nodes by influence
-    nodes.sort(key=lambda x: x["influence_score"], reverse=True)
+            "influence_score": influence,
+            "outgoing_forwards": outgoing,
+            "incoming_forwards": incoming,
+            "unique_destinations": destinations
+        }
+        for channel, outgoing, incoming, destinations, influence in rows
+    ]
+
+    # Edges: forwards collapsed per (source, destination) pair. The median
+    # velocity averages the middle one or two velocities of each pair,
+    # ranked with a window function.
+    ranked_velocities = select(
+        MessageForward.source_channel_id,
+        MessageForward.destination_channel_id,
+        MessageForward.forward_velocity_seconds.label("velocity"),
+        func.row_number().over(
+            partition_by=(MessageForward.source_channel_id, MessageForward.destination_channel_id),
+            order_by=MessageForward.forward_velocity_seconds
+        ).label("position"),
+        func.count().over(
+            partition_by=(MessageForward.source_channel_id, MessageForward.destination_channel_id)
+        ).label("timed_count")
+    ).where(MessageForward.forward_velocity_seconds.isnot(None)).subquery()
+
+    median_velocities = select(
+        ranked_velocities.c.source_channel_id,
+        ranked_velocities.c.destination_channel_id,
+        func.avg(ranked_velocities.c.velocity).label("median_velocity")
+    ).where(
+        ranked_velocities.c.position.in_([
+            (ranked_velocities.c.timed_count + 1) // 2,
+            (ranked_velocities.c.timed_count + 2) // 2
+        ])
+    ).group_by(
+        ranked_velocities.c.source_channel_id,
+        ranked_velocities.c.destination_channel_id
+    ).subquery()
+
+    edge_counts = select(
+        MessageForward.source_channel_id,
+        MessageForward.destination_channel_id,
+        func.count(MessageForward.id).label("weight"),
+        func.min(MessageForward.forward_timestamp).label("first_forward"),
+        func.max(MessageForward.forward_timestamp).label("last_forward")
+    ).group_by(
+        MessageForward.source_channel_id,
+        MessageForward.destination_channel_id
+    ).having(func.count(MessageForward.id) >= min_weight).subquery()
+
+    edge_rows = db.execute(
+        select(
+            edge_counts,
+            median_velocities.c.median_velocity
+        ).outerjoin(
+            median_velocities,
+            (median_velocities.c.source_channel_id == edge_counts.c.source_channel_id)
+            & (median_velocities.c.destination_channel_id == edge_counts.c.destination_channel_id)
+        ).order_by(
+            edge_counts.c.weight.desc(),
+            edge_counts.c.source_channel_id,
+            edge_counts.c.destination_channel_id
+        ).limit(max_edges)
+    ).all()
+
+    edges = [
+        {
+            "source": edge.source_channel_id,
+            "target": edge.destination_channel_id,
+            "weight": edge.weight,
+            "median_velocity_seconds": edge.median_velocity,
+            "first_forward": edge.first_forward.isoformat() if edge.first_forward else None,
+            "last_forward": edge.last_forward.isoformat() if edge.last_forward else None
+        }
+        for edge in edge_rows
+    ]
 
     return {
         "node_count": len(nodes),
         "edge_count": len(edges),
+        "min_weight": min_weight,
         "nodes": nodes,
         "edges": edges,
         "generated_at": datetime.now().isoformat()
     }
 
 
+@router.get("/centrality")
+def get_channel_centrality(
+    limit: int = Query(50, ge=1, le=500),
+    sort_by: str = Query("pagerank", pattern="^(pagerank|betweenness|degree)$"),
+    refresh: bool = Query(False, description="Recompute even if links and forwards are unchanged"),
+    db: Session = Depends(get_db)
+):
+    """
+    Channel centrality over the combined mention + forward graph
+
+    Scores are computed in memory and cached until intelligence links,
+    forwards or channels change. A plain `def` endpoint, so recomputation
+    runs in the threadpool instead of blocking the event loop.
+
+    Args:
+        limit: Number of channels to return, highest `sort_by` first
+        sort_by: pagerank, betweenness (sampled approximation) or degree
+        refresh: Force recomputation
+
+    Returns:
+    - Channels with PageRank, betweenness, in/out degree and community
+    - Communities (2+ channels), largest first
+    """
+    analysis = channel_graph_service.analysis(db, refresh=refresh)
+    scores = analysis["channels"]
+
+    def sort_key(channel_id):
+        score = scores[channel_id]
+        if sort_by == "degree":
+            return score["in_degree"] + score["out_degree"]
+        return score[sort_by]
+
+    top_ids = sorted(scores, key=lambda channel_id: (-sort_key(channel_id), channel_id))[:limit]
+    community_ids = [channel_id for community in analysis["communities"] for channel_id in community]
+    channels = {
+        channel.id: channel
+        for channel in db.query(TelegramChannel).filter(
+            TelegramChannel.id.in_(set(top_ids) | set(community_ids))
+        ).all()
+    } if scores else {}
+
+    def label(channel_id):
+        channel = channels.get(channel_id)
+        return (channel.username or channel.channel_id) if channel else str(channel_id)
+
+    return {
+        "node_count": analysis["node_count"],
+        "edge_count": analysis["edge_count"],
+        "sort_by": sort_by,
+        "channels": [
+            {
+                "id": channel_id,
+                "username": label(channel_id),
+                "title": channels[channel_id].title if channel_id in channels else None,
+                "pagerank": round(scores[channel_id]["pagerank"], 6),
+                "betweenness": round(scores[channel_id]["betweenness"], 6),
+                "in_degree": scores[channel_id]["in_degree"],
+                "out_degree": scores[channel_id]["out_degree"],
+                "community": scores[channel_id]["community"]
+            }
+            for channel_id in top_ids
+        ],
+        "communities": [
+            {
+                "community": number,
+                "size": len(community),
+                "channels": [
+                    label(channel_id)
+                    for channel_id in sorted(community, key=lambda channel_id: -scores[channel_id]["pagerank"])
+                ]
+            }
+            for number, community in enumerate(analysis["communities"])
+        ],
+        "cached": analysis["cached"],
+        "computed_at": analysis["computed_at"].isoformat()
+    }
+
+
 @router.get("/coordinated-forwards")
 async def get_coordinated_forwards(
     time_window_minutes: int = Query(30, ge=5, le=360),
     min_channels: int = Query(5, ge=3, le=50),
+    refresh: bool = Query(False, description="Re-run detection even if no new forwards arrived"),
     db: Session = Depends(get_db)
 ):
     """
     Detect coordinated forwarding events
 
-    Finds cases where same message is forwarded to N+ channels within time window
+    Finds the densest burst of forwards of the same message to N+ channels
+    within the time window (late stragglers don't hide a burst). Results are
+    precomputed and only re-detected when new forwards arrive.
 
     Args:
         time_window_minutes: Time window for detecting coordination (default: 30)
         min_channels: Minimum channels to flag as coordinated (default: 5)
+        refresh: Force a new detection run
 
     Returns coordinated forwarding events
     """
-    from collections import defaultdict
-
-    # Group forwards by source message
-    forwards = db.query(MessageForward).order_by(MessageForward.forward_timestamp).all()
-
-    source_message_forwards = defaultdict(list)
-    for forward in forwards:
-        source_message_forwards[forward.source_message_id].append(forward)
-
-    coordinated_events = []
-
-    for source_msg_id, forward_list in source_message_forwards.items():
-        if len(forward_list) < min_channels:
-            continue
-
-        # Sort by timestamp
-        forward_list.sort(key=lambda f: f.forward_timestamp)
-
-        # Check if all forwards happened within time window
-        first_forward = forward_list[0].forward_timestamp
-        last_forward = forward_list[-1].forward_timestamp
-        time_diff_minutes = (last_forward - first_forward).total_seconds() / 60
-
-        if time_diff_minutes <= time_window_minutes:
-            # Get source message
-            source_msg = db.query(TelegramMessage).filter(
-                TelegramMessage.id == source_msg_id
-            ).first()
-
-            if not source_msg:
-                continue
-
-            # Get destination channels
-            dest_channels = []
-            for fwd in forward_list:
-                channel = db.query(TelegramChannel).filter(
-                    TelegramChannel.id == fwd.destination_channel_id
-                ).first()
-                if channel:
-                    dest_channels.append({
-                        "username": channel.username,
-                        "title": channel.title
-                    })
-
-            coordinated_events.append({
-                "source_message_id": source_msg_id,
-                "message_preview": source_msg.text_content[:200] if source_msg.text_content else "",
-                "message_timestamp": source_msg.timestamp.isoformat(),
-                "destination_count": len(forward_list),
-                "destination_channels": dest_channels,
-                "time_window_minutes": round(time_diff_minutes, 1),
-                "first_forward": first_forward.isoformat(),
-                "last_forward": last_forward.isoformat(),
-                "coordination_score": min(len(forward_list) / time_window_minutes, 10.0) # Speed score
-            })
-
-    # Sort by coordination score
-    coordinated_events.sort(key=lambda x: x["coordination_score"], reverse=True)
+    run = get_or_run_detection(db, time_window_minutes, min_channels, refresh=refresh)
+    coordinated_events = serialize_events(db, run)
 
     return {
         "events_detected": len(coordinated_events),
         "time_window_minutes": time_window_minutes,
         "min_channels_threshold": min_channels,
         "coordinated_events": coordinated_events,
-        "detected_at": datetime.now().isoformat()
+        "detected_at": run.detected_at.isoformat()
     }
 
 
@@ -381,8 +511,15 @@ async def batch_linguistic_analysis(
         limit: Number of messages to analyze
         min_score: Minimum suspicion score to return
 
-    Returns suspicious messages with analysis
+    Runs as a background job; the job result holds the suspicious messages
+    with analysis
     """
+    return job_queue.submit(db, "correlation.linguistic_batch", {"limit": limit, "min_score": min_score})
+
+
+@register_job("correlation.linguistic_batch", data_models=[TelegramMessage])
+def run_linguistic_batch_job(db: Session, params: Dict, report_progress) -> Dict:
+    limit, min_score = params["limit"], params["min_score"]
     detector = LinguisticFingerprintDetector()
 
     suspicious_messages = detector.analyze_messages_batch(db, limit=limit)
@@ -5,6 +5,7 @@ from datetime import datetime
 from pydantic import BaseModel
 from typing import Optional
 from backend.database import get_db
+from backend.pagination import paginate, count_cache
 from backend.models import DroneType, Incident
 
 router = APIRouter()
@@ -56,7 +57,8 @@ async def list_drone_types(
     limit: int = Query(100, ge=1, le=1000),
     country: Optional[str] = None,
     payload_type: Optional[str] = None,
-    order_by: str = "model"
+    order_by: str = "model",
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (replaces skip)")
 ):
     """List all drone types"""
     query = db.query(DroneType)
@@ -66,25 +68,33 @@ async def list_drone_types(
     if payload_type:
         query = query.filter(DroneType.payload_type == payload_type)
 
-    if order_by == "model":
-        query = query.order_by(DroneType.model)
-    elif order_by == "incidents":
+    total = count_cache.count(query, "drone_types")
+
+    if order_by == "incidents":
+        if cursor:
+            raise HTTPException(status_code=400, detail="Cursor pagination is not supported for order_by=incidents")
         # Join with incidents to count
         query = query.outerjoin(Incident).group_by(DroneType.id).order_by(
             func.count(Incident.id).desc()
         )
-    elif order_by == "cost":
-        query = query.order_by(DroneType.estimated_cost_usd.desc())
-    elif order_by == "difficulty":
-        query = query.order_by(DroneType.difficulty_intercept.desc())
-
-    total = query.count()
-    drone_types = query.offset(skip).limit(limit).all()
+        drone_types = query.offset(skip).limit(limit).all()
+        next_cursor = None
+    else:
+        sort_keys = {
+            "model": (DroneType.model, False),
+            "cost": (DroneType.estimated_cost_usd, True),
+            "difficulty": (DroneType.difficulty_intercept, True),
+        }
+        sort_column, descending = sort_keys.get(order_by, sort_keys["model"])
+        drone_types, next_cursor = paginate(
+            query, sort_column, DroneType.id, descending, limit, cursor=cursor, skip=skip
+        )
 
     return {
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "drone_types": drone_types
     }
 
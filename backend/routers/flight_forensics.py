@@ -5,10 +5,13 @@ Post-incident flight analysis + Shodan infrastructure scanning
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from backend.database import get_db
+from backend.jobs import job_queue, register_job
+from backend.models import Incident
 from backend.post_incident_flight_analysis import PostIncidentFlightAnalyzer
 from backend.shodan_launch_zone_scanner import LaunchZoneShodanScanner
 import sys
 import os
+from datetime import timedelta
 
 # Add backend to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
@@ -16,23 +19,28 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 router = APIRouter()
 
 @router.get("/incident/{incident_id}")
-async def get_incident_flight_analysis(incident_id: int):
+async def get_incident_flight_analysis(incident_id: int, db: Session = Depends(get_db)):
     """
-    Get post-incident flight forensics analysis
+    Get post-incident flight forensics analysis (background job)
     Includes launch zone, maritime correlation, recommendations
+
+    Returns a job; poll /api/jobs/{job_id} and fetch /api/jobs/{job_id}/result
     """
-    analyzer = PostIncidentFlightAnalyzer()
+    if not db.query(Incident.id).filter(Incident.id == incident_id).first():
+        raise HTTPException(status_code=404, detail="Incident not found")
 
-    try:
-        analysis = analyzer.analyze_incident(incident_id)
+    return job_queue.submit(db, "flight_forensics.incident", {"incident_id": incident_id})
 
-        if "error" in analysis:
-            raise HTTPException(status_code=404, detail=analysis["error"])
+# Flight data comes from live APIs, so cached analyses expire even without incident changes
+@register_job("flight_forensics.incident", data_models=[Incident], max_age=timedelta(hours=6))
+def run_flight_analysis(db: Session, params: dict, report_progress) -> dict:
+    analyzer = PostIncidentFlightAnalyzer()
+    analysis = analyzer.analyze_incident(params["incident_id"])
 
-        return analysis
+    if "error" in analysis:
+        raise ValueError(analysis["error"])
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return analysis
 
 @router.get("/launch-zone/{incident_id}")
 async def get_launch_zone_only(incident_id: int):
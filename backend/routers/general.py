@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from datetime import datetime, timedelta
+from datetime import datetime
 from backend.database import get_db
-from backend.models import Incident, Intervention, DroneType, RestrictedArea, Pattern
+from backend.stats_snapshot import stats_snapshot
 
 router = APIRouter()
 
@@ -24,99 +23,10 @@ async def get_stats(
     """
     Get dashboard statistics.
 
+    Served from an in-memory snapshot kept current on incident/intervention
+    writes (see backend/stats_snapshot.py).
+
     Args:
         days: Time window for 'recent' incidents (default: 60, max: 365)
     """
-
-    # Total counts (exclude duplicates and false positives)
-    total_incidents = db.query(Incident).filter(
-        or_(
-            Incident.operational_class.is_(None),
-            Incident.operational_class == 'MERGED_MASTER'
-        )
-    ).count()
-    total_interventions = db.query(Intervention).count()
-    total_patterns = db.query(Pattern).count()
-    total_restricted_areas = db.query(RestrictedArea).count()
-    total_drone_types = db.query(DroneType).count()
-
-    # Recent incidents (configurable days, exclude duplicates and false positives)
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
-    recent_incidents = db.query(Incident).filter(
-        Incident.report_date >= cutoff_date,
-        or_(
-            Incident.operational_class.is_(None),
-            Incident.operational_class == 'MERGED_MASTER'
-        )
-    ).count()
-
-    # Intervention success rate
-    successful_interventions = db.query(Intervention).filter(
-        Intervention.outcome == "success"
-    ).count()
-    intervention_success_rate = (
-        (successful_interventions / total_interventions * 100)
-        if total_interventions > 0 else 0
-    )
-
-    # Most common drone types in incidents
-    most_common_drones = db.query(
-        DroneType.model,
-        func.count(Incident.id).label("count")
-    ).join(Incident).group_by(DroneType.id).order_by(
-        func.count(Incident.id).desc()
-    ).limit(5).all()
-
-    # Most targeted restricted areas
-    most_targeted_areas = db.query(
-        RestrictedArea.name,
-        RestrictedArea.country,
-        func.count(Incident.id).label("count")
-    ).join(Incident).group_by(RestrictedArea.id).order_by(
-        func.count(Incident.id).desc()
-    ).limit(5).all()
-
-    # Intervention types breakdown
-    intervention_breakdown = db.query(
-        Intervention.intervention_type,
-        func.count(Intervention.id).label("count")
-    ).group_by(Intervention.intervention_type).all()
-
-    # Suspected operators/purposes
-    purpose_breakdown = db.query(
-        Incident.purpose_assessment,
-        func.count(Incident.id).label("count")
-    ).filter(Incident.purpose_assessment.isnot(None)).group_by(
-        Incident.purpose_assessment
-    ).all()
-
-    return {
-        "timestamp": datetime.utcnow().isoformat(),
-        "time_window_days": days,
-        "cutoff_date": cutoff_date.isoformat(),
-        "summary": {
-            "total_incidents": total_incidents,
-            f"recent_incidents_{days}d": recent_incidents,
-            "total_interventions": total_interventions,
-            "intervention_success_rate": round(intervention_success_rate, 1),
-            "total_patterns": total_patterns,
-            "restricted_areas": total_restricted_areas,
-            "drone_types_tracked": total_drone_types,
-        },
-        "top_drone_types": [
-            {"model": model, "incidents": count}
-            for model, count in most_common_drones
-        ],
-        "top_targeted_areas": [
-            {"name": name, "country": country, "incidents": count}
-            for name, country, count in most_targeted_areas
-        ],
-        "interventions_by_type": [
-            {"type": itype, "count": count}
-            for itype, count in intervention_breakdown
-        ],
-        "purposes_detected": [
-            {"purpose": purpose, "count": count}
-            for purpose, count in purpose_breakdown
-        ]
-    }
+    return stats_snapshot.get(db, days)
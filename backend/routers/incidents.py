@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, func
 from datetime import datetime, date, timedelta
 from pydantic import BaseModel
@@ -7,45 +7,16 @@ from typing import Optional, List
 from backend.database import get_db
 from backend.models import Incident, RestrictedArea, DroneType
 from backend.trusted_sources import validate_source_url, is_source_blocked, get_trusted_sources_for_country
+from backend.pagination import paginate, count_cache
+from backend.link_health import link_checker
+from backend.spatial_index import incidents_within_radius, incidents_in_bbox
+from backend.duplicate_index import flag_duplicates
 import json
 import urllib.parse
 import re
 
 router = APIRouter()
 
-def detect_country_from_text(text: str) -> Optional[str]:
-    """
-    Detect country code from text (title or location name).
-    Returns country code (e.g., 'NL', 'BE', 'DE') or None.
-    """
-    if not text:
-        return None
-
-    text_lower = text.lower()
-
-    # Country keywords mapping
-    country_keywords = {
-        'NL': ['netherlands', 'dutch', 'amsterdam', 'rotterdam', 'schiphol', 'volkel', 'holland', 'eindhoven', 'utrecht'],
-        'BE': ['belgium', 'belgian', 'brussels', 'zaventem', 'antwerp', 'bruges', 'flanders'],
-        'DE': ['germany', 'german', 'berlin', 'munich', 'hamburg', 'frankfurt', 'cologne', 'brunsbüttel'],
-        'FR': ['france', 'french', 'paris', 'lyon', 'marseille', 'toulouse', 'nice'],
-        'UK': ['united kingdom', 'british', 'london', 'manchester', 'birmingham', 'scotland', 'wales'],
-        'EE': ['estonia', 'estonian', 'tallinn', 'reedo'],
-        'LV': ['latvia', 'latvian', 'riga'],
-        'LT': ['lithuania', 'lithuanian', 'vilnius'],
-        'PL': ['poland', 'polish', 'warsaw', 'krakow'],
-        'IT': ['italy', 'italian', 'rome', 'milan'],
-        'ES': ['spain', 'spanish', 'madrid', 'barcelona'],
-    }
-
-    # Check each country's keywords
-    for country_code, keywords in country_keywords.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                return country_code
-
-    return None
-
 def get_display_source(incident: Incident) -> str:
     """
     Determine which source to display, prioritizing Senhive as primary sensor.
@@ -153,10 +124,15 @@ async def list_incidents(
     country: Optional[str] = None,
     drone_type_id: Optional[int] = None,
     purpose: Optional[str] = None,
-    order_by: str = "recent"
+    order_by: str = "recent",
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (replaces skip)")
 ):
-    """List all incidents with optional filtering"""
-    query = db.query(Incident)
+    """List all incidents with optional filtering (offset or keyset pagination)"""
+    # Areas and drone types come back in the same query (no per-row lookups)
+    query = db.query(Incident).options(
+        joinedload(Incident.restricted_area),
+        joinedload(Incident.drone_type)
+    )
 
     # Filter out duplicates and false positives by default
     query = query.filter(
@@ -175,59 +151,29 @@ async def list_incidents(
     if purpose:
         query = query.filter(Incident.purpose_assessment == purpose)
 
-    # Country filter (through restricted area)
+    # Country filter (resolved country is persisted on write)
     if country:
-        query = query.join(RestrictedArea).filter(
-            RestrictedArea.country == country
-        )
+        query = query.filter(Incident.country == country)
 
-    # Order by
-    if order_by == "recent":
-        query = query.order_by(Incident.sighting_date.desc())
-    elif order_by == "oldest":
-        query = query.order_by(Incident.sighting_date.asc())
-    elif order_by == "confidence":
-        query = query.order_by(Incident.confidence_score.desc())
+    # Order by (id breaks ties so keyset pages are stable)
+    sort_keys = {
+        "recent": (Incident.sighting_date, True),
+        "oldest": (Incident.sighting_date, False),
+        "confidence": (Incident.confidence_score, True),
+    }
+    sort_column, descending = sort_keys.get(order_by, sort_keys["recent"])
 
-    total = query.count()
-    incidents = query.offset(skip).limit(limit).all()
+    total = count_cache.count(query, "incidents")
+    incidents, next_cursor = paginate(
+        query, sort_column, Incident.id, descending, limit, cursor=cursor, skip=skip
+    )
 
     # Add display_source to each incident
     incident_list = []
     for incident in incidents:
-        # Get location name and country from restricted area (with error handling)
-        location_name = None
-        country = None
-        try:
-            if incident.restricted_area_id:
-                restricted_area = db.query(RestrictedArea).filter(RestrictedArea.id == incident.restricted_area_id).first()
-                if restricted_area:
-                    location_name = restricted_area.name
-                    country = restricted_area.country
-        except Exception as e:
-            print(f"Error fetching restricted area: {e}")
-
-        # SMART COUNTRY DETECTION: Override country if we can detect it from title or location
-        # This fixes cases where restricted_area is mismatched (e.g., Dutch incidents linked to Estonian bases)
-        detected_country_from_title = detect_country_from_text(incident.title)
-        detected_country_from_location = detect_country_from_text(location_name)
-
-        # Priority: detected from title > detected from location > restricted_area country
-        if detected_country_from_title:
-            country = detected_country_from_title
-        elif detected_country_from_location:
-            country = detected_country_from_location
-        # Otherwise keep the country from restricted_area (which might be None or wrong)
-
-        # Get drone type name (with error handling)
-        drone_type_name = None
-        try:
-            if incident.drone_type_id:
-                drone_type = db.query(DroneType).filter(DroneType.id == incident.drone_type_id).first()
-                if drone_type:
-                    drone_type_name = drone_type.name
-        except Exception as e:
-            print(f"Error fetching drone type: {e}")
+        restricted_area = incident.restricted_area
+        location_name = restricted_area.name if restricted_area else None
+        drone_type_name = incident.drone_type.model if incident.drone_type else None
 
         incident_dict = {
             "id": incident.id,
@@ -241,7 +187,7 @@ async def list_incidents(
             "drone_characteristics_sources": incident.drone_characteristics_sources,
             "restricted_area_id": incident.restricted_area_id,
             "location_name": location_name,
-            "country": country,
+            "country": incident.country,
             "distance_to_restricted_m": incident.distance_to_restricted_m,
             "duration_minutes": incident.duration_minutes,
             "source": incident.source,
@@ -268,14 +214,13 @@ async def list_incidents(
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "incidents": incident_list
     }
 
 @router.get("/{incident_id}")
 async def get_incident(incident_id: int, db: Session = Depends(get_db)):
-    """Get incident details with source validation"""
-    import requests
-
+    """Get incident details with source validation (cached link status, no network I/O)"""
     incident = db.query(Incident).filter(Incident.id == incident_id).first()
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
@@ -320,44 +265,13 @@ async def get_incident(incident_id: int, db: Session = Depends(get_db)):
 
     # Validate source URL if present
     if incident.source_url:
-        try:
-            # Check if link is working
-            response = requests.head(incident.source_url, timeout=5, allow_redirects=True)
-            source_validation = {
-                "url": incident.source_url,
-                "working": response.status_code < 400,
-                "status_code": response.status_code,
-                "last_checked": datetime.utcnow().isoformat()
-            }
+        # Link status comes from the link_status cache; a stale entry queues a background re-check
+        source_validation = link_checker.get_status(db, incident.source_url)
 
-            # Validate against trust framework
-            country_code = None
-            if incident.restricted_area_id:
-                area = db.query(RestrictedArea).filter(
-                    RestrictedArea.id == incident.restricted_area_id
-                ).first()
-                if area:
-                    country_code = area.country
-
-            trust_validation = validate_source_url(incident.source_url, country_code)
-            source_validation.update(trust_validation)
-
-        except requests.exceptions.Timeout:
-            source_validation = {
-                "url": incident.source_url,
-                "working": False,
-                "error": "TIMEOUT",
-                "status_code": -1,
-                "last_checked": datetime.utcnow().isoformat()
-            }
-        except Exception as e:
-            source_validation = {
-                "url": incident.source_url,
-                "working": False,
-                "error": str(e),
-                "status_code": -1,
-                "last_checked": datetime.utcnow().isoformat()
-            }
+        # Validate against trust framework
+        country_code = incident.restricted_area.country if incident.restricted_area else None
+        trust_validation = validate_source_url(incident.source_url, country_code)
+        source_validation.update(trust_validation)
 
         incident_data["source_validation"] = source_validation
 
@@ -546,6 +460,11 @@ async def create_incident(incident: IncidentCreate, db: Session = Depends(get_db
 
         db_incident = Incident(**incident.dict())
         db.add(db_incident)
+
+        # Write-time duplicate check (flags this incident as DUPLICATE of its master)
+        for match in flag_duplicates(db, [db_incident]):
+            print(f"ℹ New incident is a duplicate of #{match['master_id']} (confidence {match['confidence']})")
+
         db.commit()
         db.refresh(db_incident)
         return db_incident
@@ -622,28 +541,31 @@ async def get_incidents_near_area(
     if not area:
         raise HTTPException(status_code=404, detail="Restricted area not found")
 
-    # Simple distance calculation (for SQLite)
-    # In production, use PostGIS for better geospatial queries
-    incidents = db.query(Incident).all()
-    nearby = []
-
-    for inc in incidents:
-        # Haversine formula simplified
-        lat1, lon1 = area.latitude, area.longitude
-        lat2, lon2 = inc.latitude, inc.longitude
-
-        # Approximate distance in km
-        dx = (lon2 - lon1) * 111
-        dy = (lat2 - lat1) * 111
-        distance_km = (dx**2 + dy**2)**0.5
-
-        if distance_km <= radius_km:
-            nearby.append({
-                "incident": inc,
-                "distance_km": round(distance_km, 2)
-            })
+    # R*Tree candidate lookup + haversine refinement (see backend/spatial_index.py)
+    nearby = incidents_within_radius(db, area.latitude, area.longitude, radius_km)
 
-    return sorted(nearby, key=lambda x: x["distance_km"])
+    return [
+        {"incident": inc, "distance_km": inc.pop("distance_km")}
+        for inc in nearby
+    ]
+
+@router.get("/spatial/bbox")
+async def get_incidents_in_bbox(
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lon: float = Query(..., ge=-180, le=180),
+    db: Session = Depends(get_db)
+):
+    """Get incidents inside a map viewport (bounding box)"""
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=400, detail="min_lat/min_lon must not exceed max_lat/max_lon")
+
+    incidents = incidents_in_bbox(db, min_lat, max_lat, min_lon, max_lon)
+    return {
+        "total": len(incidents),
+        "incidents": incidents
+    }
 
 @router.get("/analysis/by-purpose")
 async def get_incidents_by_purpose(db: Session = Depends(get_db)):
@@ -691,9 +613,7 @@ async def get_monthly_timeline(
     """Get incident timeline by month"""
     query = db.query(Incident)
     if country:
-        query = query.join(RestrictedArea).filter(
-            RestrictedArea.country == country
-        )
+        query = query.filter(Incident.country == country)
 
     # Group by year-month
     from sqlalchemy import func as sql_func
@@ -54,12 +54,13 @@ async def search_articles_by_keyword(
     query: str = Query(..., min_length=3, alias="query"),
     country: Optional[str] = "NL",
     limit: int = Query(10, ge=1, le=50),
-    language: Optional[str] = "en"
+    language: Optional[str] = None
 ):
     """
     Search for articles by keyword.
 
-    Returns articles from trusted sources containing the keyword.
+    Returns articles from trusted sources containing the keyword
+    (optionally only feed articles in `language`).
     """
     scraper = get_article_scraper()
 
@@ -67,7 +68,8 @@ async def search_articles_by_keyword(
         incident_title=query,
         country=country,
         limit=limit,
-        use_cache=True
+        use_cache=True,
+        language=language
     )
 
     analyzer = get_sentiment_analyzer()
@@ -90,7 +92,9 @@ async def search_articles_by_keyword(
         "country": country,
         "articles_found": len(articles_with_analysis),
         "articles": articles_with_analysis,
-        "search_date": datetime.utcnow().isoformat()
+        "search_date": datetime.utcnow().isoformat(),
+        "feed_index": scraper.feed_index.freshness(),
+        "cache": scraper.cache.stats()
     }
 
 
@@ -151,7 +155,9 @@ async def get_incident_articles(
         "country": country,
         "articles_found": len(articles_with_sentiment),
         "articles": articles_with_sentiment,
-        "search_date": datetime.utcnow().isoformat()
+        "search_date": datetime.utcnow().isoformat(),
+        "feed_index": scraper.feed_index.freshness(),
+        "cache": scraper.cache.stats()
     }
 
 
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+import time
+from backend.cache_sync import track_writes
 from backend.database import get_db
-from backend.models import Intervention, Incident
+from backend.pagination import paginate, count_cache
+from backend.models import Intervention, Incident, DroneType
 
 router = APIRouter()
 
@@ -31,7 +34,8 @@ async def list_interventions(
     limit: int = Query(100, ge=1, le=1000),
     intervention_type: Optional[str] = None,
     outcome: Optional[str] = None,
-    order_by: str = "recent"
+    order_by: str = "recent",
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (replaces skip)")
 ):
     """List all interventions"""
     query = db.query(Intervention)
@@ -41,20 +45,22 @@ async def list_interventions(
     if outcome:
         query = query.filter(Intervention.outcome == outcome)
 
-    if order_by == "recent":
-        query = query.order_by(Intervention.created_at.desc())
-    elif order_by == "response_time":
-        query = query.filter(Intervention.response_time_minutes.isnot(None)).order_by(
-            Intervention.response_time_minutes
-        )
+    if order_by == "response_time":
+        query = query.filter(Intervention.response_time_minutes.isnot(None))
+        sort_column, descending = Intervention.response_time_minutes, False
+    else:
+        sort_column, descending = Intervention.created_at, True
 
-    total = query.count()
-    interventions = query.offset(skip).limit(limit).all()
+    total = count_cache.count(query, "interventions")
+    interventions, next_cursor = paginate(
+        query, sort_column, Intervention.id, descending, limit, cursor=cursor, skip=skip
+    )
 
     return {
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "interventions": interventions
     }
 
@@ -122,50 +128,113 @@ async def delete_intervention(intervention_id: int, db: Session = Depends(get_db
     db.commit()
     return {"deleted": True}
 
-@router.get("/analysis/effectiveness")
-async def intervention_effectiveness(db: Session = Depends(get_db)):
-    """Analyze effectiveness of different intervention types"""
+# Interventions analytics: one grouped scan shared by the analysis endpoints.
+# Rows are grouped down to (type, drone model, response time) buckets with
+# per-outcome counts, which is enough to derive totals, success rates,
+# averages and response-time percentiles without re-reading the table.
+# The cache is dropped whenever a session commits a change to the rows it
+# reads, whichever code path made it.
+ANALYTICS_CACHE_SECONDS = 30
+OUTCOMES = ("success", "partial", "failed", "unknown", "not_attempted")
+# Buckets read interventions plus the incident / drone type they join to
+ANALYTICS_MODELS = (Intervention, Incident, DroneType)
+
+_analytics_cache = {"computed_at": None, "buckets": None}
+
+
+def _scan_interventions(db: Session):
+    """Return cached (type, drone_model, response_time, total, *outcome_counts) buckets"""
+    now = time.monotonic()
+    computed_at = _analytics_cache["computed_at"]
+    if computed_at is not None and now - computed_at < ANALYTICS_CACHE_SECONDS:
+        return _analytics_cache["buckets"]
+
+    outcome_counts = [
+        func.sum(case((Intervention.outcome == outcome, 1), else_=0)).label(outcome)
+        for outcome in OUTCOMES
+    ]
+    buckets = db.query(
+        Intervention.intervention_type,
+        DroneType.model,
+        Intervention.response_time_minutes,
+        func.count(Intervention.id).label("total"),
+        *outcome_counts
+    ).outerjoin(
+        Incident, Intervention.incident_id == Incident.id
+    ).outerjoin(
+        DroneType, Incident.drone_type_id == DroneType.id
+    ).group_by(
+        Intervention.intervention_type,
+        DroneType.model,
+        Intervention.response_time_minutes
+    ).all()
+
+    _analytics_cache["computed_at"] = now
+    _analytics_cache["buckets"] = buckets
+    return buckets
 
-    intervention_types = db.query(Intervention.intervention_type).distinct().all()
-    results = []
 
-    for (itype,) in intervention_types:
-        total = db.query(Intervention).filter(
-            Intervention.intervention_type == itype
-        ).count()
+def _invalidate_analytics():
+    _analytics_cache["computed_at"] = None
 
-        successful = db.query(Intervention).filter(
-            Intervention.intervention_type == itype,
-            Intervention.outcome == "success"
-        ).count()
 
-        partial = db.query(Intervention).filter(
-            Intervention.intervention_type == itype,
-            Intervention.outcome == "partial"
-        ).count()
+# Committed writes to rows the analytics buckets are built from make them stale
+track_writes(
+    "interventions_analytics_writes",
+    lambda obj, deleted: True if isinstance(obj, ANALYTICS_MODELS) else None,
+    on_commit=lambda writes: _invalidate_analytics(),
+)
 
-        failed = db.query(Intervention).filter(
-            Intervention.intervention_type == itype,
-            Intervention.outcome == "failed"
-        ).count()
 
-        avg_response_time = db.query(
-            func.avg(Intervention.response_time_minutes)
-        ).filter(
-            Intervention.intervention_type == itype,
-            Intervention.response_time_minutes.isnot(None)
-        ).scalar() or 0
+def _percentile(histogram: dict, total: int, fraction: float):
+    """Value at sorted position int(total * fraction) of a {value: count} histogram"""
+    if total == 0:
+        return None
+    target = min(int(total * fraction), total - 1)
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen > target:
+            return value
+    return None
+
+
+@router.get("/analysis/effectiveness")
+async def intervention_effectiveness(db: Session = Depends(get_db)):
+    """Analyze effectiveness of different intervention types"""
+
+    by_type = {}
+    for bucket in _scan_interventions(db):
+        stats = by_type.setdefault(bucket.intervention_type, {
+            "total": 0, "success": 0, "partial": 0, "failed": 0, "response_times": {}
+        })
+        stats["total"] += bucket.total
+        stats["success"] += bucket.success
+        stats["partial"] += bucket.partial
+        stats["failed"] += bucket.failed
+        if bucket.response_time_minutes is not None:
+            times = stats["response_times"]
+            times[bucket.response_time_minutes] = times.get(bucket.response_time_minutes, 0) + bucket.total
 
-        success_rate = (successful / total * 100) if total > 0 else 0
+    results = []
+    for itype, stats in by_type.items():
+        total = stats["total"]
+        times = stats["response_times"]
+        timed = sum(times.values())
+        avg_response_time = sum(t * n for t, n in times.items()) / timed if timed else 0
+        success_rate = (stats["success"] / total * 100) if total > 0 else 0
 
         results.append({
             "intervention_type": itype,
             "total": total,
-            "successful": successful,
-            "partial": partial,
-            "failed": failed,
+            "successful": stats["success"],
+            "partial": stats["partial"],
+            "failed": stats["failed"],
             "success_rate": round(success_rate, 1),
-            "avg_response_time_minutes": round(avg_response_time, 1)
+            "avg_response_time_minutes": round(avg_response_time, 1),
+            "p50_response_time_minutes": _percentile(times, timed, 0.5),
+            "p90_response_time_minutes": _percentile(times, timed, 0.9),
+            "p99_response_time_minutes": _percentile(times, timed, 0.99)
         })
 
     return sorted(results, key=lambda x: x["success_rate"], reverse=True)
@@ -174,67 +243,50 @@ async def intervention_effectiveness(db: Session = Depends(get_db)):
 async def response_time_analysis(db: Session = Depends(get_db)):
     """Analyze response times for interventions"""
 
-    interventions = db.query(Intervention).filter(
-        Intervention.response_time_minutes.isnot(None)
-    ).all()
+    times = {}
+    for bucket in _scan_interventions(db):
+        if bucket.response_time_minutes is not None:
+            times[bucket.response_time_minutes] = times.get(bucket.response_time_minutes, 0) + bucket.total
 
-    if not interventions:
+    if not times:
         return {"message": "No intervention response time data available"}
 
-    times = [i.response_time_minutes for i in interventions]
-    times.sort()
-
-    avg = sum(times) / len(times)
-    median = times[len(times) // 2]
-    min_time = min(times)
-    max_time = max(times)
-
-    # Percentiles
-    p10_idx = int(len(times) * 0.1)
-    p90_idx = int(len(times) * 0.9)
+    total = sum(times.values())
+    avg = sum(t * n for t, n in times.items()) / total
 
     return {
-        "total_interventions_tracked": len(times),
+        "total_interventions_tracked": total,
         "average_response_time": round(avg, 1),
-        "median_response_time": median,
-        "min_response_time": min_time,
-        "max_response_time": max_time,
-        "p10_response_time": times[p10_idx],
-        "p90_response_time": times[p90_idx]
+        "median_response_time": _percentile(times, total, 0.5),
+        "min_response_time": min(times),
+        "max_response_time": max(times),
+        "p10_response_time": _percentile(times, total, 0.1),
+        "p90_response_time": _percentile(times, total, 0.9),
+        "p99_response_time": _percentile(times, total, 0.99)
     }
 
 @router.get("/analysis/by-incident-type")
 async def interventions_by_drone_type(db: Session = Depends(get_db)):
     """Analyze intervention effectiveness by drone type"""
 
-    from backend.models import Incident, DroneType
-
-    results = db.query(
-        DroneType.model,
-        Intervention.intervention_type,
-        Intervention.outcome,
-        func.count(Intervention.id).label("count")
-    ).join(Intervention, Intervention.incident_id == Incident.id).join(
-        DroneType, Incident.drone_type_id == DroneType.id
-    ).group_by(
-        DroneType.model,
-        Intervention.intervention_type,
-        Intervention.outcome
-    ).all()
-
-    # Group results
     effectiveness_matrix = {}
-    for model, itype, outcome, count in results:
-        key = f"{model} - {itype}"
+    for bucket in _scan_interventions(db):
+        if bucket.model is None:
+            continue
+        key = f"{bucket.model} - {bucket.intervention_type}"
         if key not in effectiveness_matrix:
             effectiveness_matrix[key] = {
-                "drone_model": model,
-                "intervention_type": itype,
+                "drone_model": bucket.model,
+                "intervention_type": bucket.intervention_type,
                 "success": 0,
                 "partial": 0,
                 "failed": 0,
                 "unknown": 0
             }
-        effectiveness_matrix[key][outcome] = count
+        entry = effectiveness_matrix[key]
+        for outcome in OUTCOMES:
+            count = getattr(bucket, outcome)
+            if count or outcome in entry:
+                entry[outcome] = entry.get(outcome, 0) + count
 
     return list(effectiveness_matrix.values())
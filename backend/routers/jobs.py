@@ -0,0 +1,49 @@
+"""
+Background Job API
+
+Heavy analysis endpoints return a job instead of their result:
+- GET /api/jobs/{job_id} - Status and progress
+- GET /api/jobs/{job_id}/result - Result once the job has succeeded
+"""
+
+import json
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from backend.database import get_db
+from backend.jobs import serialize_job
+from backend.models import Job
+
+router = APIRouter()
+
+
+def _get_job(db: Session, job_id: int) -> Job:
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: int, db: Session = Depends(get_db)):
+    """Get job status and progress"""
+    return serialize_job(_get_job(db, job_id))
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: int, db: Session = Depends(get_db)):
+    """
+    Get the result of a finished job
+
+    Returns 409 while the job is queued or running, and 500 with the job's
+    error message if it failed.
+    """
+    job = _get_job(db, job_id)
+
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error or "Job failed")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    return json.loads(job.result) if job.result else None
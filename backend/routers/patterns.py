@@ -5,7 +5,9 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict
 from datetime import datetime
 from backend.database import get_db
-from backend.models import Pattern, Incident
+from backend.pagination import paginate, count_cache
+from backend.jobs import job_queue, register_job
+from backend.models import Pattern, Incident, RestrictedArea
 
 router = APIRouter()
 
@@ -39,7 +41,8 @@ async def list_patterns(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     pattern_type: Optional[str] = None,
-    order_by: str = "recent"
+    order_by: str = "recent",
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (replaces skip)")
 ):
     """List detected patterns"""
     query = db.query(Pattern)
@@ -47,20 +50,23 @@ async def list_patterns(
     if pattern_type:
         query = query.filter(Pattern.pattern_type == pattern_type)
 
-    if order_by == "recent":
-        query = query.order_by(Pattern.updated_at.desc())
-    elif order_by == "confidence":
-        query = query.order_by(Pattern.confidence_score.desc())
-    elif order_by == "incidents":
-        query = query.order_by(Pattern.incident_count.desc())
+    sort_keys = {
+        "recent": (Pattern.updated_at, True),
+        "confidence": (Pattern.confidence_score, True),
+        "incidents": (Pattern.incident_count, True),
+    }
+    sort_column, descending = sort_keys.get(order_by, sort_keys["recent"])
 
-    total = query.count()
-    patterns = query.offset(skip).limit(limit).all()
+    total = count_cache.count(query, "patterns")
+    patterns, next_cursor = paginate(
+        query, sort_column, Pattern.id, descending, limit, cursor=cursor, skip=skip
+    )
 
     return {
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "patterns": patterns
     }
 
@@ -258,7 +264,16 @@ async def delete_pattern(pattern_id: int, db: Session = Depends(get_db)):
 
 @router.post("/auto-detect")
 async def auto_detect_patterns(db: Session = Depends(get_db)):
-    """Automatically detect patterns from incidents"""
+    """
+    Automatically detect patterns from incidents (background job)
+
+    Returns a job; poll /api/jobs/{job_id} and fetch /api/jobs/{job_id}/result
+    """
+    return job_queue.submit(db, "patterns.auto_detect")
+
+@register_job("patterns.auto_detect", data_models=[Incident, RestrictedArea, Pattern])
+def detect_patterns(db: Session, params: Dict, report_progress) -> Dict:
+    """Detect spatial, drone type and temporal patterns and store new ones"""
     results = []
 
     # Pattern 1: Same location targeted multiple times
@@ -270,7 +285,6 @@ async def auto_detect_patterns(db: Session = Depends(get_db)):
     ).having(func.count(Incident.id) >= 3).all()
 
     for area_id, count in location_patterns:
-        from backend.models import RestrictedArea
         area = db.query(RestrictedArea).filter(
             RestrictedArea.id == area_id
         ).first()
@@ -293,6 +307,8 @@ async def auto_detect_patterns(db: Session = Depends(get_db)):
             db.add(pattern)
             results.append(f"Detected spatial pattern: {area.name} ({count} incidents)")
 
+    report_progress(1 / 3, "Spatial patterns checked")
+
     # Pattern 2: Same drone type used multiple times
     drone_patterns = db.query(
         Incident.drone_description,
@@ -319,6 +335,8 @@ async def auto_detect_patterns(db: Session = Depends(get_db)):
             db.add(pattern)
             results.append(f"Detected drone pattern: {drone_desc} ({count} incidents)")
 
+    report_progress(2 / 3, "Drone type patterns checked")
+
     # Pattern 3: Temporal patterns - coordinated campaigns (incidents with "coordinated" in description)
     from sqlalchemy import cast, Date
     coordinated_incidents = db.query(Incident).filter(
@@ -4,6 +4,7 @@ from sqlalchemy import func
 from pydantic import BaseModel
 from typing import Optional
 from backend.database import get_db
+from backend.pagination import paginate, count_cache
 from backend.models import RestrictedArea, Incident
 
 router = APIRouter()
@@ -35,7 +36,8 @@ async def list_restricted_areas(
     limit: int = Query(100, ge=1, le=1000),
     country: Optional[str] = None,
     area_type: Optional[str] = None,
-    order_by: str = "name"
+    order_by: str = "name",
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (replaces skip)")
 ):
     """List all restricted areas"""
     query = db.query(RestrictedArea)
@@ -45,22 +47,31 @@ async def list_restricted_areas(
     if area_type:
         query = query.filter(RestrictedArea.area_type == area_type)
 
-    if order_by == "name":
-        query = query.order_by(RestrictedArea.name)
-    elif order_by == "threat":
-        query = query.order_by(RestrictedArea.threat_level.desc())
-    elif order_by == "incidents":
+    total = count_cache.count(query, "restricted_areas")
+
+    if order_by == "incidents":
+        if cursor:
+            raise HTTPException(status_code=400, detail="Cursor pagination is not supported for order_by=incidents")
         query = query.outerjoin(Incident).group_by(RestrictedArea.id).order_by(
             func.count(Incident.id).desc()
         )
-
-    total = query.count()
-    areas = query.offset(skip).limit(limit).all()
+        areas = query.offset(skip).limit(limit).all()
+        next_cursor = None
+    else:
+        sort_keys = {
+            "name": (RestrictedArea.name, False),
+            "threat": (RestrictedArea.threat_level, True),
+        }
+        sort_column, descending = sort_keys.get(order_by, sort_keys["name"])
+        areas, next_cursor = paginate(
+            query, sort_column, RestrictedArea.id, descending, limit, cursor=cursor, skip=skip
+        )
 
     return {
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "restricted_areas": areas
     }
 
@@ -144,30 +155,44 @@ async def delete_restricted_area(area_id: int, db: Session = Depends(get_db)):
 
 @router.get("/analysis/threat-matrix")
 async def threat_matrix(db: Session = Depends(get_db)):
-    """Get threat assessment matrix for all areas"""
-    areas = db.query(RestrictedArea).all()
+    """Get threat assessment matrix for all areas (single grouped query)"""
+    # Incident count and average confidence per area
+    area_stats = db.query(
+        Incident.restricted_area_id.label("area_id"),
+        func.count(Incident.id).label("incident_count"),
+        func.avg(Incident.confidence_score).label("avg_confidence")
+    ).group_by(Incident.restricted_area_id).subquery()
+
+    # Most common drone description per area: rank description counts
+    # within each area and keep the top one
+    drone_ranks = db.query(
+        Incident.restricted_area_id.label("area_id"),
+        Incident.drone_description.label("drone_description"),
+        func.row_number().over(
+            partition_by=Incident.restricted_area_id,
+            order_by=(func.count(Incident.id).desc(), Incident.drone_description)
+        ).label("rank")
+    ).group_by(Incident.restricted_area_id, Incident.drone_description).subquery()
+
+    most_common = db.query(
+        drone_ranks.c.area_id,
+        drone_ranks.c.drone_description
+    ).filter(drone_ranks.c.rank == 1).subquery()
+
+    incident_count = func.coalesce(area_stats.c.incident_count, 0)
+    rows = db.query(
+        RestrictedArea,
+        incident_count,
+        area_stats.c.avg_confidence,
+        most_common.c.drone_description
+    ).outerjoin(
+        area_stats, area_stats.c.area_id == RestrictedArea.id
+    ).outerjoin(
+        most_common, most_common.c.area_id == RestrictedArea.id
+    ).order_by(incident_count.desc(), RestrictedArea.id).all()
 
     threat_assessments = []
-    for area in areas:
-        incident_count = db.query(Incident).filter(
-            Incident.restricted_area_id == area.id
-        ).count()
-
-        avg_confidence = db.query(
-            func.avg(Incident.confidence_score)
-        ).filter(
-            Incident.restricted_area_id == area.id
-        ).scalar() or 0
-
-        # Get most common drone type targeting this area
-        most_common_drone = db.query(
-            Incident.drone_description
-        ).filter(
-            Incident.restricted_area_id == area.id
-        ).group_by(Incident.drone_description).order_by(
-            func.count(Incident.id).desc()
-        ).first()
-
+    for area, incident_count, avg_confidence, most_common_drone in rows:
         threat_assessments.append({
             "area_id": area.id,
             "name": area.name,
@@ -175,8 +200,8 @@ async def threat_matrix(db: Session = Depends(get_db)):
             "area_type": area.area_type,
             "threat_level": area.threat_level,
             "incident_count": incident_count,
-            "avg_confidence": round(avg_confidence, 2),
-            "most_common_drone": most_common_drone[0] if most_common_drone else None,
+            "avg_confidence": round(avg_confidence or 0, 2),
+            "most_common_drone": most_common_drone,
             "location": {
                 "latitude": area.latitude,
                 "longitude": area.longitude,
@@ -184,4 +209,4 @@ async def threat_matrix(db: Session = Depends(get_db)):
             }
         })
 
-    return sorted(threat_assessments, key=lambda x: x["incident_count"], reverse=True)
+    return threat_assessments
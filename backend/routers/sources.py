@@ -6,11 +6,15 @@ Endpoints:
 - GET /api/sources/validate - Validate a URL against trust framework
 - GET /api/sources/all-domains - Get all trusted domains
 - GET /api/sources/blocked - Check if URL is blocked
+- GET /api/sources/check-link - Cached link status (refreshed in background)
 """
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List
+from backend.database import get_db
+from backend.link_health import link_checker, STATUS_MEANING
 from backend.trusted_sources import (
     get_trusted_sources_for_country,
     validate_source_url,
@@ -18,8 +22,6 @@ from backend.trusted_sources import (
     get_all_trusted_domains,
     BLOCKED_SOURCES,
 )
-import requests
-from datetime import datetime
 
 router = APIRouter()
 
@@ -70,22 +72,18 @@ async def get_trusted_sources(country: str):
 
 
 @router.post("/validate", response_model=SourceValidationResponse)
-async def validate_source(request: SourceValidationRequest):
+async def validate_source(request: SourceValidationRequest, db: Session = Depends(get_db)):
     """
     Validate a source URL against the trust framework.
 
-    Returns credibility score and validation status.
+    Returns credibility score and validation status. link_working is the
+    cached link status (None until the background checker has seen the URL).
     """
     validation = validate_source_url(request.url, request.country)
 
-    # Try to check if link is actually working
     link_working = None
     if validation["valid"]:
-        try:
-            response = requests.head(request.url, timeout=5, allow_redirects=True)
-            link_working = response.status_code < 400
-        except:
-            link_working = False
+        link_working = link_checker.get_status(db, request.url)["working"]
 
     return SourceValidationResponse(
         url=request.url,
@@ -125,40 +123,23 @@ async def check_if_blocked(url: str = Query(...)):
 
 
 @router.get("/check-link")
-async def check_link_working(url: str = Query(...)):
+async def check_link_working(url: str = Query(...), db: Session = Depends(get_db)):
     """
-    Check if a link is currently working (HTTP HEAD request).
+    Check if a link is working, served from the link_status cache.
+
+    Missing or stale entries are queued for a background HEAD request; poll
+    again to pick up the fresh result.
 
     Returns:
         {
             "url": str,
-            "working": bool,
-            "status_code": int,
-            "last_checked": datetime
+            "working": bool | None,
+            "status_code": int | None,
+            "last_checked": datetime | None,
+            "stale": bool,
+            "refresh_queued": bool
         }
     """
-    try:
-        response = requests.head(url, timeout=5, allow_redirects=True)
-        working = response.status_code < 400
-        status_code = response.status_code
-    except requests.exceptions.Timeout:
-        working = False
-        status_code = -1
-    except requests.exceptions.ConnectionError:
-        working = False
-        status_code = -2
-    except Exception as e:
-        working = False
-        status_code = -3
-
-    return {
-        "url": url,
-        "working": working,
-        "status_code": status_code,
-        "last_checked": datetime.utcnow(),
-        "status_meaning": {
-            -1: "TIMEOUT",
-            -2: "CONNECTION_ERROR",
-            -3: "OTHER_ERROR"
-        }.get(status_code, "")
-    }
+    status = link_checker.get_status(db, url)
+    status["status_meaning"] = STATUS_MEANING.get(status["status_code"], "")
+    return status
@@ -2,22 +2,27 @@
 """
 Scrape Discovered Channels
 Collect messages from Tier 1 and Tier 2 discovered channels
+
+Both tiers are scraped concurrently over one client (Tier 1 first); each run
+only collects messages posted since the previous run.
 """
 
-import os
 import json
 import asyncio
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List
 from dotenv import load_dotenv
-from telethon import TelegramClient
 import sys
 
 load_dotenv()
 
-API_ID = int(os.getenv('TELEGRAM_API_ID'))
-API_HASH = os.getenv('TELEGRAM_API_HASH')
-SESSION_NAME = 'osint_session'
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.telegram_scraper import ScrapeTarget, TelegramScraperEngine, connect_client
+
+SCRAPER_NAME = 'discovered_channels'
+CONCURRENCY = 4
 
 # Tier 1 channels (critical - 200 messages)
 TIER1_CHANNELS = [
@@ -58,84 +63,74 @@ INTEL_KEYWORDS = [
     'reconnaissance', 'surveillance', 'операция'
 ]
 
-async def scrape_channels(channels: List[str], messages_per_channel: int, tier_name: str):
+def channel_messages(scrape) -> List[dict]:
     """
-    Scrape list of channels
+    Message records for the new messages of one scraped channel
     """
-    print(f"\n{'='*70}")
-    print(f"SCRAPING {tier_name}")
-    print('='*70)
-    print(f"Channels: {len(channels)}")
-    print(f"Messages per channel: {messages_per_channel}\n")
-
-    client = TelegramClient(SESSION_NAME, API_ID, API_HASH)
-    await client.connect()
-
-    if not await client.is_user_authorized():
-        print("❌ Not authorized")
-        return []
-
-    all_messages = []
-    total_scraped = 0
-    total_relevant = 0
-
-    for channel_username in channels:
-        print(f"📡 Scraping @{channel_username}...")
-
-        try:
-            entity = await client.get_entity(channel_username)
+    channel_username = scrape.target.username
+    entity = scrape.entity
+    tier_name = scrape.target.label
 
-            # Get messages
-            messages = await client.get_messages(entity, limit=messages_per_channel)
+    records = []
+    relevant_count = 0
 
-            channel_messages = []
-            relevant_count = 0
+    for msg in scrape.messages:
+        if not msg.message:
+            continue
 
-            for msg in messages:
-                if not msg.message:
-                    continue
+        # Check for intel keywords
+        text_lower = msg.message.lower()
+        intel_kw = [kw for kw in INTEL_KEYWORDS if kw.lower() in text_lower]
 
-                # Check for intel keywords
-                text_lower = msg.message.lower()
-                intel_kw = [kw for kw in INTEL_KEYWORDS if kw.lower() in text_lower]
+        records.append({
+            'message_id': msg.id,
+            'channel': channel_username,
+            'channel_title': entity.title if hasattr(entity, 'title') else channel_username,
+            'post_date': msg.date.isoformat(),
+            'content': msg.message,
+            'views': msg.views or 0,
+            'forwards': msg.forwards or 0,
+            'intel_keywords': intel_kw,
+            'tier': tier_name
+        })
 
-                msg_data = {
-                    'message_id': msg.id,
-                    'channel': channel_username,
-                    'channel_title': entity.title if hasattr(entity, 'title') else channel_username,
-                    'post_date': msg.date.isoformat(),
-                    'content': msg.message,
-                    'views': msg.views or 0,
-                    'forwards': msg.forwards or 0,
-                    'intel_keywords': intel_kw,
-                    'tier': tier_name
-                }
+        if intel_kw:
+            relevant_count += 1
 
-                channel_messages.append(msg_data)
+    print(f"   📡 @{channel_username} ({tier_name}): {len(records)} messages, {relevant_count} with intel keywords")
+    return records
 
-                if intel_kw:
-                    relevant_count += 1
 
-            all_messages.extend(channel_messages)
-            total_scraped += len(channel_messages)
-            total_relevant += relevant_count
-
-            print(f"   ✓ {len(channel_messages)} messages, {relevant_count} with intel keywords")
-
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-
-        await asyncio.sleep(2)  # Rate limiting
+async def scrape_all_tiers():
+    """
+    Scrape Tier 1 (up to 200 msgs on first run) and Tier 2 (up to 100) concurrently
 
-    await client.disconnect()
+    Returns: (tier1 messages, tier2 messages, engine) - call
+             engine.commit_watermarks() once the messages are saved
+    """
+    targets = (
+        [ScrapeTarget(channel, priority=1, initial_limit=200, label="TIER 1") for channel in TIER1_CHANNELS] +
+        [ScrapeTarget(channel, priority=2, initial_limit=100, label="TIER 2") for channel in TIER2_CHANNELS]
+    )
+    collected = {"TIER 1": [], "TIER 2": []}
+
+    def collect(scrape):
+        collected[scrape.target.label].extend(channel_messages(scrape))
+
+    try:
+        client = await connect_client()
+    except RuntimeError:
+        print("❌ Not authorized")
+        return [], [], None
 
-    print(f"\n{'='*70}")
-    print(f"{tier_name} COMPLETE")
-    print('='*70)
-    print(f"Total messages: {total_scraped}")
-    print(f"With intel keywords: {total_relevant} ({total_relevant/total_scraped*100:.1f}%)\n")
+    try:
+        engine = TelegramScraperEngine(client, scraper=SCRAPER_NAME, concurrency=CONCURRENCY,
+                                       defer_watermarks=True)
+        await engine.run(targets, collect)
+    finally:
+        await client.disconnect()
 
-    return all_messages
+    return collected["TIER 1"], collected["TIER 2"], engine
 
 
 async def main():
@@ -145,14 +140,16 @@ async def main():
     print("="*70)
     print(f"\nStart time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
-    # Scrape Tier 1
-    tier1_data = await scrape_channels(TIER1_CHANNELS, 200, "TIER 1")
-
-    # Scrape Tier 2
-    tier2_data = await scrape_channels(TIER2_CHANNELS, 100, "TIER 2")
+    # Scrape Tier 1 + Tier 2
+    tier1_data, tier2_data, engine = await scrape_all_tiers()
 
     # Combine
     all_data = tier1_data + tier2_data
+    if not all_data:
+        if engine:
+            engine.commit_watermarks()
+        print("\nℹ️  No new messages since the previous run\n")
+        return
 
     # Save
     output_file = f"discovered_channels_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -160,6 +157,9 @@ async def main():
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(all_data, f, indent=2, ensure_ascii=False)
 
+    # Only now are the messages safe; the next run starts after them
+    engine.commit_watermarks()
+
     print("="*70)
     print("DATA COLLECTION COMPLETE")
     print("="*70)
@@ -4,15 +4,17 @@ Recent Incident Scraper - Zoekt nieuwe drone incidenten in het nieuws
 Ondersteunt: NL, BE, DE, FR, UK
 """
 
-import anthropic
-import os
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.llm_gateway import gateway
 
 def search_news_incidents(countries=['NL', 'BE', 'DE', 'FR', 'UK'], days_back=14):
     """Zoek nieuwe drone incidenten in het nieuws"""
 
-    client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days_back)
 
@@ -45,13 +47,8 @@ Formaat output als een lijst met elk incident duidelijk genummerd."""
     print(f"\n🔍 Zoeken naar incidenten in {', '.join(countries)} (laatste {days_back} dagen)...")
     print(f"📅 Periode: {start_date.strftime('%d %b %Y')} - {end_date.strftime('%d %b %Y')}\n")
 
-    message = client.messages.create(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=4000,
-        messages=[{"role": "user", "content": prompt}]
-    )
-
-    response = message.content[0].text
+    # Cached per prompt, so re-running the same scan on the same day is free
+    response = gateway.complete(prompt, model="claude-3-5-sonnet-20241022", max_tokens=4000)
 
     print("=" * 80)
     print("GEVONDEN INCIDENTEN:")
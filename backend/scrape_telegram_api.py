@@ -2,16 +2,20 @@
 """
 Advanced Telegram Scraper using Official API (Telethon)
 Scrapes target channels with full message history and keyword filtering
+
+Channels are scraped concurrently through the shared scraper engine; after the
+first run only new messages are fetched and merged into the saved results.
 """
 
 import os
+import sys
 import json
 import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from pathlib import Path
+from typing import List, Dict
 from dotenv import load_dotenv
 from telethon import TelegramClient
-from telethon.tl.types import Channel
 from telethon.errors import SessionPasswordNeededError
 import re
 
@@ -25,6 +29,14 @@ API_HASH = os.getenv('TELEGRAM_API_HASH')
 # Session file (stores authentication)
 SESSION_NAME = 'osint_session'
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.telegram_scraper import ScrapeTarget, TelegramScraperEngine
+
+SCRAPER_NAME = 'telegram_api'
+CONCURRENCY = 4
+OUTPUT_FILE = 'data/telegram_api_scraped.json'
+
 # Target channels from research
 TARGET_CHANNELS = [
     'grey_zone',          # Grey Zone - Wagner affiliated, 550k subs
@@ -94,22 +106,6 @@ async def authenticate(client: TelegramClient, phone_number: str = None):
     print("✓ Authenticated successfully")
 
 
-async def get_channel_info(client: TelegramClient, channel_username: str) -> Optional[Dict]:
-    """Get basic channel information"""
-    try:
-        entity = await client.get_entity(channel_username)
-        if isinstance(entity, Channel):
-            return {
-                'id': entity.id,
-                'title': entity.title,
-                'username': entity.username,
-                'participants_count': getattr(entity, 'participants_count', 0),
-            }
-    except Exception as e:
-        print(f"   ✗ Error getting channel info: {e}")
-    return None
-
-
 def matches_keywords(text: str, keywords: List[str]) -> List[str]:
     """Check if text contains any keywords"""
     if not text:
@@ -138,81 +134,66 @@ def extract_payment_info(text: str) -> Dict:
     return payment_info
 
 
-async def scrape_channel(client: TelegramClient, channel_username: str,
-                        start_date: datetime, end_date: datetime,
-                        limit: int = 1000) -> List[Dict]:
+def relevant_posts(scrape, start_date: datetime, end_date: datetime) -> List[Dict]:
     """
-    Scrape messages from a Telegram channel
+    Relevant posts among the new messages of one scraped channel
     """
-    print(f"\n📡 Scraping @{channel_username}")
+    channel_username = scrape.target.username
+    entity = scrape.entity
+    channel_title = getattr(entity, 'title', None) or channel_username
 
     posts = []
+    for message in scrape.messages:
+        # Skip if no date
+        if not message.date:
+            continue
+
+        # Filter by date range
+        msg_date = message.date.replace(tzinfo=None)
+        if not (start_date <= msg_date <= end_date):
+            continue
+
+        # Get message text
+        text = message.message or ""
+
+        # Check for location keywords
+        location_matches = matches_keywords(text, LOCATION_KEYWORDS)
+
+        # Check for intel keywords
+        intel_matches = matches_keywords(text, INTEL_KEYWORDS)
+
+        # Extract payment info
+        payment_info = extract_payment_info(text)
+
+        # Only store if relevant
+        if location_matches or intel_matches or payment_info['has_payment']:
+            posts.append({
+                'channel': channel_username,
+                'channel_title': channel_title,
+                'message_id': message.id,
+                'post_date': message.date.isoformat(),
+                'post_url': f"https://t.me/{channel_username}/{message.id}",
+                'content': text,
+                'views': message.views or 0,
+                'forwards': message.forwards or 0,
+                'location_keywords': location_matches,
+                'intel_keywords': intel_matches,
+                'payment_info': payment_info,
+                'relevance_score': len(location_matches) * 2 + len(intel_matches) + (5 if payment_info['has_payment'] else 0),
+            })
+
+    members = getattr(entity, 'participants_count', None)
+    print(f"   📊 {channel_title}{f' ({members:,} members)' if members else ''}: "
+          f"{len(scrape.messages)} new messages, {len(posts)} relevant posts")
+    return posts
 
-    try:
-        # Get channel entity
-        channel = await client.get_entity(channel_username)
-        channel_info = await get_channel_info(client, channel_username)
-
-        if channel_info:
-            print(f"   📊 {channel_info['title']}")
-            if channel_info.get('participants_count'):
-                print(f"   👥 {channel_info['participants_count']:,} members")
-
-        # Iterate through messages
-        count = 0
-        relevant_count = 0
-
-        async for message in client.iter_messages(channel, limit=limit):
-            count += 1
-
-            # Skip if no date
-            if not message.date:
-                continue
-
-            # Filter by date range
-            msg_date = message.date.replace(tzinfo=None)
-            if not (start_date <= msg_date <= end_date):
-                continue
-
-            # Get message text
-            text = message.message or ""
-
-            # Check for location keywords
-            location_matches = matches_keywords(text, LOCATION_KEYWORDS)
-
-            # Check for intel keywords
-            intel_matches = matches_keywords(text, INTEL_KEYWORDS)
-
-            # Extract payment info
-            payment_info = extract_payment_info(text)
-
-            # Only store if relevant
-            if location_matches or intel_matches or payment_info['has_payment']:
-                relevant_count += 1
-
-                post = {
-                    'channel': channel_username,
-                    'channel_title': channel_info['title'] if channel_info else channel_username,
-                    'message_id': message.id,
-                    'post_date': message.date.isoformat(),
-                    'post_url': f"https://t.me/{channel_username}/{message.id}",
-                    'content': text,
-                    'views': message.views or 0,
-                    'forwards': message.forwards or 0,
-                    'location_keywords': location_matches,
-                    'intel_keywords': intel_matches,
-                    'payment_info': payment_info,
-                    'relevance_score': len(location_matches) * 2 + len(intel_matches) + (5 if payment_info['has_payment'] else 0),
-                }
-
-                posts.append(post)
-
-        print(f"   ✓ Scraped {count} messages, found {relevant_count} relevant posts")
-
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
 
-    return posts
+def load_previous_posts(output_file: str) -> List[Dict]:
+    """Posts saved by earlier runs (their messages are not fetched again)"""
+    if not os.path.exists(output_file):
+        return []
+    with open(output_file, 'r', encoding='utf-8') as f:
+        return json.load(f).get('posts', [])
 
 
 async def main():
@@ -238,20 +219,26 @@ async def main():
         me = await client.get_me()
         print(f"   Logged in as: {me.first_name} (@{me.username})")
 
-        all_posts = []
+        new_posts = []
+
+        def collect(scrape):
+            new_posts.extend(relevant_posts(scrape, start_date, end_date))
 
-        # Scrape each channel
-        for channel in TARGET_CHANNELS:
-            posts = await scrape_channel(client, channel, start_date, end_date, limit=2000)
-            all_posts.extend(posts)
-            await asyncio.sleep(2)  # Rate limiting
+        # Scrape all channels (first run: last 2000 messages each)
+        targets = [ScrapeTarget(channel, priority=1, initial_limit=2000) for channel in TARGET_CHANNELS]
+        engine = TelegramScraperEngine(client, scraper=SCRAPER_NAME, concurrency=CONCURRENCY,
+                                       defer_watermarks=True)
+        await engine.run(targets, collect)
 
-        # Sort by relevance
+        # Merge with earlier runs and sort by relevance
+        seen_urls = {post['post_url'] for post in new_posts}
+        all_posts = new_posts + [post for post in load_previous_posts(OUTPUT_FILE) if post['post_url'] not in seen_urls]
         all_posts.sort(key=lambda x: x['relevance_score'], reverse=True)
 
         print("\n" + "=" * 80)
         print("RESULTS")
         print("=" * 80)
+        print(f"   New relevant posts: {len(new_posts)}")
         print(f"   Total relevant posts: {len(all_posts)}")
 
         if all_posts:
@@ -264,7 +251,7 @@ async def main():
             print(f"   Posts with payment info: {len(payment_posts)}")
 
         # Save results
-        output_file = 'data/telegram_api_scraped.json'
+        output_file = OUTPUT_FILE
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump({
                 'scraped_at': datetime.now().isoformat(),
@@ -277,6 +264,8 @@ async def main():
                 'posts': all_posts[:100]  # Top 100 most relevant
             }, f, indent=2, ensure_ascii=False)
 
+        # Only now are the posts safe; the next run starts after them
+        engine.commit_watermarks()
         print(f"\n💾 Saved to: {output_file}")
 
         # Display top results
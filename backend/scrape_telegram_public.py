@@ -2,16 +2,60 @@
 """
 Public Telegram Channel Scraper
 Scrapes public Telegram channels without requiring API credentials
+
+- Pages of t.me/s/<channel> are fetched with asyncio over one pooled HTTP
+  client (keep-alive connections, per-host concurrency limit)
+- Pagination follows ?before=<post id> back to the last post seen on the
+  previous run (watermark in telegram_scrape_state)
+- Pages are parsed with lxml (html.parser if it is missing, where only
+  building the message elements is left as a speedup)
+- Posts stream into telegram_messages in batches as they are parsed
 """
 
 import re
-import json
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import sys
+import asyncio
+import heapq
 import time
+from pathlib import Path
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import func
+
+from backend.database import SessionLocal
+from backend.models import TelegramChannel, TelegramMessage, TelegramScrapeState
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+SCRAPER_NAME = 'telegram_public'
+BASE_URL = 'https://t.me/s/'
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+# Connection pool shared by all channels
+MAX_CONNECTIONS = 10
+PER_HOST_CONCURRENCY = 4
+REQUEST_TIMEOUT = 30
+MAX_RETRIES = 3
 
+# Posts per channel on the first run (later runs stop at the watermark)
+DEFAULT_MAX_POSTS = 200
+
+# Posts per database transaction
+WRITE_BATCH_SIZE = 200
+
+# Only the message containers (the elements carrying data-post) are parsed
+MESSAGE_STRAINER = SoupStrainer('div', attrs={'data-post': True})
 # Target channels identified from research
 TARGET_CHANNELS = [
     'grey_zone',          # Grey Zone - Wagner affiliated, 550k subs (may be blocked in EU)
@@ -63,45 +107,122 @@ PAYMENT_PATTERNS = [
 ]
 
 
-def scrape_telegram_channel(channel: str, max_posts: int = 200) -> List[Dict]:
-    """
-    Scrape public Telegram channel using t.me/s/ endpoint
-    """
-    url = f"https://t.me/s/{channel}"
-    posts = []
+class TelegramWebFetcher:
+    """Async HTTP fetcher: one connection pool, at most N concurrent requests per host"""
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS,
+                 per_host_concurrency: int = PER_HOST_CONCURRENCY):
+        self.client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self.per_host_concurrency = per_host_concurrency
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.requests = 0
+
+    async def get(self, url: str, params: Optional[Dict] = None) -> str:
+        """GET a page (retries 429/5xx, honouring Retry-After)"""
+        host = httpx.URL(url).host
+        limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host_concurrency))
+
+        for attempt in range(MAX_RETRIES + 1):
+            async with limit:
+                response = await self.client.get(url, params=params)
+                self.requests += 1
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt == MAX_RETRIES:
+                    response.raise_for_status()
+                retry_after = response.headers.get('Retry-After', '')
+                await asyncio.sleep(int(retry_after) if retry_after.isdigit() else 2 ** attempt)
+                continue
+            response.raise_for_status()
+            return response.text
 
-    print(f"\n📡 Scraping channel: @{channel}")
-    print(f"   URL: {url}")
+    async def close(self):
+        await self.client.aclose()
 
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+def parse_channel_page(html: str, channel: str) -> List[Dict]:
+    """
+    Parse the posts on one t.me/s/ page (oldest first, as rendered)
+    """
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=MESSAGE_STRAINER)
+    posts = []
+    for msg in soup.find_all('div', class_='tgme_widget_message'):
+        post = parse_telegram_post(msg, channel)
+        if post:
+            posts.append(post)
+    return posts
 
-        # Find all message containers
-        messages = soup.find_all('div', class_='tgme_widget_message')
 
-        print(f"   Found {len(messages)} posts on page")
+async def iter_channel_posts(fetcher: TelegramWebFetcher, channel: str, min_id: int = 0,
+                             max_posts: int = DEFAULT_MAX_POSTS) -> AsyncIterator[Dict]:
+    """
+    Posts of a channel newer than `min_id`, newest first
 
-        for msg in messages[:max_posts]:
-            try:
-                post = parse_telegram_post(msg, channel)
-                if post:
-                    posts.append(post)
-            except Exception as e:
-                print(f"   ⚠️  Error parsing post: {e}")
+    Follows ?before= pagination until the watermark is reached. Without a
+    watermark (first run) at most `max_posts` posts are returned.
+    """
+    url = f"{BASE_URL}{channel}"
+    before = None
+    returned = 0
+
+    while True:
+        html = await fetcher.get(url, params={'before': before} if before else None)
+        page = parse_channel_page(html, channel)
+        page_ids = [int(post['post_id']) for post in page if post['post_id'].isdigit()]
+        if not page_ids:
+            return
+
+        for post in reversed(page):
+            if not post['post_id'].isdigit():
                 continue
+            if int(post['post_id']) <= min_id or (not min_id and returned >= max_posts):
+                return
+            returned += 1
+            yield post
 
-        print(f"   ✓ Scraped {len(posts)} posts successfully")
+        oldest = min(page_ids)
+        if oldest <= 1 or (before is not None and oldest >= before):
+            return
+        before = oldest
 
-    except Exception as e:
-        print(f"   ✗ Error scraping channel: {e}")
 
-    return posts
+async def scrape_channels(channels: List[str], watermarks: Dict[str, int],
+                          max_posts: int = DEFAULT_MAX_POSTS) -> AsyncIterator[Dict]:
+    """
+    Scrape channels concurrently, yielding posts as they are parsed
+
+    After a channel's last post, yields {'channel': ..., 'done': True,
+    'error': ...} so the caller can advance its watermark.
+    """
+    fetcher = TelegramWebFetcher()
+    queue = asyncio.Queue(maxsize=1000)
+
+    async def produce(channel: str):
+        error = None
+        try:
+            async for post in iter_channel_posts(fetcher, channel, watermarks.get(channel, 0), max_posts):
+                await queue.put(post)
+        except Exception as e:
+            error = str(e)
+        await queue.put({'channel': channel, 'done': True, 'error': error})
+
+    producers = [asyncio.create_task(produce(channel)) for channel in channels]
+    try:
+        remaining = len(channels)
+        while remaining:
+            item = await queue.get()
+            if item.get('done'):
+                remaining -= 1
+            yield item
+    finally:
+        for task in producers:
+            task.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+        await fetcher.close()
 
 
 def parse_telegram_post(msg_element, channel: str) -> Optional[Dict]:
@@ -148,6 +269,116 @@ def parse_telegram_post(msg_element, channel: str) -> Optional[Dict]:
         return None
 
 
+def parse_views(views: str) -> int:
+    """'1.2K' / '3M' / '845' → int"""
+    views = (views or '').strip().upper()
+    multiplier = 1
+    if views.endswith('K'):
+        multiplier, views = 1_000, views[:-1]
+    elif views.endswith('M'):
+        multiplier, views = 1_000_000, views[:-1]
+    try:
+        return int(float(views) * multiplier)
+    except ValueError:
+        return 0
+
+
+class TelegramPostWriter:
+    """Streams scraped posts into telegram_messages in batched transactions"""
+
+    def __init__(self, batch_size: int = WRITE_BATCH_SIZE):
+        self.db = SessionLocal()
+        self.batch_size = batch_size
+        self.saved = 0
+        self._channel_ids: Dict[str, int] = {}
+        self._pending: List[Dict] = []
+        self._newest: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}
+
+    def watermarks(self, channels: Iterable[str]) -> Dict[str, int]:
+        """Last post id stored per channel by earlier runs"""
+        marks = {}
+        for channel in channels:
+            state = self.db.get(TelegramScrapeState, (SCRAPER_NAME, self._channel_id(channel)))
+            marks[channel] = state.min_id if state else 0
+        self.db.commit()
+        return marks
+
+    def _channel_id(self, channel: str) -> int:
+        if channel not in self._channel_ids:
+            row = self.db.query(TelegramChannel).filter(
+                func.lower(TelegramChannel.username) == channel.lower()
+            ).order_by(TelegramChannel.id).first()
+            if not row:
+                row = TelegramChannel(
+                    channel_id=f"scraped_{channel}",
+                    username=channel,
+                    first_discovered=datetime.utcnow(),
+                    channel_type='public'
+                )
+                self.db.add(row)
+                self.db.flush()
+            self._channel_ids[channel] = row.id
+        return self._channel_ids[channel]
+
+    def add(self, post: Dict):
+        self._pending.append(post)
+        post_id = int(post['post_id'])
+        self._newest[post['channel']] = max(self._newest.get(post['channel'], 0), post_id)
+        self._counts[post['channel']] = self._counts.get(post['channel'], 0) + 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        pending, self._pending = self._pending, []
+        if pending:
+            by_channel = {}
+            for post in pending:
+                if post['post_date']:
+                    by_channel.setdefault(self._channel_id(post['channel']), []).append(post)
+
+            for channel_db_id, posts in by_channel.items():
+                existing = {
+                    message_id for (message_id,) in self.db.query(TelegramMessage.message_id).filter(
+                        TelegramMessage.channel_id == channel_db_id,
+                        TelegramMessage.message_id.in_([post['post_id'] for post in posts])
+                    )
+                }
+                rows = [
+                    TelegramMessage(
+                        message_id=post['post_id'],
+                        channel_id=channel_db_id,
+                        timestamp=datetime.fromisoformat(post['post_date']).astimezone(timezone.utc).replace(tzinfo=None),
+                        text_content=post['content'] or None,
+                        views=parse_views(post['views']),
+                        engagement_score=float(parse_views(post['views']))
+                    )
+                    for post in posts if post['post_id'] not in existing
+                ]
+                self.db.add_all(rows)
+                self.saved += len(rows)
+        self.db.commit()
+
+    def channel_done(self, channel: str, error: Optional[str] = None):
+        """Commit the channel's posts and advance its watermark (only if fully scraped)"""
+        self.flush()
+        channel_db_id = self._channel_id(channel)
+        state = self.db.get(TelegramScrapeState, (SCRAPER_NAME, channel_db_id))
+        if not state:
+            state = TelegramScrapeState(scraper=SCRAPER_NAME, channel_id=channel_db_id, min_id=0, messages_fetched=0)
+            self.db.add(state)
+        if not error and channel in self._newest:
+            state.min_id = max(state.min_id, self._newest[channel])
+            state.messages_fetched += self._counts.pop(channel, 0)
+        state.last_scraped_at = datetime.utcnow()
+        state.last_error = error
+        self.db.commit()
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+
 def filter_relevant_posts(posts: List[Dict], keywords: List[str]) -> List[Dict]:
     """
     Filter posts containing relevant keywords
@@ -228,7 +459,6 @@ def filter_by_date_range(posts: List[Dict], start_date: str, end_date: str) -> L
     """
     Filter posts within date range
     """
-    from datetime import timezone
     start = datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc)
     end = datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc)
 
@@ -245,6 +475,68 @@ def filter_by_date_range(posts: List[Dict], start_date: str, end_date: str) -> L
     return filtered
 
 
+async def scrape(channels: List[str], max_posts: int = DEFAULT_MAX_POSTS) -> List[Dict]:
+    """
+    Scrape channels into telegram_messages, analyzing posts as they stream in
+
+    Returns: Top 10 intelligence/bounty posts in the date range
+    """
+    start_date = '2025-09-01'
+    end_date = '2025-11-13'
+
+    writer = TelegramPostWriter()
+    watermarks = writer.watermarks(channels)
+    stats = {'total': 0, 'in_range': 0, 'relevant': 0, 'intel': 0}
+    per_channel = {channel: 0 for channel in channels}
+    top_intel = []  # Heap of (relevance, sequence, post)
+    started = time.perf_counter()
+
+    try:
+        async for post in scrape_channels(channels, watermarks, max_posts):
+            if post.get('done'):
+                writer.channel_done(post['channel'], post['error'])
+                if post['error']:
+                    print(f"   ✗ @{post['channel']}: {post['error']}")
+                else:
+                    print(f"   ✓ @{post['channel']}: {per_channel[post['channel']]} new posts "
+                          f"(since post {watermarks[post['channel']]})")
+                continue
+
+            writer.add(post)
+            stats['total'] += 1
+            per_channel[post['channel']] += 1
+
+            # Filter by date range (Sept 1 - Nov 13, 2025)
+            if not filter_by_date_range([post], start_date, end_date):
+                continue
+            stats['in_range'] += 1
+
+            # Filter for Belgium/NATO keywords
+            if not filter_relevant_posts([post], KEYWORDS):
+                continue
+            stats['relevant'] += 1
+
+            # Analyze for intelligence/bounty posts
+            if analyze_posts_for_intel([post]):
+                stats['intel'] += 1
+                entry = (post['relevance_score'], stats['intel'], post)
+                if len(top_intel) < 10:
+                    heapq.heappush(top_intel, entry)
+                else:
+                    heapq.heappushpop(top_intel, entry)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n📊 New posts scraped: {stats['total']} ({stats['total'] / elapsed if elapsed else 0:.1f} posts/sec)")
+    print(f"   Stored in telegram_messages: {writer.saved}")
+    print(f"   Posts in date range: {stats['in_range']}")
+    print(f"   Posts with relevant keywords: {stats['relevant']}")
+    print(f"   Intelligence/bounty posts: {stats['intel']}")
+
+    return [post for _, _, post in sorted(top_intel, key=lambda entry: (-entry[0], entry[1]))]
+
+
 def main():
     print("=" * 80)
     print("TELEGRAM PUBLIC CHANNEL SCRAPER")
@@ -254,40 +546,7 @@ def main():
     print(f"📺 Channels: {len(TARGET_CHANNELS)}")
     print(f"🔍 Keywords: {len(KEYWORDS)}")
 
-    all_posts = []
-
-    # Scrape each channel
-    for channel in TARGET_CHANNELS:
-        posts = scrape_telegram_channel(channel, max_posts=200)
-        all_posts.extend(posts)
-        time.sleep(2)  # Be polite to Telegram servers
-
-    print(f"\n📊 Total posts scraped: {len(all_posts)}")
-
-    # Filter by date range (Sept 1 - Nov 13, 2025)
-    date_filtered = filter_by_date_range(all_posts, "2025-09-01", "2025-11-13")
-    print(f"   Posts in date range: {len(date_filtered)}")
-
-    # Filter for Belgium/NATO keywords
-    relevant = filter_relevant_posts(date_filtered, KEYWORDS)
-    print(f"   Posts with relevant keywords: {len(relevant)}")
-
-    # Analyze for intelligence/bounty posts
-    intel_posts = analyze_posts_for_intel(relevant)
-    print(f"   Intelligence/bounty posts: {len(intel_posts)}")
-
-    # Save results
-    output_file = 'data/telegram_scraped_posts.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'scraped_at': datetime.now().isoformat(),
-            'total_posts': len(all_posts),
-            'relevant_posts': len(relevant),
-            'intel_posts': len(intel_posts),
-            'posts': intel_posts
-        }, f, indent=2, ensure_ascii=False)
-
-    print(f"\n💾 Saved to: {output_file}")
+    intel_posts = asyncio.run(scrape(TARGET_CHANNELS, max_posts=DEFAULT_MAX_POSTS))
 
     # Display top results
     if intel_posts:
@@ -295,7 +554,7 @@ def main():
         print("TOP INTELLIGENCE POSTS")
         print("=" * 80)
 
-        for i, post in enumerate(intel_posts[:10], 1):
+        for i, post in enumerate(intel_posts, 1):
             print(f"\n{i}. @{post['channel']} - {post['post_date'][:10] if post['post_date'] else 'Unknown'}")
             print(f"   Relevance: {post['relevance_score']}")
             print(f"   Keywords: {', '.join(post.get('intel_keywords', []))}")
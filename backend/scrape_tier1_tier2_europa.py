@@ -2,24 +2,29 @@
 """
 Tier 1+2 Europa-Focused Telegram Scraper
 Scrapes discovered channels with operator identification focus
+
+Channels are scraped concurrently through the shared scraper engine; each run
+only processes messages newer than the previous run (per-channel watermark).
 """
 
-import os
+import sys
 import json
 import asyncio
 import sqlite3
 import re
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
-from telethon import TelegramClient
-from telethon.tl.types import Channel
 
 load_dotenv()
 
-API_ID = int(os.getenv('TELEGRAM_API_ID'))
-API_HASH = os.getenv('TELEGRAM_API_HASH')
-SESSION_NAME = 'osint_session'
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.telegram_scraper import ScrapeTarget, TelegramScraperEngine, connect_client, staging_session_factory
+
+SCRAPER_NAME = 'tier12_europa'
+CONCURRENCY = 4
 
 # From PIJLER_1_RAPPORT
 TIER1_CHANNELS = [
@@ -117,11 +122,7 @@ class Tier12EuropaScraper:
 
     async def connect(self):
         """Connect to Telegram"""
-        self.client = TelegramClient(SESSION_NAME, API_ID, API_HASH)
-        await self.client.connect()
-
-        if not await self.client.is_user_authorized():
-            raise Exception("Not authorized. Run authorization script first.")
+        self.client = await connect_client()
 
         me = await self.client.get_me()
         print(f"✓ Authenticated as: {me.first_name} (@{me.username})")
@@ -207,75 +208,63 @@ class Tier12EuropaScraper:
 
         return score
 
-    async def scrape_channel(self, channel_username: str, tier: str, limit: int = 200):
-        """Scrape a single channel"""
-        print(f"\n{'='*70}")
-        print(f"📡 {channel_username} (Tier {tier})")
-        print('='*70)
-
-        try:
-            entity = await self.client.get_entity(channel_username)
-            print(f"📋 {entity.title}")
-
-            # Get messages
-            messages = await self.client.get_messages(entity, limit=limit)
-            print(f"📥 Retrieved {len(messages)} messages")
-
-            europa_count = 0
-            operator_count = 0
-
-            for msg in messages:
-                if not msg.message:
-                    continue
-
-                # Check Europa relevance
-                if self.is_europa_relevant(msg.message):
-                    europa_count += 1
-
-                    relevance_score = self.calculate_relevance_score(msg.message)
-
-                    msg_data = {
-                        'channel': channel_username,
-                        'channel_title': entity.title,
-                        'tier': tier,
-                        'message_id': msg.id,
-                        'date': msg.date.isoformat(),
-                        'text': msg.message,
-                        'views': msg.views,
-                        'forwards': msg.forwards,
-                        'relevance_score': relevance_score,
-                        'url': f'https://t.me/{channel_username}/{msg.id}'
-                    }
-
-                    # Store in appropriate tier
-                    if tier == '1':
-                        self.results['tier1'].append(msg_data)
-                    else:
-                        self.results['tier2'].append(msg_data)
-
-                    # High value messages (score >= 10)
-                    if relevance_score >= 10:
-                        self.results['high_value_messages'].append(msg_data)
-
-                    # Check for operator intel
-                    operator_data = self.extract_operators(msg.message, channel_username, msg.id)
-                    if operator_data:
-                        operator_count += 1
-                        operator_data['message_text'] = msg.message[:500]
-                        operator_data['date'] = msg.date.isoformat()
-                        operator_data['url'] = msg_data['url']
-                        self.results['operator_intel'].append(operator_data)
-
-                    # Save to database
-                    self.save_to_database(msg_data, operator_data)
-
-            print(f"✅ Europa-relevant: {europa_count}/{len(messages)}")
-            print(f"🎯 Operator intel: {operator_count}")
-
-        except Exception as e:
-            print(f"❌ Error: {e}")
-
-        await asyncio.sleep(3)  # Rate limiting
+    def process_channel(self, scrape):
+        """Process the new messages of one scraped channel (engine handler)"""
+        channel_username = scrape.target.username
+        tier = scrape.target.label
+        entity = scrape.entity
+        messages = scrape.messages
+
+        europa_count = 0
+        operator_count = 0
+
+        for msg in messages:
+            if not msg.message:
+                continue
+
+            # Check Europa relevance
+            if self.is_europa_relevant(msg.message):
+                europa_count += 1
+
+                relevance_score = self.calculate_relevance_score(msg.message)
+
+                msg_data = {
+                    'channel': channel_username,
+                    'channel_title': entity.title,
+                    'tier': tier,
+                    'message_id': msg.id,
+                    'date': msg.date.isoformat(),
+                    'text': msg.message,
+                    'views': msg.views,
+                    'forwards': msg.forwards,
+                    'relevance_score': relevance_score,
+                    'url': f'https://t.me/{channel_username}/{msg.id}'
+                }
+
+                # Store in appropriate tier
+                if tier == '1':
+                    self.results['tier1'].append(msg_data)
+                else:
+                    self.results['tier2'].append(msg_data)
+
+                # High value messages (score >= 10)
+                if relevance_score >= 10:
+                    self.results['high_value_messages'].append(msg_data)
+
+                # Check for operator intel
+                operator_data = self.extract_operators(msg.message, channel_username, msg.id)
+                if operator_data:
+                    operator_count += 1
+                    operator_data['message_text'] = msg.message[:500]
+                    operator_data['date'] = msg.date.isoformat()
+                    operator_data['url'] = msg_data['url']
+                    self.results['operator_intel'].append(operator_data)
+
+                # Save to database
+                self.save_to_database(msg_data, operator_data)
+
+        print(f"   📋 {entity.title} (Tier {tier}): Europa-relevant {europa_count}/{len(messages)}, "
+              f"operator intel {operator_count}")
 
     def save_to_database(self, msg_data: Dict, operator_data: Optional[Dict] = None):
         """Save message and operator data to database"""
@@ -336,24 +325,23 @@ class Tier12EuropaScraper:
 
         await self.connect()
 
-        # Tier 1 - 200 messages each
-        print(f"\n{'='*80}")
-        print("TIER 1 CHANNELS (Critical - 200 msgs)")
-        print('='*80)
-        for channel in TIER1_CHANNELS:
-            await self.scrape_channel(channel, '1', limit=200)
-
-        # Tier 2 - 100 messages each
-        print(f"\n{'='*80}")
-        print("TIER 2 CHANNELS (High Priority - 100 msgs)")
-        print('='*80)
-        for channel in TIER2_CHANNELS:
-            await self.scrape_channel(channel, '2', limit=100)
-
-        await self.client.disconnect()
+        # Tier 1 first (up to 200 msgs on first run), then Tier 2 (up to 100)
+        targets = (
+            [ScrapeTarget(channel, priority=1, initial_limit=200, label='1') for channel in TIER1_CHANNELS] +
+            [ScrapeTarget(channel, priority=2, initial_limit=100, label='2') for channel in TIER2_CHANNELS]
+        )
+        # Channels and watermarks go to the staging DB, next to the rows they describe
+        engine = TelegramScraperEngine(self.client, scraper=SCRAPER_NAME, concurrency=CONCURRENCY,
+                                       defer_watermarks=True,
+                                       session_factory=staging_session_factory(self.db_path))
+        try:
+            await engine.run(targets, self.process_channel)
+        finally:
+            await self.client.disconnect()
 
-        # Save results
+        # Save results (the next run starts after these messages only once they are on disk)
         self.save_results()
+        engine.commit_watermarks()
         self.print_summary()
 
     def save_results(self):
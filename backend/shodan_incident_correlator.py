@@ -16,7 +16,6 @@ import sys
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
-import math
 
 sys.path.insert(0, str(os.path.dirname(os.path.dirname(__file__))))
 
@@ -28,6 +27,7 @@ except ImportError:
 
 from backend.database import SessionLocal
 from backend.models import Incident, TelegramMessage
+from backend.spatial_index import haversine_km
 
 class ShodanIncidentCorrelator:
     """
@@ -342,17 +342,7 @@ class ShodanIncidentCorrelator:
         Calculate distance between two coordinates (Haversine formula)
         Returns distance in kilometers
         """
-        R = 6371  # Earth radius in km
-
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-
-        a = math.sin(delta_lat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-
-        return R * c
+        return haversine_km(lat1, lon1, lat2, lon2)
 
     def _calculate_confidence(self, device_type: str, distance: float, time_correlation: str) -> str:
         """
@@ -0,0 +1,276 @@
+"""
+Spatial Index for Incident Proximity Queries
+
+Incident coordinates are mirrored into an SQLite R*Tree virtual table
+(`incident_rtree`) kept in sync by triggers on `incidents`, so inserts,
+updates and deletes from the ORM *and* from raw-SQL importers maintain it.
+
+Proximity queries run in two steps:
+1. Candidate lookup: a bounding box around the search circle is matched
+   against the R*Tree (only nearby rows are touched)
+2. Refinement: candidates get an exact haversine distance and are filtered
+   to the true radius
+
+If the SQLite build lacks the R*Tree module, the same bounding box is answered
+from a (latitude, longitude) B-tree index on `incidents` instead.
+
+Geohash helpers are used for in-memory blocking (e.g. deduplication), where
+points are bucketed by cell and only cells near a point are compared.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.195
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MAX_GEOHASH_PRECISION = 12
+
+_rtree_available: Optional[bool] = None
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in kilometers"""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    (min_lat, max_lat, min_lon, max_lon) enclosing a circle of radius_km.
+
+    The longitude span is the exact great-circle extent of the circle (the
+    full range when it reaches a pole); boxes are clamped at the antimeridian
+    (fine for EU coverage).
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    delta_lat = math.degrees(angular)
+
+    sin_ratio = math.sin(angular) / math.cos(math.radians(lat)) if abs(lat) < 90.0 else 1.0
+    if abs(math.radians(lat)) + angular >= math.pi / 2 or sin_ratio >= 1.0:
+        delta_lon = 360.0  # Circle reaches a pole: every longitude
+    else:
+        delta_lon = math.degrees(math.asin(sin_ratio))
+
+    return (
+        max(lat - delta_lat, -90.0),
+        min(lat + delta_lat, 90.0),
+        max(lon - delta_lon, -180.0),
+        min(lon + delta_lon, 180.0),
+    )
+
+
+def _geohash_bits(precision: int) -> Tuple[int, int]:
+    """(latitude bits, longitude bits) of a geohash with `precision` characters"""
+    bits = precision * 5
+    return bits // 2, (bits + 1) // 2
+
+
+def _geohash_from_cell(lat_index: int, lon_index: int, precision: int) -> str:
+    """Encode grid indices as a geohash (bits interleaved, longitude first)"""
+    lat_bits, lon_bits = _geohash_bits(precision)
+    chars = []
+    value = 0
+    for bit in range(precision * 5):
+        if bit % 2 == 0:
+            lon_bits -= 1
+            value = (value << 1) | ((lon_index >> lon_bits) & 1)
+        else:
+            lat_bits -= 1
+            value = (value << 1) | ((lat_index >> lat_bits) & 1)
+        if bit % 5 == 4:
+            chars.append(GEOHASH_BASE32[value])
+            value = 0
+    return "".join(chars)
+
+
+def _geohash_index(value: float, low: float, high: float, bits: int) -> int:
+    cells = 1 << bits
+    return min(max(int((value - low) / (high - low) * cells), 0), cells - 1)
+
+
+def geohash_encode(lat: float, lon: float, precision: int = 5) -> str:
+    """Geohash of a coordinate (precision 5 is ~5 km x 5 km)"""
+    lat_bits, lon_bits = _geohash_bits(precision)
+    return _geohash_from_cell(
+        _geohash_index(lat, -90.0, 90.0, lat_bits),
+        _geohash_index(lon, -180.0, 180.0, lon_bits),
+        precision
+    )
+
+
+def geohash_precision_for(radius_km: float) -> int:
+    """Finest geohash precision whose cells are at least radius_km tall"""
+    precision = 1
+    while precision < MAX_GEOHASH_PRECISION:
+        lat_bits, _ = _geohash_bits(precision + 1)
+        if 180.0 / (1 << lat_bits) * KM_PER_DEGREE_LAT < radius_km:
+            break
+        precision += 1
+    return precision
+
+
+def geohash_cells_near(lat: float, lon: float, radius_km: float, precision: int) -> List[str]:
+    """
+    Geohash cells that may hold a point within radius_km of (lat, lon).
+
+    Unlike bounding_box(), the longitude span wraps at the antimeridian, so
+    no point within the radius is ever missed.
+    """
+    lat_bits, lon_bits = _geohash_bits(precision)
+    angular = radius_km / EARTH_RADIUS_KM
+    delta_lat = math.degrees(angular) + 1e-9
+
+    lat_low = _geohash_index(lat - delta_lat, -90.0, 90.0, lat_bits)
+    lat_high = _geohash_index(lat + delta_lat, -90.0, 90.0, lat_bits)
+
+    lon_cells = 1 << lon_bits
+    if abs(math.radians(lat)) + angular >= math.pi / 2:
+        lon_indexes = range(lon_cells)  # Circle reaches a pole
+    else:
+        delta_lon = math.degrees(math.asin(min(math.sin(angular) / math.cos(math.radians(lat)), 1.0))) + 1e-9
+        cell_width = 360.0 / lon_cells
+        first = math.floor((lon - delta_lon + 180.0) / cell_width)
+        last = math.floor((lon + delta_lon + 180.0) / cell_width)
+        if last - first + 1 >= lon_cells:
+            lon_indexes = range(lon_cells)
+        else:
+            lon_indexes = sorted({index % lon_cells for index in range(first, last + 1)})
+
+    return [
+        _geohash_from_cell(lat_index, lon_index, precision)
+        for lat_index in range(lat_low, lat_high + 1)
+        for lon_index in lon_indexes
+    ]
+
+
+def ensure_spatial_index(conn):
+    """
+    Create the incident R*Tree and its sync triggers, and (re)build it if it
+    is out of step with `incidents`. Safe to call on every startup.
+    """
+    global _rtree_available
+
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_incidents_lat_lon ON incidents (latitude, longitude)"))
+
+    try:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS incident_rtree "
+            "USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+        ))
+    except OperationalError as e:
+        print(f"⚠ R*Tree unavailable, using lat/lon index for spatial queries: {e}")
+        _rtree_available = False
+        return
+
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS incidents_rtree_insert AFTER INSERT ON incidents
+        WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL
+        BEGIN
+            INSERT OR REPLACE INTO incident_rtree
+            VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+        END
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS incidents_rtree_update AFTER UPDATE OF id, latitude, longitude ON incidents
+        BEGIN
+            DELETE FROM incident_rtree WHERE id = OLD.id;
+            INSERT INTO incident_rtree
+            SELECT NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude
+            WHERE NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL;
+        END
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS incidents_rtree_delete AFTER DELETE ON incidents
+        BEGIN
+            DELETE FROM incident_rtree WHERE id = OLD.id;
+        END
+    """))
+
+    indexed = conn.execute(text("SELECT COUNT(*) FROM incident_rtree")).scalar()
+    expected = conn.execute(text(
+        "SELECT COUNT(*) FROM incidents WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    )).scalar()
+    if indexed != expected:
+        conn.execute(text("DELETE FROM incident_rtree"))
+        conn.execute(text("""
+            INSERT INTO incident_rtree
+            SELECT id, latitude, latitude, longitude, longitude FROM incidents
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        """))
+        print(f"✓ Built incident spatial index ({expected} incidents)")
+
+    _rtree_available = True
+
+
+def _has_rtree(db) -> bool:
+    global _rtree_available
+    if _rtree_available is None:
+        _rtree_available = db.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'incident_rtree'"
+        )).first() is not None
+    return _rtree_available
+
+
+def incidents_in_bbox(db, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> List[Dict]:
+    """
+    Lightweight incident rows (id, title, date, coordinates) inside the box.
+
+    The R*Tree stores 32-bit floats rounded outward, so candidates are
+    re-checked against the exact coordinates.
+    """
+    params = {"min_lat": min_lat, "max_lat": max_lat, "min_lon": min_lon, "max_lon": max_lon}
+    # CROSS JOIN pins the R*Tree as the outer loop (SQLite would otherwise
+    # prefer the lat/lon B-tree for the exact-coordinate check)
+    candidate_source = (
+        """
+        FROM incident_rtree r CROSS JOIN incidents i ON i.id = r.id
+        WHERE r.max_lat >= :min_lat AND r.min_lat <= :max_lat
+          AND r.max_lon >= :min_lon AND r.min_lon <= :max_lon
+          AND
+        """
+        if _has_rtree(db) else "FROM incidents i WHERE"
+    )
+    rows = db.execute(text(f"""
+        SELECT i.id, i.title, i.sighting_date, i.latitude, i.longitude,
+               i.restricted_area_id, i.source, i.confidence_score, i.operational_class
+        {candidate_source}
+            i.latitude BETWEEN :min_lat AND :max_lat
+            AND i.longitude BETWEEN :min_lon AND :max_lon
+    """), params)
+    return [dict(row._mapping) for row in rows]
+
+
+def incidents_within_radius(
+    db,
+    lat: float,
+    lon: float,
+    radius_km: float,
+    exclude_id: Optional[int] = None
+) -> List[Dict]:
+    """
+    Incidents within radius_km of (lat, lon), nearest first.
+
+    Each row is a lightweight dict (see incidents_in_bbox) with an added
+    `distance_km` computed by haversine.
+    """
+    nearby = []
+    for row in incidents_in_bbox(db, *bounding_box(lat, lon, radius_km)):
+        if row["id"] == exclude_id:
+            continue
+        distance_km = haversine_km(lat, lon, row["latitude"], row["longitude"])
+        if distance_km <= radius_km:
+            row["distance_km"] = round(distance_km, 2)
+            nearby.append(row)
+
+    nearby.sort(key=lambda r: r["distance_km"])
+    return nearby
+
@@ -0,0 +1,238 @@
+"""
+Dashboard Stats Snapshot
+
+`/api/stats` used to run a dozen COUNT and GROUP BY queries on every dashboard
+load. The numbers now come from an in-process snapshot:
+
+- Built once from the database (a handful of narrow column queries)
+- Kept current through cache_sync: every ORM insert, update or delete of an
+  incident, intervention, pattern, restricted area or drone type is applied
+  when its transaction commits, with periodic full rebuilds on top
+
+Recent-incident counts for any `days` window are answered by bisecting a
+sorted list of report dates, so a request never touches the database.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.cache_sync import PeriodicRebuild, track_writes
+from backend.models import DroneType, Incident, Intervention, Pattern, RestrictedArea
+
+# Full rebuild interval (catches writes that bypass the ORM)
+STATS_REBUILD_SECONDS = 600
+
+# Incidents counted in totals (duplicates and false positives are excluded)
+COUNTED_OPERATIONAL_CLASSES = (None, "MERGED_MASTER")
+
+TRACKED_MODELS = (Incident, Intervention, Pattern, RestrictedArea, DroneType)
+
+
+def _incident_state(incident) -> tuple:
+    return (
+        incident.operational_class in COUNTED_OPERATIONAL_CLASSES,
+        incident.report_date,
+        incident.drone_type_id,
+        incident.restricted_area_id,
+        incident.purpose_assessment,
+    )
+
+
+def _row_state(obj) -> Optional[tuple]:
+    """Snapshot-relevant fields of a tracked ORM object"""
+    if isinstance(obj, Incident):
+        return _incident_state(obj)
+    if isinstance(obj, Intervention):
+        return (obj.intervention_type, obj.outcome)
+    if isinstance(obj, RestrictedArea):
+        return (obj.name, obj.country)
+    if isinstance(obj, DroneType):
+        return (obj.model,)
+    return ()
+
+
+class StatsSnapshot(PeriodicRebuild):
+    """In-memory dashboard statistics, updated incrementally on commit"""
+
+    rebuild_label = "Stats snapshot"
+
+    def __init__(self, rebuild_seconds: int = STATS_REBUILD_SECONDS):
+        self.rebuild_seconds = rebuild_seconds
+        self.built_at: Optional[datetime] = None
+
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        # Per-row state, so updates and deletes can undo the previous contribution
+        self._rows: Dict[type, Dict[int, tuple]] = {model: {} for model in TRACKED_MODELS}
+
+        # Aggregates derived from the rows
+        self._counted_incidents = 0
+        self._counted_report_dates = []  # sorted, counted incidents only
+        self._drone_type_counts = Counter()
+        self._area_counts = Counter()
+        self._purpose_counts = Counter()
+        self._intervention_type_counts = Counter()
+        self._successful_interventions = 0
+
+    # ------------------------------------------------------------------
+    # Full rebuild
+    # ------------------------------------------------------------------
+
+    def rebuild(self, db: Session):
+        """Recompute the snapshot from the database"""
+        incidents = db.query(
+            Incident.id,
+            Incident.operational_class,
+            Incident.report_date,
+            Incident.drone_type_id,
+            Incident.restricted_area_id,
+            Incident.purpose_assessment,
+        ).order_by(Incident.report_date).all()  # Date order keeps insort appending
+        interventions = db.query(Intervention.id, Intervention.intervention_type, Intervention.outcome).all()
+        pattern_ids = db.query(Pattern.id).all()
+        areas = db.query(RestrictedArea.id, RestrictedArea.name, RestrictedArea.country).all()
+        drone_types = db.query(DroneType.id, DroneType.model).all()
+
+        with self._lock:
+            self._reset()
+            for row in incidents:
+                self._apply(Incident, row.id, _incident_state(row))
+            for row in interventions:
+                self._apply(Intervention, row.id, (row.intervention_type, row.outcome))
+            for row in pattern_ids:
+                self._apply(Pattern, row.id, ())
+            for row in areas:
+                self._apply(RestrictedArea, row.id, (row.name, row.country))
+            for row in drone_types:
+                self._apply(DroneType, row.id, (row.model,))
+            self.built_at = datetime.utcnow()
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def _apply(self, model: type, row_id: int, state: Optional[tuple]):
+        """Replace the stored state of one row (state=None deletes it)"""
+        rows = self._rows[model]
+        previous = rows.pop(row_id, None)
+        if previous is not None:
+            self._contribute(model, previous, -1)
+        if state is not None:
+            rows[row_id] = state
+            self._contribute(model, state, 1)
+
+    def _contribute(self, model: type, state: tuple, sign: int):
+        if model is Incident:
+            counted, report_date, drone_type_id, area_id, purpose = state
+            if counted:
+                self._counted_incidents += sign
+                if report_date is not None:
+                    if sign > 0:
+                        insort(self._counted_report_dates, report_date)
+                    else:
+                        index = bisect_left(self._counted_report_dates, report_date)
+                        if index < len(self._counted_report_dates) and self._counted_report_dates[index] == report_date:
+                            del self._counted_report_dates[index]
+            if drone_type_id is not None:
+                self._drone_type_counts[drone_type_id] += sign
+            if area_id is not None:
+                self._area_counts[area_id] += sign
+            if purpose is not None:
+                self._purpose_counts[purpose] += sign
+        elif model is Intervention:
+            intervention_type, outcome = state
+            self._intervention_type_counts[intervention_type] += sign
+            if outcome == "success":
+                self._successful_interventions += sign
+
+    def apply_changes(self, changes):
+        """Apply (model, id, state) changes captured at flush time"""
+        if self.built_at is None:
+            return  # Nothing to update yet; the first read builds from the database
+        with self._lock:
+            for model, row_id, state in changes:
+                self._apply(model, row_id, state)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, db: Session, days: int) -> Dict:
+        """Dashboard statistics for a `days` recent-incident window"""
+        if self.built_at is None:
+            self.rebuild(db)
+        self._ensure_refresh_task()
+
+        now = datetime.utcnow()
+        cutoff_date = now - timedelta(days=days)
+
+        with self._lock:
+            total_interventions = len(self._rows[Intervention])
+            recent_incidents = len(self._counted_report_dates) - bisect_left(self._counted_report_dates, cutoff_date)
+            intervention_success_rate = (
+                (self._successful_interventions / total_interventions * 100)
+                if total_interventions > 0 else 0
+            )
+
+            drone_types = self._rows[DroneType]
+            top_drone_types = [
+                {"model": drone_types[drone_type_id][0], "incidents": count}
+                for drone_type_id, count in self._drone_type_counts.most_common()
+                if count > 0 and drone_type_id in drone_types
+            ][:5]
+
+            areas = self._rows[RestrictedArea]
+            top_targeted_areas = [
+                {"name": areas[area_id][0], "country": areas[area_id][1], "incidents": count}
+                for area_id, count in self._area_counts.most_common()
+                if count > 0 and area_id in areas
+            ][:5]
+
+            stats = {
+                "timestamp": now.isoformat(),
+                "snapshot_built_at": self.built_at.isoformat(),
+                "time_window_days": days,
+                "cutoff_date": cutoff_date.isoformat(),
+                "summary": {
+                    "total_incidents": self._counted_incidents,
+                    f"recent_incidents_{days}d": recent_incidents,
+                    "total_interventions": total_interventions,
+                    "intervention_success_rate": round(intervention_success_rate, 1),
+                    "total_patterns": len(self._rows[Pattern]),
+                    "restricted_areas": len(areas),
+                    "drone_types_tracked": len(drone_types),
+                },
+                "top_drone_types": top_drone_types,
+                "top_targeted_areas": top_targeted_areas,
+                "interventions_by_type": [
+                    {"type": itype, "count": count}
+                    for itype, count in sorted(self._intervention_type_counts.items(), key=lambda item: str(item[0]))
+                    if count > 0
+                ],
+                "purposes_detected": [
+                    {"purpose": purpose, "count": count}
+                    for purpose, count in sorted(self._purpose_counts.items())
+                    if count > 0
+                ]
+            }
+        return stats
+
+
+stats_snapshot = StatsSnapshot()
+
+
+def _capture_stats_change(obj, deleted: bool):
+    """New state of a tracked row written by a flush"""
+    if isinstance(obj, TRACKED_MODELS) and obj.id is not None:
+        return (type(obj), obj.id, None if deleted else _row_state(obj))
+    return None
+
+
+track_writes("stats_snapshot_changes", _capture_stats_change, stats_snapshot.apply_changes)
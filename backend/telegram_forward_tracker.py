@@ -12,8 +12,9 @@ Features:
 
 import sys
 import os
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Set, Tuple
 import json
 from collections import defaultdict
@@ -25,7 +26,8 @@ from backend.models import (
     TelegramChannel, TelegramMessage, MessageForward,
     PrivateChannelLeak, TelegramParticipant, ChannelParticipation
 )
-from sqlalchemy import func, and_, desc
+from backend.coordinated_forwards import run_detection, serialize_events
+from sqlalchemy import func, desc
 from sqlalchemy.orm import Session
 
 try:
@@ -37,10 +39,30 @@ except ImportError:
     print("⚠️  Telethon not installed. Install with: pip install telethon")
 
 
+# Buffered messages per bulk write transaction
+DEFAULT_BATCH_SIZE = 500
+
+# Ids per IN (...) lookup (SQLite bound-parameter limit)
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Telethon dates are tz-aware UTC; the database stores naive UTC"""
+    if value is not None and value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _chunks(items: List, size: int = LOOKUP_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
 class TelegramForwardTracker:
     """Tracks message forwards across Telegram channels"""
 
-    def __init__(self, db: Session = None, api_id: str = None, api_hash: str = None):
+    def __init__(self, db: Session = None, api_id: str = None, api_hash: str = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
         self.db = db or SessionLocal()
         self.api_id = api_id or os.getenv("TELEGRAM_API_ID")
         self.api_hash = api_hash or os.getenv("TELEGRAM_API_HASH")
@@ -52,6 +74,23 @@ class TelegramForwardTracker:
             raise ValueError("TELEGRAM_API_ID and TELEGRAM_API_HASH must be set")
 
         self.client = None
+        self.batch_size = batch_size
+        self._reset_caches()
+
+    def _reset_caches(self):
+        """Drop lookup caches and the write buffer (after a rollback)"""
+        # Telegram channel id → telegram_channels.id
+        self._channel_ids: Dict[str, int] = {}
+        self._channel_usernames: Dict[int, Optional[str]] = {}
+        # Telegram channel ids whose entity could not be fetched
+        self._inaccessible_channels: Set[int] = set()
+        # (telegram_channels.id, Telegram message id) → (telegram_messages.id, timestamp)
+        self._message_ids: Dict[Tuple[int, str], Tuple[int, datetime]] = {}
+
+        # Write buffer
+        self._pending_messages: List[TelegramMessage] = []
+        self._pending_forwards: List[Dict] = []
+        self._pending_leaks: Dict[Tuple[str, int], Dict] = {}
 
     async def initialize_client(self, session_file: str = "osint_session"):
         """Initialize Telegram client"""
@@ -63,73 +102,96 @@ class TelegramForwardTracker:
         """
         Scrape channel and track all forward information
 
+        Messages, forwards and private leak updates are buffered and written
+        in bulk transactions of `batch_size` messages.
+
         Args:
             channel_username: Channel username (without @)
             limit: Maximum messages to fetch
 
         Returns:
-            Dictionary with scrape results
+            Dictionary with scrape results (including ingest throughput)
         """
         print(f"\n🔍 Scraping: @{channel_username}")
+        started = time.perf_counter()
 
         # Get or create channel in database
         channel_entity = await self.client.get_entity(channel_username)
-        db_channel = self._get_or_create_channel(channel_entity)
+        channel_db_id = self._get_or_create_channel(channel_entity)
 
         messages_processed = 0
         forwards_detected = 0
         private_leaks_detected = 0
+        write_seconds = 0.0
+        write_batches = 0
 
-        async for message in self.client.iter_messages(channel_username, limit=limit):
+        async for message in self.client.iter_messages(channel_entity, limit=limit):
             # Skip service messages
             if isinstance(message, MessageService):
                 continue
 
-            # Save message
-            db_message = self._save_message(message, db_channel.id)
+            # Buffer message
+            self._buffer_message(message, channel_db_id)
             messages_processed += 1
 
             # Check if this is a forwarded message
             if message.fwd_from:
-                forward_info = await self._process_forward(message, db_message, db_channel)
+                if await self._buffer_forward(message, channel_db_id):
+                    private_leaks_detected += 1
 
-                if forward_info:
-                    forwards_detected += 1
-
-                    # Check for private channel leak
-                    if forward_info.get("is_private_leak"):
-                        private_leaks_detected += 1
+            if len(self._pending_messages) >= self.batch_size:
+                flushed = self.flush()
+                forwards_detected += flushed["forwards_saved"]
+                write_seconds += flushed["seconds"]
+                write_batches += 1
 
             # Progress indicator
-            if messages_processed % 10 == 0:
+            if messages_processed % 100 == 0:
                 print(f"  Processed {messages_processed} messages...", end='\r')
 
+        flushed = self.flush()
+        forwards_detected += flushed["forwards_saved"]
+        write_seconds += flushed["seconds"]
+        write_batches += 1
+
+        elapsed = time.perf_counter() - started
+        messages_per_second = messages_processed / elapsed if elapsed > 0 else 0.0
+
         print(f"\n  ✓ Processed {messages_processed} messages")
         print(f"  ⤵️  Detected {forwards_detected} forwards")
         if private_leaks_detected > 0:
             print(f"  🔓 Detected {private_leaks_detected} private channel leaks")
+        print(f"  ⚡ {messages_per_second:.1f} msgs/sec "
+              f"({write_batches} write batches, {write_seconds:.2f}s of {elapsed:.2f}s in database writes)")
 
         return {
             "channel": channel_username,
             "messages_processed": messages_processed,
             "forwards_detected": forwards_detected,
-            "private_leaks": private_leaks_detected
+            "private_leaks": private_leaks_detected,
+            "elapsed_seconds": round(elapsed, 3),
+            "db_write_seconds": round(write_seconds, 3),
+            "messages_per_second": round(messages_per_second, 1)
         }
 
-    def _get_or_create_channel(self, channel_entity) -> TelegramChannel:
-        """Get or create channel in database"""
+    def _get_or_create_channel(self, channel_entity) -> int:
+        """Database id of the channel (cached; new channels are flushed, committed with the next batch)"""
+        telegram_id = str(channel_entity.id)
+        if telegram_id in self._channel_ids:
+            return self._channel_ids[telegram_id]
+
         if hasattr(channel_entity, 'username'):
             username = channel_entity.username
         else:
             username = str(channel_entity.id)
 
         channel = self.db.query(TelegramChannel).filter(
-            TelegramChannel.channel_id == str(channel_entity.id)
+            TelegramChannel.channel_id == telegram_id
         ).first()
 
         if not channel:
             channel = TelegramChannel(
-                channel_id=str(channel_entity.id),
+                channel_id=telegram_id,
                 username=username,
                 title=getattr(channel_entity, 'title', ''),
                 description=getattr(channel_entity, 'about', ''),
@@ -139,29 +201,18 @@ class TelegramForwardTracker:
                 language_primary='unknown'
             )
             self.db.add(channel)
-            self.db.commit()
-            self.db.refresh(channel)
-
-        return channel
-
-    def _save_message(self, message, channel_db_id: int) -> TelegramMessage:
-        """Save message to database"""
-        # Check if message already exists
-        existing = self.db.query(TelegramMessage).filter(
-            and_(
-                TelegramMessage.message_id == str(message.id),
-                TelegramMessage.channel_id == channel_db_id
-            )
-        ).first()
+            self.db.flush()
 
-        if existing:
-            return existing
+        self._channel_ids[telegram_id] = channel.id
+        self._channel_usernames[channel.id] = channel.username
+        return channel.id
 
-        # Create new message
+    def _buffer_message(self, message, channel_db_id: int):
+        """Queue a message for the next bulk write (existing messages are skipped at flush)"""
         db_message = TelegramMessage(
             message_id=str(message.id),
             channel_id=channel_db_id,
-            timestamp=message.date,
+            timestamp=_naive_utc(message.date),
             text_content=message.message if hasattr(message, 'message') else None,
             media_type=message.media.__class__.__name__ if message.media else None,
             views=message.views if hasattr(message, 'views') else 0,
@@ -176,14 +227,14 @@ class TelegramForwardTracker:
                 if hasattr(message.fwd_from, 'channel_post'):
                     db_message.forward_from_message_id = str(message.fwd_from.channel_post)
 
-        self.db.add(db_message)
-        self.db.commit()
-        self.db.refresh(db_message)
+        self._pending_messages.append(db_message)
 
-        return db_message
+    async def _buffer_forward(self, message, destination_channel_id: int) -> bool:
+        """
+        Queue the forward relationship (resolved against stored messages at flush)
 
-    async def _process_forward(self, message, db_message: TelegramMessage, destination_channel: TelegramChannel) -> Optional[Dict]:
-        """Process a forwarded message and track the forward relationship"""
+        Returns: True if the forward was recorded as a private channel leak
+        """
         fwd = message.fwd_from
 
         # Try to extract source channel info
@@ -201,96 +252,192 @@ class TelegramForwardTracker:
         if hasattr(fwd, 'channel_post'):
             source_message_id = fwd.channel_post
 
-        # If we have source channel ID, get or create it
-        source_db_channel = None
+        # If we have source channel ID, get or create it (entity lookups are cached)
+        source_db_channel_id = None
         if source_channel_id:
-            try:
-                # Try to get source channel info
-                source_entity = await self.client.get_entity(source_channel_id)
-                source_db_channel = self._get_or_create_channel(source_entity)
-            except Exception as e:
-                # Can't access source channel (private?)
+            if str(source_channel_id) in self._channel_ids:
+                source_db_channel_id = self._channel_ids[str(source_channel_id)]
+            elif source_channel_id in self._inaccessible_channels:
                 is_private_leak = True
-                print(f"    ⚠️  Can't access source channel {source_channel_id}: {e}")
+            else:
+                try:
+                    # Try to get source channel info
+                    source_entity = await self.client.get_entity(source_channel_id)
+                    source_db_channel_id = self._get_or_create_channel(source_entity)
+                except Exception as e:
+                    # Can't access source channel (private?)
+                    is_private_leak = True
+                    self._inaccessible_channels.add(source_channel_id)
+                    print(f"    ⚠️  Can't access source channel {source_channel_id}: {e}")
 
         # If this is a private channel leak, record it
         if is_private_leak:
-            self._record_private_leak(
+            self._buffer_private_leak(
                 private_channel_id=str(source_channel_id) if source_channel_id else "unknown",
-                public_channel_id=destination_channel.id,
-                leak_timestamp=message.date
+                public_channel_id=destination_channel_id,
+                leak_timestamp=_naive_utc(message.date)
             )
 
         # If we have both source and destination, record the forward
-        if source_db_channel and source_message_id:
-            # Find source message in database
-            source_db_message = self.db.query(TelegramMessage).filter(
-                and_(
-                    TelegramMessage.message_id == str(source_message_id),
-                    TelegramMessage.channel_id == source_db_channel.id
-                )
-            ).first()
-
-            if source_db_message:
-                # Calculate forward velocity (time between original and forward)
-                time_delta = message.date - source_db_message.timestamp
-                forward_velocity_seconds = int(time_delta.total_seconds())
-
-                # Check if this forward already exists
-                existing_forward = self.db.query(MessageForward).filter(
-                    and_(
-                        MessageForward.source_message_id == source_db_message.id,
-                        MessageForward.destination_message_id == db_message.id
-                    )
-                ).first()
-
-                if not existing_forward:
-                    forward_record = MessageForward(
-                        source_channel_id=source_db_channel.id,
-                        source_message_id=source_db_message.id,
-                        destination_channel_id=destination_channel.id,
-                        destination_message_id=db_message.id,
-                        forward_timestamp=message.date,
-                        forward_velocity_seconds=forward_velocity_seconds
-                    )
-                    self.db.add(forward_record)
-                    self.db.commit()
-
-                    return {
-                        "source_channel": source_db_channel.username,
-                        "destination_channel": destination_channel.username,
-                        "forward_velocity_seconds": forward_velocity_seconds,
-                        "is_private_leak": is_private_leak
-                    }
-
-        return None
-
-    def _record_private_leak(self, private_channel_id: str, public_channel_id: int, leak_timestamp: datetime):
-        """Record a private channel leak"""
-        existing = self.db.query(PrivateChannelLeak).filter(
-            and_(
-                PrivateChannelLeak.private_channel_id == private_channel_id,
-                PrivateChannelLeak.public_channel_id == public_channel_id
-            )
-        ).first()
-
-        if existing:
-            # Update frequency
-            existing.leak_frequency += 1
-            existing.last_leak_timestamp = leak_timestamp
+        if source_db_channel_id and source_message_id:
+            self._pending_forwards.append({
+                "source_key": (source_db_channel_id, str(source_message_id)),
+                "destination_key": (destination_channel_id, str(message.id)),
+                "forward_timestamp": _naive_utc(message.date)
+            })
+
+        return is_private_leak
+
+    def _buffer_private_leak(self, private_channel_id: str, public_channel_id: int, leak_timestamp: datetime):
+        """Aggregate a private channel leak until the next flush"""
+        pending = self._pending_leaks.get((private_channel_id, public_channel_id))
+        if pending:
+            pending["count"] += 1
+            pending["last"] = leak_timestamp
         else:
-            # Create new leak record
-            leak = PrivateChannelLeak(
-                private_channel_id=private_channel_id,
-                private_channel_name="Unknown (private)",
-                public_channel_id=public_channel_id,
-                first_leak_timestamp=leak_timestamp,
-                leak_frequency=1,
-                last_leak_timestamp=leak_timestamp
-            )
-            self.db.add(leak)
+            self._pending_leaks[(private_channel_id, public_channel_id)] = {
+                "count": 1, "first": leak_timestamp, "last": leak_timestamp
+            }
+
+    # ------------------------------------------------------------------
+    # Bulk writes
+    # ------------------------------------------------------------------
+
+    def flush(self) -> Dict:
+        """
+        Write buffered messages, forwards and leak updates in one transaction
+
+        Returns: {"messages_saved", "forwards_saved", "seconds"}
+        """
+        started = time.perf_counter()
+        try:
+            messages_saved = self._flush_messages()
+            forwards_saved = self._flush_forwards()
+            self._flush_private_leaks()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self._reset_caches()
+            raise
+
+        return {
+            "messages_saved": messages_saved,
+            "forwards_saved": forwards_saved,
+            "seconds": time.perf_counter() - started
+        }
 
-        self.db.commit()
+    def _load_message_ids(self, keys):
+        """Fill the message id cache for (channel id, message id) keys not cached yet"""
+        missing = defaultdict(set)
+        for channel_db_id, message_id in keys:
+            if (channel_db_id, message_id) not in self._message_ids:
+                missing[channel_db_id].add(message_id)
+
+        for channel_db_id, message_ids in missing.items():
+            for chunk in _chunks(sorted(message_ids)):
+                for message_id, row_id, timestamp in self.db.query(
+                    TelegramMessage.message_id, TelegramMessage.id, TelegramMessage.timestamp
+                ).filter(
+                    TelegramMessage.channel_id == channel_db_id,
+                    TelegramMessage.message_id.in_(chunk)
+                ):
+                    self._message_ids.setdefault((channel_db_id, message_id), (row_id, timestamp))
+
+    def _flush_messages(self) -> int:
+        pending, self._pending_messages = self._pending_messages, []
+        if not pending:
+            return 0
+
+        self._load_message_ids((m.channel_id, m.message_id) for m in pending)
+
+        new_messages = {}
+        for db_message in pending:
+            key = (db_message.channel_id, db_message.message_id)
+            if key not in self._message_ids and key not in new_messages:
+                new_messages[key] = db_message
+
+        if new_messages:
+            self.db.add_all(new_messages.values())
+            self.db.flush()
+            for key, db_message in new_messages.items():
+                self._message_ids[key] = (db_message.id, db_message.timestamp)
+
+        return len(new_messages)
+
+    def _flush_forwards(self) -> int:
+        pending, self._pending_forwards = self._pending_forwards, []
+        if not pending:
+            return 0
+
+        self._load_message_ids(forward["source_key"] for forward in pending)
+
+        resolved = []
+        for forward in pending:
+            source = self._message_ids.get(forward["source_key"])
+            destination = self._message_ids.get(forward["destination_key"])
+            if source and destination:
+                resolved.append((forward, source, destination))
+
+        # Forwards already stored for these destination messages
+        existing = set()
+        destination_ids = sorted({destination[0] for _, _, destination in resolved})
+        for chunk in _chunks(destination_ids):
+            existing.update(self.db.query(
+                MessageForward.source_message_id, MessageForward.destination_message_id
+            ).filter(MessageForward.destination_message_id.in_(chunk)))
+
+        new_forwards = []
+        for forward, (source_id, source_timestamp), (destination_id, _) in resolved:
+            if (source_id, destination_id) in existing:
+                continue
+            existing.add((source_id, destination_id))
+
+            # Calculate forward velocity (time between original and forward)
+            forward_velocity_seconds = int((forward["forward_timestamp"] - source_timestamp).total_seconds())
+
+            new_forwards.append(MessageForward(
+                source_channel_id=forward["source_key"][0],
+                source_message_id=source_id,
+                destination_channel_id=forward["destination_key"][0],
+                destination_message_id=destination_id,
+                forward_timestamp=forward["forward_timestamp"],
+                forward_velocity_seconds=forward_velocity_seconds
+            ))
+
+        self.db.add_all(new_forwards)
+        return len(new_forwards)
+
+    def _flush_private_leaks(self):
+        pending, self._pending_leaks = self._pending_leaks, {}
+        if not pending:
+            return
+
+        private_ids = sorted({private_id for private_id, _ in pending})
+        public_ids = sorted({public_id for _, public_id in pending})
+        existing = {}
+        for chunk in _chunks(private_ids):
+            for leak in self.db.query(PrivateChannelLeak).filter(
+                PrivateChannelLeak.private_channel_id.in_(chunk),
+                PrivateChannelLeak.public_channel_id.in_(public_ids)
+            ):
+                existing.setdefault((leak.private_channel_id, leak.public_channel_id), leak)
+
+        for (private_channel_id, public_channel_id), update in pending.items():
+            leak = existing.get((private_channel_id, public_channel_id))
+            if leak:
+                # Update frequency
+                leak.leak_frequency = (leak.leak_frequency or 0) + update["count"]
+                leak.last_leak_timestamp = update["last"]
+            else:
+                # Create new leak record
+                self.db.add(PrivateChannelLeak(
+                    private_channel_id=private_channel_id,
+                    private_channel_name="Unknown (private)",
+                    public_channel_id=public_channel_id,
+                    first_leak_timestamp=update["first"],
+                    leak_frequency=update["count"],
+                    last_leak_timestamp=update["last"]
+                ))
 
     def detect_coordinated_forwarding(self, time_window_minutes: int = 30, min_channels: int = 5) -> List[Dict]:
         """
@@ -305,53 +452,11 @@ class TelegramForwardTracker:
         """
         print(f"\n🔍 Detecting coordinated forwarding (≥{min_channels} channels in {time_window_minutes}min)...")
 
-        # Group forwards by source message
-        forwards = self.db.query(MessageForward).order_by(MessageForward.forward_timestamp).all()
-
-        source_message_forwards = defaultdict(list)
-        for forward in forwards:
-            source_message_forwards[forward.source_message_id].append(forward)
-
-        coordinated_events = []
-
-        for source_msg_id, forward_list in source_message_forwards.items():
-            if len(forward_list) < min_channels:
-                continue
+        run = run_detection(self.db, time_window_minutes=time_window_minutes, min_channels=min_channels)
+        coordinated_events = serialize_events(self.db, run)
 
-            # Sort by timestamp
-            forward_list.sort(key=lambda f: f.forward_timestamp)
-
-            # Check if all forwards happened within time window
-            first_forward = forward_list[0].forward_timestamp
-            last_forward = forward_list[-1].forward_timestamp
-            time_diff = (last_forward - first_forward).total_seconds() / 60
-
-            if time_diff <= time_window_minutes:
-                # Get source message
-                source_msg = self.db.query(TelegramMessage).get(source_msg_id)
-                if not source_msg:
-                    continue
-
-                # Get all destination channels
-                dest_channels = []
-                for fwd in forward_list:
-                    channel = self.db.query(TelegramChannel).get(fwd.destination_channel_id)
-                    if channel:
-                        dest_channels.append(channel.username or channel.channel_id)
-
-                event = {
-                    "source_message_id": source_msg_id,
-                    "source_channel_id": source_msg.channel_id,
-                    "destination_count": len(forward_list),
-                    "destination_channels": dest_channels,
-                    "time_window_minutes": time_diff,
-                    "first_forward": first_forward.isoformat(),
-                    "last_forward": last_forward.isoformat(),
-                    "message_preview": source_msg.text_content[:100] if source_msg.text_content else ""
-                }
-
-                coordinated_events.append(event)
-                print(f"  ⚡ Coordinated forward: {len(forward_list)} channels in {time_diff:.1f} min")
+        for event in coordinated_events:
+            print(f"  ⚡ Coordinated forward: {event['destination_count']} channels in {event['time_window_minutes']:.1f} min")
 
         return coordinated_events
 
@@ -421,6 +526,7 @@ async def main():
     parser = argparse.ArgumentParser(description="Telegram Forward Tracker")
     parser.add_argument("--channels", nargs="+", help="Channel usernames to scrape (without @)")
     parser.add_argument("--limit", type=int, default=100, help="Messages per channel")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Messages per bulk write transaction")
     parser.add_argument("--detect-coordination", action="store_true", help="Detect coordinated forwarding")
     parser.add_argument("--influence-map", action="store_true", help="Build influence map")
     parser.add_argument("--time-window", type=int, default=30, help="Coordination time window (minutes)")
@@ -428,7 +534,7 @@ async def main():
 
     args = parser.parse_args()
 
-    tracker = TelegramForwardTracker()
+    tracker = TelegramForwardTracker(batch_size=args.batch_size)
 
     if args.channels:
         await tracker.initialize_client()
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Concurrent Telegram Scraper Engine
+
+Shared engine behind the Telethon scraping scripts. It replaces the
+one-channel-at-a-time loops with fixed sleeps:
+
+- N channels are scraped concurrently over one Telethon client, highest
+  priority first
+- One adaptive rate limiter spaces out all API requests. A FloodWaitError
+  pauses every worker for the requested time and widens the spacing; the
+  spacing narrows again while requests succeed
+- Each scraper keeps a per-channel min_id watermark in telegram_scrape_state,
+  so a run only fetches messages newer than the last one it processed. The
+  watermark advances only after the channel's messages were handled (or,
+  with defer_watermarks, when the caller has saved its output), so an
+  interrupted run resumes where it stopped. Channels and watermarks live in
+  the database the caller stores messages in (main one by default)
+- Channel lists can come from telegram_channels.scrape_priority; channels
+  passed by the scripts are registered there with their priority
+
+Usage:
+    python backend/telegram_scraper.py                     # All prioritized channels → telegram_messages
+    python backend/telegram_scraper.py --max-priority 1 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import and_, create_engine, func, or_
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.database import SessionLocal, upgrade_telegram_channels
+from backend.models import TelegramChannel, TelegramMessage, TelegramScrapeState
+
+try:
+    from telethon import TelegramClient
+    from telethon.errors import FloodWaitError
+    TELETHON_AVAILABLE = True
+except ImportError:
+    TELETHON_AVAILABLE = False
+
+SESSION_NAME = 'osint_session'
+
+DEFAULT_CONCURRENCY = 4
+PAGE_SIZE = 100  # Messages per API request (Telegram maximum)
+
+# Spacing between API requests across all workers (seconds)
+MIN_REQUEST_INTERVAL = 0.5
+MAX_REQUEST_INTERVAL = 10.0
+
+# History depth on a channel's first scrape (later runs fetch everything new)
+DEFAULT_INITIAL_LIMIT = 200
+
+
+class AdaptiveRateLimiter:
+    """Shared request spacing that backs off on flood waits"""
+
+    def __init__(self, min_interval: float = MIN_REQUEST_INTERVAL, max_interval: float = MAX_REQUEST_INTERVAL):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.requests = 0
+        self.flood_waits = 0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait for the next request slot"""
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def succeeded(self):
+        self.requests += 1
+        self.interval = max(self.min_interval, self.interval * 0.95)
+
+    def flood_wait(self, seconds: int):
+        """Pause all workers for `seconds` and widen the spacing"""
+        self.flood_waits += 1
+        self.interval = min(self.max_interval, self.interval * 2)
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds + 1)
+        print(f"   ⏳ Flood wait: pausing all requests for {seconds}s (spacing now {self.interval:.1f}s)")
+
+
+@dataclass
+class ScrapeTarget:
+    username: str
+    priority: Optional[int] = None  # Lower = scraped first; stored in telegram_channels
+    initial_limit: int = DEFAULT_INITIAL_LIMIT  # History depth when there is no watermark yet
+    label: Optional[str] = None  # Free-form tag for the caller (e.g. tier)
+
+
+@dataclass
+class ChannelScrape:
+    target: ScrapeTarget
+    entity: object = None
+    channel_db_id: Optional[int] = None
+    messages: List = field(default_factory=list)  # Telethon messages, oldest first
+    min_id: int = 0  # Watermark the fetch started from
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def targets_from_db(max_priority: Optional[int] = None, initial_limit: int = DEFAULT_INITIAL_LIMIT) -> List[ScrapeTarget]:
+    """Channels with a scrape_priority, highest priority first"""
+    db = SessionLocal()
+    try:
+        query = db.query(TelegramChannel.username, TelegramChannel.scrape_priority).filter(
+            TelegramChannel.scrape_priority.isnot(None),
+            TelegramChannel.username.isnot(None)
+        )
+        if max_priority is not None:
+            query = query.filter(TelegramChannel.scrape_priority <= max_priority)
+        return [
+            ScrapeTarget(username, priority=priority, initial_limit=initial_limit)
+            for username, priority in query.order_by(TelegramChannel.scrape_priority, TelegramChannel.username)
+        ]
+    finally:
+        db.close()
+
+
+def staging_session_factory(db_path: str) -> Callable[[], Session]:
+    """Sessions on another database (e.g. staging), with the channel and watermark tables"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    TelegramChannel.__table__.create(engine, checkfirst=True)
+    TelegramScrapeState.__table__.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        upgrade_telegram_channels(conn)  # Copies of older databases lack scrape_priority
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class TelegramScraperEngine:
+    """Scrape many channels concurrently over one client"""
+
+    def __init__(self, client, scraper: str, concurrency: int = DEFAULT_CONCURRENCY,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None, incremental: bool = True,
+                 defer_watermarks: bool = False, session_factory: Callable[[], Session] = SessionLocal):
+        """
+        Args:
+            client: Connected, authorized TelegramClient
+            scraper: Watermark namespace (each script keeps its own progress)
+            concurrency: Channels scraped at the same time
+            incremental: False = always fetch the latest `initial_limit` messages
+                         and leave watermarks untouched (sampling / validation)
+            defer_watermarks: Keep watermarks pending until commit_watermarks()
+                              (for handlers that only collect, with output
+                              written after run() returns)
+            session_factory: Database for channel rows and watermarks; must be
+                             the one the handler writes messages to
+        """
+        self.client = client
+        self.scraper = scraper
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.incremental = incremental
+        self.defer_watermarks = defer_watermarks
+        self.session_factory = session_factory
+        self._pending_watermarks: List[ChannelScrape] = []
+
+        # Flood waits are handled by the shared limiter, not per request
+        self.client.flood_sleep_threshold = 0
+
+    async def run(self, targets: List[ScrapeTarget], handler: Optional[Callable] = None) -> List[ChannelScrape]:
+        """
+        Scrape all targets and call `handler(scrape)` for each channel
+
+        The handler receives the ChannelScrape (new messages oldest first) and
+        runs before the watermark advances; if it raises, the channel's
+        messages are fetched again next run. With defer_watermarks the
+        watermarks only advance in commit_watermarks().
+
+        Returns: ChannelScrape per target, in priority order
+        """
+        ordered = sorted(targets, key=lambda t: (t.priority is None, t.priority or 0))
+        queue = asyncio.Queue()
+        for position, target in enumerate(ordered):
+            queue.put_nowait((position, target))
+
+        results: List[Optional[ChannelScrape]] = [None] * len(ordered)
+        started = time.perf_counter()
+
+        async def worker():
+            while True:
+                try:
+                    position, target = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results[position] = await self._scrape(target, handler)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, min(self.concurrency, len(ordered))))))
+
+        fetched = sum(len(result.messages) for result in results if not result.error)
+        failed = sum(1 for result in results if result.error)
+        print(f"\n✓ Scraped {len(results) - failed}/{len(results)} channels, {fetched} new messages "
+              f"in {time.perf_counter() - started:.1f}s "
+              f"({self.rate_limiter.requests} requests, {self.rate_limiter.flood_waits} flood waits)")
+        return results
+
+    async def _call(self, method, *args, **kwargs):
+        """Telethon request through the shared rate limiter (retried after flood waits)"""
+        while True:
+            await self.rate_limiter.acquire()
+            try:
+                result = await method(*args, **kwargs)
+            except FloodWaitError as e:
+                self.rate_limiter.flood_wait(e.seconds)
+                continue
+            self.rate_limiter.succeeded()
+            return result
+
+    async def _scrape(self, target: ScrapeTarget, handler: Optional[Callable]) -> ChannelScrape:
+        scrape = ChannelScrape(target)
+        started = time.perf_counter()
+        try:
+            scrape.entity = await self._call(self.client.get_entity, target.username)
+            scrape.channel_db_id, scrape.min_id = self._register_channel(target, scrape.entity)
+            scrape.messages = await self._fetch_new_messages(scrape.entity, scrape.min_id, target.initial_limit)
+            if handler:
+                handler(scrape)
+        except Exception as e:
+            scrape.error = str(e)
+
+        if self.defer_watermarks:
+            self._pending_watermarks.append(scrape)
+        else:
+            self._save_watermark(scrape)
+
+        scrape.seconds = time.perf_counter() - started
+        if scrape.error:
+            print(f"   ❌ @{target.username}: {scrape.error}")
+        else:
+            print(f"   ✓ @{target.username}: {len(scrape.messages)} new messages "
+                  f"(since id {scrape.min_id}, {scrape.seconds:.1f}s)")
+        return scrape
+
+    async def _fetch_new_messages(self, entity, min_id: int, initial_limit: int) -> List:
+        """Messages with id > min_id, paging backwards from the newest (oldest first)"""
+        limit = None if min_id else initial_limit
+        messages = []
+        max_id = 0  # 0 = no upper bound
+
+        while limit is None or len(messages) < limit:
+            page_size = PAGE_SIZE if limit is None else min(PAGE_SIZE, limit - len(messages))
+            page = await self._call(self.client.get_messages, entity, limit=page_size, min_id=min_id, max_id=max_id)
+            if not page:
+                break
+            messages.extend(page)
+            max_id = page[-1].id
+            if len(page) < page_size:
+                break
+
+        messages.reverse()
+        return messages
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _register_channel(self, target: ScrapeTarget, entity):
+        """Get or create the channel row (with priority) and return (id, watermark)"""
+        db = self.session_factory()
+        try:
+            channel = db.query(TelegramChannel).filter(or_(
+                TelegramChannel.channel_id == str(entity.id),
+                func.lower(TelegramChannel.username) == target.username.lower()
+            )).order_by(TelegramChannel.id).first()
+
+            if not channel:
+                channel = TelegramChannel(
+                    channel_id=str(entity.id),
+                    username=getattr(entity, 'username', None) or target.username,
+                    first_discovered=datetime.utcnow(),
+                    channel_type='public' if getattr(entity, 'username', None) else 'private'
+                )
+                db.add(channel)
+
+            channel.title = getattr(entity, 'title', None) or channel.title
+            channel.member_count = getattr(entity, 'participants_count', None) or channel.member_count
+            if target.priority is not None and (channel.scrape_priority is None or target.priority < channel.scrape_priority):
+                channel.scrape_priority = target.priority
+            db.commit()
+
+            min_id = 0
+            if self.incremental:
+                state = db.get(TelegramScrapeState, (self.scraper, channel.id))
+                min_id = state.min_id if state else 0
+            return channel.id, min_id
+        finally:
+            db.close()
+
+    def commit_watermarks(self) -> int:
+        """Save the watermarks deferred by run() (call once the output is stored)"""
+        pending, self._pending_watermarks = self._pending_watermarks, []
+        for scrape in pending:
+            self._save_watermark(scrape)
+        return len(pending)
+
+    def _save_watermark(self, scrape: ChannelScrape):
+        if not self.incremental or scrape.channel_db_id is None:
+            return
+        db = self.session_factory()
+        try:
+            state = db.get(TelegramScrapeState, (self.scraper, scrape.channel_db_id))
+            if not state:
+                state = TelegramScrapeState(scraper=self.scraper, channel_id=scrape.channel_db_id, min_id=0,
+                                            messages_fetched=0)
+                db.add(state)
+            if not scrape.error and scrape.messages:
+                state.min_id = max(state.min_id, max(message.id for message in scrape.messages))
+                state.messages_fetched += len(scrape.messages)
+
+                channel = db.get(TelegramChannel, scrape.channel_db_id)
+                newest = _naive_utc(scrape.messages[-1].date)
+                if newest and (channel.last_active is None or newest > channel.last_active):
+                    channel.last_active = newest
+            state.last_scraped_at = datetime.utcnow()
+            state.last_error = scrape.error
+            db.commit()
+        finally:
+            db.close()
+
+
+def save_messages(scrape: ChannelScrape) -> int:
+    """Handler storing new messages in telegram_messages (skips ones already stored)"""
+    if not scrape.messages:
+        return 0
+    db = SessionLocal()
+    try:
+        message_ids = [str(message.id) for message in scrape.messages]
+        existing = {
+            message_id for (message_id,) in db.query(TelegramMessage.message_id).filter(and_(
+                TelegramMessage.channel_id == scrape.channel_db_id,
+                TelegramMessage.message_id.in_(message_ids)
+            ))
+        }
+        rows = [
+            TelegramMessage(
+                message_id=str(message.id),
+                channel_id=scrape.channel_db_id,
+                timestamp=_naive_utc(message.date),
+                text_content=message.message or None,
+                media_type=message.media.__class__.__name__ if message.media else None,
+                views=message.views or 0,
+                engagement_score=float(message.views or 0)
+            )
+            for message in scrape.messages
+            if str(message.id) not in existing and message.date
+        ]
+        db.add_all(rows)
+        db.commit()
+        return len(rows)
+    finally:
+        db.close()
+
+
+async def connect_client(session_name: str = SESSION_NAME):
+    """Connected TelegramClient using TELEGRAM_API_ID / TELEGRAM_API_HASH (must already be authorized)"""
+    if not TELETHON_AVAILABLE:
+        raise ImportError("Telethon is required. Install with: pip install telethon")
+    api_id = os.getenv('TELEGRAM_API_ID')
+    api_hash = os.getenv('TELEGRAM_API_HASH')
+    if not api_id or not api_hash:
+        raise ValueError("TELEGRAM_API_ID and TELEGRAM_API_HASH must be set")
+
+    client = TelegramClient(session_name, int(api_id), api_hash)
+    await client.connect()
+    if not await client.is_user_authorized():
+        await client.disconnect()
+        raise RuntimeError("Not authorized. Run authorization script first.")
+    return client
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Scrape prioritized channels from telegram_channels")
+    parser.add_argument("--max-priority", type=int, help="Only channels with scrape_priority <= this")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--initial-limit", type=int, default=DEFAULT_INITIAL_LIMIT,
+                        help="History depth for channels scraped for the first time")
+    args = parser.parse_args()
+
+    targets = targets_from_db(args.max_priority, args.initial_limit)
+    if not targets:
+        print("ℹ️  No channels with a scrape_priority in telegram_channels")
+        return
+
+    print(f"📡 Scraping {len(targets)} channels ({args.concurrency} concurrent)")
+    client = await connect_client()
+    try:
+        engine = TelegramScraperEngine(client, scraper='telegram_messages', concurrency=args.concurrency)
+        saved = [0]
+
+        def store(scrape):
+            saved[0] += save_messages(scrape)
+
+        await engine.run(targets, store)
+        print(f"💾 Stored {saved[0]} messages in telegram_messages")
+    finally:
+        await client.disconnect()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    asyncio.run(main())
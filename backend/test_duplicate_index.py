@@ -0,0 +1,103 @@
+"""
+Write-time duplicate check: the (date bucket, geohash) index must find exactly
+the matches of scanning every active incident with is_duplicate_incident.
+"""
+
+import random
+from datetime import date, timedelta
+
+from backend.duplicate_index import ACTIVE_OPERATIONAL_CLASSES, DuplicateIndex, _entry
+from backend.incident_deduplication import is_duplicate_incident
+from backend.models import Incident
+
+# Airports a few to a few hundred km apart, so some pairs straddle the 50 km limit
+SITES = [(50.9009, 4.4844), (51.3167, 5.3833), (51.5378, 5.6864), (51.8560, 4.4432), (49.4372, 7.6084)]
+TITLES = [
+    "Drone sighted over {} air base",
+    "Drones spotted near {} airport, flights halted",
+    "Unidentified drone activity reported at {}",
+]
+PLACES = ["Volkel", "Kleine Brogel", "Brussels", "Rotterdam", "Ramstein"]
+OPERATIONAL_CLASSES = list(ACTIVE_OPERATIONAL_CLASSES) + ["DUPLICATE", "FALSE_POSITIVE"]
+
+
+def random_incident(rng: random.Random, incident_id=None) -> Incident:
+    lat, lon = rng.choice(SITES)
+    located = rng.random() > 0.1
+    return Incident(
+        id=incident_id,
+        title=rng.choice(TITLES).format(rng.choice(PLACES)),
+        description=f"Police confirmed {rng.randint(1, 4)} drones near the perimeter",
+        source="test",
+        sighting_date=date(2025, 10, 1) + timedelta(days=rng.randint(0, 20)),
+        latitude=lat + rng.uniform(-0.4, 0.4) if located else 0.0,
+        longitude=lon + rng.uniform(-0.4, 0.4) if located else 0.0,
+        restricted_area_id=rng.choice([None, 1, 2]),
+        operational_class=rng.choice(OPERATIONAL_CLASSES),
+    )
+
+
+def scan_matches(active_entries, entry):
+    """The old write-time check: score every active incident"""
+    return {
+        candidate["id"] for candidate in active_entries
+        if is_duplicate_incident(candidate, entry)[0]
+    }
+
+
+def test_index_matches_full_scan(db):
+    rng = random.Random(14)
+    incidents = [random_incident(rng, incident_id) for incident_id in range(1, 401)]
+    db.add_all(incidents)
+    db.commit()
+
+    index = DuplicateIndex()
+    index.rebuild(db)
+    active_entries = [entry for entry in map(_entry, incidents) if entry is not None]
+    assert len(index._entries) == len(active_entries)
+
+    probes_with_matches = 0
+    for _ in range(300):
+        probe = random_incident(rng)
+        probe.operational_class = None
+        entry = _entry(probe)
+
+        indexed = {
+            candidate["id"] for candidate in index.candidates(db, entry)
+            if is_duplicate_incident(candidate, entry)[0]
+        }
+        expected = scan_matches(active_entries, entry)
+        assert indexed == expected, (entry, indexed, expected)
+        probes_with_matches += bool(expected)
+
+    assert probes_with_matches > 50  # The data actually exercises matches
+
+
+def test_committed_changes_keep_index_equivalent(db):
+    rng = random.Random(140)
+    incidents = [random_incident(rng, incident_id) for incident_id in range(1, 101)]
+    db.add_all(incidents)
+    db.commit()
+
+    index = DuplicateIndex()
+    index.rebuild(db)
+
+    # Same (id, entry) changes the Session listener hands over on commit
+    moved = incidents[0]
+    moved.sighting_date = moved.sighting_date + timedelta(days=5)
+    incidents[1].operational_class = "DUPLICATE"
+    added = random_incident(rng, 101)
+    added.operational_class = None
+    index.apply_changes([(moved.id, _entry(moved)), (incidents[1].id, None), (added.id, _entry(added))])
+
+    active_entries = [entry for entry in map(_entry, incidents[2:] + [moved, added]) if entry is not None]
+    for _ in range(100):
+        probe = random_incident(rng)
+        probe.operational_class = None
+        entry = _entry(probe)
+        indexed = {
+            candidate["id"] for candidate in index.candidates(db, entry)
+            if is_duplicate_incident(candidate, entry)[0]
+        }
+        assert indexed == scan_matches(active_entries, entry)
+
@@ -0,0 +1,75 @@
+"""
+Intelligence link upserts on the partial unique keys of intelligence_links:
+entity links are keyed by entity_b_id, pseudo-entity links (entity_b_id 0)
+by entity_b_identifier.
+"""
+
+from sqlalchemy.orm import Session
+
+from backend.link_analysis_engine import upsert_intelligence_links
+from backend.models import IntelligenceLink
+
+
+def link(entity_b_id: int, entity_b_identifier: str, link_strength: float, relationship_type: str = "temporal"):
+    return {
+        "entity_a_type": "incident", "entity_a_id": 1, "entity_a_identifier": "Incident #1",
+        "entity_b_type": "message", "entity_b_id": entity_b_id, "entity_b_identifier": entity_b_identifier,
+        "relationship_type": relationship_type, "link_strength": link_strength,
+        "confidence_score": link_strength, "evidence_count": 1, "discovered_by": "test",
+    }
+
+
+def rows(db: Session):
+    return {
+        (row.entity_b_id, row.entity_b_identifier, row.relationship_type): row.link_strength
+        for row in db.query(IntelligenceLink)
+    }
+
+
+def test_rediscovered_link_is_updated_in_place(db):
+    upsert_intelligence_links(db, [link(10, "msg 10", 0.4)])
+    upsert_intelligence_links(db, [link(10, "message #10", 0.9)])
+    db.commit()
+
+    assert db.query(IntelligenceLink).count() == 1
+    row = db.query(IntelligenceLink).one()
+    assert (row.entity_b_identifier, row.link_strength) == ("message #10", 0.9)
+
+
+def test_relationship_type_is_part_of_the_key(db):
+    upsert_intelligence_links(db, [link(10, "msg 10", 0.4), link(10, "msg 10", 0.6, "spatial")])
+    db.commit()
+
+    assert rows(db) == {(10, "msg 10", "temporal"): 0.4, (10, "msg 10", "spatial"): 0.6}
+
+
+def test_pseudo_entities_are_keyed_by_identifier(db):
+    upsert_intelligence_links(db, [link(0, "+31 6 1111", 0.5), link(0, "+31 6 2222", 0.5), link(10, "msg 10", 0.3)])
+    upsert_intelligence_links(db, [link(0, "+31 6 1111", 0.8), link(10, "msg 10", 0.7)])
+    db.commit()
+
+    assert rows(db) == {
+        (0, "+31 6 1111", "temporal"): 0.8,
+        (0, "+31 6 2222", "temporal"): 0.5,
+        (10, "msg 10", "temporal"): 0.7,
+    }
+
+
+def test_analyst_fields_survive_rediscovery(db):
+    upsert_intelligence_links(db, [link(10, "msg 10", 0.4)])
+    db.commit()
+    row = db.query(IntelligenceLink).one()
+    row.analyst_verified = True
+    row.analyst_notes = "Confirmed by analyst"
+    db.commit()
+
+    written = upsert_intelligence_links(db, [link(10, "msg 10", 0.9)])
+    db.commit()
+    db.expire_all()
+
+    assert written == 1
+    row = db.query(IntelligenceLink).one()
+    assert row.link_strength == 0.9
+    assert row.analyst_verified is True
+    assert row.analyst_notes == "Confirmed by analyst"
+
@@ -0,0 +1,77 @@
+"""
+LLM gateway behaviour against the deterministic stub backend:
+bounded concurrency, retry/backoff on transient errors and cache hits.
+"""
+
+import threading
+import time
+
+import pytest
+
+from backend.llm_gateway import LLMGateway, StubBackend, StubError
+
+
+def make_gateway(tmp_path, backend, **kwargs) -> LLMGateway:
+    return LLMGateway(backend=backend, cache_path=str(tmp_path / "llm_cache.db"), backoff_base=0.001, **kwargs)
+
+
+def test_concurrency_is_bounded(tmp_path):
+    lock = threading.Lock()
+    in_flight = [0]
+    peak = [0]
+
+    def responder(prompt):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return prompt.upper()
+
+    gateway = make_gateway(tmp_path, StubBackend(responder=responder), max_concurrency=3)
+    results = gateway.complete_many([{"prompt": f"prompt {i}"} for i in range(12)])
+
+    assert results == [f"PROMPT {i}" for i in range(12)]  # Input order is kept
+    assert peak[0] == 3
+    assert gateway.stats()["backend_calls"] == 12
+
+
+def test_transient_errors_are_retried(tmp_path):
+    backend = StubBackend(transient_failures=2)
+    gateway = make_gateway(tmp_path, backend, max_retries=4)
+
+    text = gateway.complete("retry me")
+
+    assert '"stub": true' in text
+    assert backend.calls == 3
+    stats = gateway.stats()
+    assert stats["retries"] == 2
+    assert stats["errors"] == 0
+
+
+def test_retries_give_up_after_max_retries(tmp_path):
+    backend = StubBackend(transient_failures=5)
+    gateway = make_gateway(tmp_path, backend, max_retries=2)
+
+    with pytest.raises(StubError):
+        gateway.complete("always overloaded")
+
+    assert backend.calls == 3  # First attempt + 2 retries
+    assert gateway.stats()["errors"] == 1
+
+
+def test_repeated_prompt_is_served_from_cache(tmp_path):
+    backend = StubBackend()
+    gateway = make_gateway(tmp_path, backend)
+
+    first = gateway.complete("same prompt", max_tokens=100)
+    second = gateway.complete("same prompt", max_tokens=100)
+    other = gateway.complete("same prompt", max_tokens=200)  # Parameters are part of the key
+
+    assert first == second == other
+    assert backend.calls == 2
+    stats = gateway.stats()
+    assert stats["requests"] == 3
+    assert stats["cache_hits"] == 1
+
@@ -0,0 +1,89 @@
+"""
+Keyset pagination: cursor round-trip and tie-breaking on equal sort keys.
+"""
+
+from datetime import date, datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from backend.models import Incident
+from backend.pagination import decode_cursor, encode_cursor, paginate
+
+# (id, report_date): three share one date, two have none
+REPORT_DATES = [
+    (1, datetime(2025, 3, 1, 12, 0)),
+    (2, datetime(2025, 3, 2, 8, 30)),
+    (3, datetime(2025, 3, 2, 8, 30)),
+    (4, None),
+    (5, datetime(2025, 3, 2, 8, 30)),
+    (6, datetime(2025, 2, 27, 23, 59)),
+    (7, None),
+]
+
+
+def add_incidents(db: Session):
+    for incident_id, report_date in REPORT_DATES:
+        db.add(Incident(
+            id=incident_id, title=f"Incident {incident_id}", description="-", source="test",
+            sighting_date=date(2025, 3, 1), latitude=52.0, longitude=5.0, report_date=report_date
+        ))
+    db.flush()
+    # report_date defaults to now on insert; clear it for the rows without one
+    missing = [incident_id for incident_id, report_date in REPORT_DATES if report_date is None]
+    db.query(Incident).filter(Incident.id.in_(missing)).update({Incident.report_date: None})
+    db.commit()
+
+
+def all_pages(db: Session, descending: bool, limit: int):
+    ids, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = paginate(
+            db.query(Incident), Incident.report_date, Incident.id, descending, limit, cursor=cursor
+        )
+        ids.extend(row.id for row in rows)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+def test_cursor_round_trip():
+    values = [datetime(2025, 3, 2, 8, 30, 15), 42]
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, [Incident.report_date, Incident.id]) == values
+
+    assert decode_cursor(encode_cursor([date(2025, 3, 2), 7]), [Incident.sighting_date, Incident.id]) == [date(2025, 3, 2), 7]
+    assert decode_cursor(encode_cursor([None, 4]), [Incident.report_date, Incident.id]) == [None, 4]
+
+
+def test_invalid_cursor_is_rejected():
+    for cursor in ["not-a-cursor", encode_cursor([1, 2, 3])]:
+        with pytest.raises(HTTPException) as error:
+            decode_cursor(cursor, [Incident.report_date, Incident.id])
+        assert error.value.status_code == 400
+
+
+def test_pages_follow_sort_then_id_order(db):
+    add_incidents(db)
+    # Equal report dates are ordered by id; NULLs sort lowest (SQLite order)
+    assert all_pages(db, descending=True, limit=2) == ([5, 3, 2, 1, 6, 7, 4], 4)
+    assert all_pages(db, descending=False, limit=2) == ([4, 7, 6, 1, 2, 3, 5], 4)
+
+
+def test_ties_split_across_pages(db):
+    add_incidents(db)
+    for limit in range(1, len(REPORT_DATES) + 1):
+        descending, _ = all_pages(db, descending=True, limit=limit)
+        ascending, _ = all_pages(db, descending=False, limit=limit)
+        assert descending == [5, 3, 2, 1, 6, 7, 4]
+        assert ascending == [4, 7, 6, 1, 2, 3, 5]
+
+
+def test_last_page_has_no_cursor(db):
+    add_incidents(db)
+    rows, cursor = paginate(db.query(Incident), Incident.report_date, Incident.id, True, len(REPORT_DATES))
+    assert len(rows) == len(REPORT_DATES)
+    assert cursor is None
+
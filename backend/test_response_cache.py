@@ -0,0 +1,82 @@
+"""
+Response cache: TTL expiry, LRU eviction of the memory tier and of the
+SQLite tier, and persistence across instances.
+"""
+
+from backend.response_cache import ResponseCache
+
+
+def test_entries_expire_after_their_ttl(tmp_path):
+    cache = ResponseCache("articles", ttl_seconds=3600, path=str(tmp_path / "response_cache.db"))
+    cache.set("fresh", {"title": "Drone over Volkel"})
+    cache.set("stale", ["expired"], ttl_seconds=0)
+
+    assert cache.get("fresh") == {"title": "Drone over Volkel"}
+    assert cache.get("stale") is None
+    assert cache.get("stale", default=[]) == []
+    assert len(cache) == 1  # The expired row was removed when read
+    assert cache.stats()["expired"] == 1
+
+
+def test_expired_rows_are_trimmed(tmp_path):
+    cache = ResponseCache("articles", path=str(tmp_path / "response_cache.db"))
+    for i in range(5):
+        cache.set(f"old {i}", i, ttl_seconds=0)
+    cache.set("kept", 1)
+
+    assert cache.trim() == 0  # Nothing evicted for size, expired rows counted apart
+    assert len(cache) == 1
+    assert cache.stats()["expired"] == 5
+
+
+def test_memory_tier_keeps_most_recently_used(tmp_path):
+    path = str(tmp_path / "response_cache.db")
+    cache = ResponseCache("facts", memory_entries=2, path=path)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")      # a is now more recent than b
+    cache.set("c", 3)   # evicts b from memory (still on disk)
+
+    cache.reset_stats()
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get("b") == 2
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"]) == (2, 1)
+    assert stats["memory_entries"] == 2
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    # No memory tier, so every read refreshes the row's recency in SQLite
+    cache = ResponseCache("facts", max_entries=3, memory_entries=0, path=str(tmp_path / "response_cache.db"))
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    cache.get("a")
+    cache.set("d", "d")  # Over max_entries: b is the least recently used
+
+    assert len(cache) == 3
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["a", "c", "d"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_namespaces_share_a_file_but_not_keys(tmp_path):
+    path = str(tmp_path / "response_cache.db")
+    articles = ResponseCache("articles", path=path)
+    facts = ResponseCache("facts", path=path)
+    articles.set("key", "article")
+    facts.set("key", "fact")
+    facts.clear()
+
+    assert articles.get("key") == "article"
+    assert facts.get("key") is None
+
+
+def test_entries_survive_a_new_instance(tmp_path):
+    path = str(tmp_path / "response_cache.db")
+    ResponseCache("llm", path=path).set("prompt", "answer")
+
+    reopened = ResponseCache("llm", path=path)
+    assert reopened.get("prompt") == "answer"
+    assert reopened.stats()["disk_hits"] == 1
+
@@ -14,6 +14,7 @@ Cron setup (run daily at 6 AM):
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict
 
@@ -114,6 +115,9 @@ COUNTRY_KEYWORDS = {
 
 COUNTRIES = list(COUNTRY_KEYWORDS.keys())
 
+# Keyword searches in flight against the API at once
+SEARCH_WORKERS = 4
+
 
 def log(message: str):
     """Timestamped logging"""
@@ -145,35 +149,41 @@ def search_news_for_incidents():
     """Search news sources for new drone incidents"""
     log("🔍 Starting daily news scan...")
 
-    found_articles = []
+    session = requests.Session()
 
-    for country in COUNTRIES:
-        log(f"📰 Scanning {country} news sources...")
-        keywords = COUNTRY_KEYWORDS.get(country, [])
+    def search(country: str, keyword: str) -> List[Dict]:
+        try:
+            # Use intelligence API to search
+            url = f"{API_BASE}/intelligence/articles/search"
+            params = {
+                "query": keyword,
+                "country": country,
+                "limit": 5
+            }
 
-        for keyword in keywords:
-            try:
-                # Use intelligence API to search
-                url = f"{API_BASE}/intelligence/articles/search"
-                params = {
-                    "query": keyword,
-                    "country": country,
-                    "limit": 5
-                }
+            response = session.get(url, params=params, timeout=30)
 
-                response = requests.get(url, params=params, timeout=30)
+            if response.status_code == 200:
+                data = response.json()
+                articles = data.get('articles', [])
 
-                if response.status_code == 200:
-                    data = response.json()
-                    articles = data.get('articles', [])
+                if articles:
+                    log(f"  ✓ Found {len(articles)} articles for '{keyword}'")
+                return articles
 
-                    if articles:
-                        log(f"  ✓ Found {len(articles)} articles for '{keyword}'")
-                        found_articles.extend(articles)
+        except Exception as e:
+            log(f"  ⚠ Error searching '{keyword}' in {country}: {e}")
+        return []
 
-            except Exception as e:
-                log(f"  ⚠ Error searching '{keyword}' in {country}: {e}")
+    searches = [(country, keyword) for country in COUNTRIES for keyword in COUNTRY_KEYWORDS.get(country, [])]
+    log(f"📰 Scanning {len(COUNTRIES)} countries ({len(searches)} keyword searches, {SEARCH_WORKERS} at a time)...")
+
+    found_articles = []
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as pool:
+        for articles in pool.map(lambda args: search(*args), searches):
+            found_articles.extend(articles)
 
+    session.close()
     return found_articles
 
 
@@ -756,10 +756,25 @@ const app = createApp({
             }, 150);
         };
 
+        // Heavy analyses run as background jobs: poll until finished, then fetch the result
+        const waitForJob = async (job) => {
+            let status = job;
+            while (status.status === 'queued' || status.status === 'running') {
+                await new Promise(resolve => setTimeout(resolve, 1000));
+                status = await (await fetch(`/api/jobs/${job.job_id}`)).json();
+            }
+            const response = await fetch(`/api/jobs/${job.job_id}/result`);
+            if (!response.ok) {
+                const body = await response.json();
+                throw new Error(body.detail || `HTTP ${response.status}`);
+            }
+            return response.json();
+        };
+
         const autoDetectPatterns = async () => {
             try {
                 const response = await fetch('/api/patterns/auto-detect', { method: 'POST' });
-                const data = await response.json();
+                const data = await waitForJob(await response.json());
                 alert(`Detected ${data.detected_patterns} new patterns`);
                 fetchPatterns();
             } catch (error) {
@@ -1505,7 +1520,7 @@ const app = createApp({
                 if (!response.ok) {
                     throw new Error(`HTTP ${response.status}: ${response.statusText}`);
                 }
-                const data = await response.json();
+                const data = await waitForJob(await response.json());
                 forensicAnalysis.value = data;
                 console.log('Flight forensics analysis loaded:', data);
             } catch (error) {
@@ -10,11 +10,12 @@ from datetime import datetime, date
 from pathlib import Path
 from typing import Optional
 
-# Add backend to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+# Import through the backend package (the duplicate index only tracks backend.models.Incident)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database import SessionLocal, engine
-from models import Base, Incident, RestrictedArea, DroneType, DataSource
+from backend.database import SessionLocal, engine
+from backend.models import Base, Incident, RestrictedArea, DroneType, DataSource
+from backend.duplicate_index import flag_duplicates
 
 # Coordinates for European locations (approximate)
 LOCATION_COORDS = {
@@ -166,6 +167,8 @@ def parse_csv_and_load(csv_path: Path):
         session.commit()
 
         loaded = 0
+        flagged = 0
+        pending = []
         with open(csv_path, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row_num, row in enumerate(reader, start=2):  # Start at 2 because row 1 is header
@@ -228,22 +231,29 @@ def parse_csv_and_load(csv_path: Path):
                     )
 
                     session.add(incident)
+                    pending.append(incident)
                     loaded += 1
 
                     if loaded % 5 == 0:
                         print(f"  Loaded {loaded} incidents...")
+                        flagged += len(flag_duplicates(session, pending))
                         session.commit()
                         session.close()
                         session = SessionLocal()
+                        pending = []
 
                 except Exception as e:
                     print(f"⚠️  Row {row_num}: {e}")
                     session.rollback()
+                    pending = []
                     continue
 
-        # Final commit
+        # Final commit (new incidents are checked for duplicates first)
+        flagged += len(flag_duplicates(session, pending))
         session.commit()
         print(f"\n✅ Successfully loaded {loaded} incidents from OSINT DATA!")
+        if flagged:
+            print(f"   Flagged {flagged} as duplicates of existing incidents")
 
     except FileNotFoundError:
         print(f"❌ File not found: {csv_path}")